@@ -1,5 +1,10 @@
 from .log_in_form import *
+from .uploaded_image_field import *
+from .image_placeholder_mixin import *
+from .recipe_child_form_mixin import *
 from .recipe_form import *
 from .user_forms import *
 from .ingredient_form import *
 from .instruction_form import *
+from .instruction_formset import *
+from .bulk_recipe_validator import *
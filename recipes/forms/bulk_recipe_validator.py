@@ -0,0 +1,135 @@
+from django import forms
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.utils.text import get_text_list
+from django.utils.translation import gettext, ngettext
+
+
+class BulkRecipeValidator:
+    """
+    Validate recipes sent as data, with the rules of the recipe forms.
+
+    Binding a form for every ingredient and instruction costs more than
+    writing them, since each form deep-copies its fields. Here each value
+    is cleaned directly by the field of the form that would have cleaned
+    it, followed by the form's ``clean_<field>()`` hook, which runs on one
+    unbound form kept per form class. The instance built from the cleaned
+    values is validated by its model as a ``ModelForm`` would, and the
+    rules of the formsets, a minimum number of rows and rows unique within
+    their recipe, are applied to the children. Rows left completely empty
+    are skipped, as empty extra forms are. File fields cannot be sent, and
+    are left out.
+
+    Attributes:
+        form_class (type[ModelForm]): The form of the recipe itself.
+        formset_classes (dict[str, type[BaseInlineFormSet]]): The formsets
+            of the recipe's children, keyed by the name of their rows in
+            the data.
+    """
+
+    def __init__(self, form_class, formset_classes):
+        self.form_class = form_class
+        self.formset_classes = formset_classes
+        self._forms = {}
+
+    def validate(self, data, **initial):
+        """
+        Validate one recipe and its children.
+
+        Args:
+            data (dict): The recipe's field values, and a list of field
+                values per kind of child.
+            **initial: Values set on the recipe before it is validated,
+                such as its author.
+
+        Returns:
+            tuple: The unsaved recipe and its unsaved children keyed by
+            kind, and the errors keyed by field and by kind of child, which
+            are empty if the recipe is valid. Child errors are keyed by row
+            index, with rules across rows under ``"__all__"``.
+        """
+        recipe, errors = self._clean_instance(self.form_class, data, initial)
+        children = {}
+        for name, formset_class in self.formset_classes.items():
+            rows = data.get(name)
+            children[name], child_errors = self._clean_rows(
+                formset_class, rows if isinstance(rows, list) else []
+            )
+            if child_errors:
+                errors[name] = child_errors
+        return (recipe, children), errors
+
+    def _clean_instance(self, form_class, values, initial):
+        """Clean ``values`` with the fields of ``form_class`` into an instance."""
+        if form_class not in self._forms:
+            self._forms[form_class] = form_class()
+        form = self._forms[form_class]
+        values = values if isinstance(values, dict) else {}
+        cleaned, errors = {}, {}
+        form.cleaned_data = cleaned
+        for name, field in form_class.base_fields.items():
+            if isinstance(field, forms.FileField):
+                continue
+            try:
+                cleaned[name] = field.clean(values.get(name))
+                if hasattr(form, f"clean_{name}"):
+                    cleaned[name] = getattr(form, f"clean_{name}")()
+            except ValidationError as error:
+                errors[name] = error.messages
+                cleaned.pop(name, None)
+        model = form_class._meta.model
+        instance = model(**initial, **cleaned)
+        if not errors:
+            try:
+                instance.full_clean(
+                    exclude=[
+                        field.name
+                        for field in model._meta.fields
+                        if field.name not in cleaned
+                    ],
+                    validate_unique=False,
+                )
+            except ValidationError as error:
+                errors.update(error.message_dict)
+        return instance, errors
+
+    def _clean_rows(self, formset_class, rows):
+        """Clean the rows of one kind of child, with the rules of its formset."""
+        instances, errors = [], {}
+        for index, row in enumerate(rows):
+            if not row:
+                continue
+            instance, row_errors = self._clean_instance(formset_class.form, row, {})
+            if row_errors:
+                errors[str(index)] = row_errors
+            else:
+                instances.append(instance)
+
+        problems = []
+        submitted = sum(1 for row in rows if row)
+        if formset_class.validate_min and submitted < formset_class.min_num:
+            problems.append(
+                ngettext(
+                    "Please submit at least %(num)d form.",
+                    "Please submit at least %(num)d forms.",
+                    formset_class.min_num,
+                )
+                % {"num": formset_class.min_num}
+            )
+        fk_name = formset_class.fk.name
+        for unique_together in formset_class.model._meta.unique_together:
+            fields = [field for field in unique_together if field != fk_name]
+            values = [
+                tuple(getattr(instance, field) for field in fields)
+                for instance in instances
+            ]
+            if len(set(values)) < len(values):
+                problems.append(
+                    gettext(
+                        "Please correct the duplicate data for %(field)s, "
+                        "which must be unique."
+                    )
+                    % {"field": get_text_list(list(unique_together), gettext("and"))}
+                )
+        if problems:
+            errors[NON_FIELD_ERRORS] = problems
+        return instances, errors
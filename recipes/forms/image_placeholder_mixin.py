@@ -0,0 +1,20 @@
+from django.core.files.uploadedfile import UploadedFile
+from recipes.services import make_placeholder
+
+
+class ImagePlaceholderMixin:
+    """
+    Form mixin storing an inline placeholder for a newly uploaded image.
+
+    The placeholder is computed once, while the upload is still on local
+    disk, and saved on the instance's ``image_placeholder`` field. Clearing
+    the image clears the placeholder too.
+    """
+
+    def clean_image(self):
+        image = self.cleaned_data.get("image")
+        if isinstance(image, UploadedFile):
+            self.instance.image_placeholder = make_placeholder(image)
+        elif image is False:
+            self.instance.image_placeholder = ""
+        return image
@@ -1,8 +1,9 @@
 from django import forms
+from recipes.forms.recipe_child_form_mixin import RecipeChildFormMixin
 from recipes.models import Ingredient
 
 
-class IngredientForm(forms.ModelForm):
+class IngredientForm(RecipeChildFormMixin, forms.ModelForm):
     """Form for a single ingredient."""
 
     UNIT_CHOICES = [
@@ -52,7 +53,7 @@ class IngredientForm(forms.ModelForm):
                     "class": "form-control",
                     "placeholder": "Amount",
                     "min": "0",
-                    "step": "0.01",
+                    "step": "any",
                 }
             ),
         }
@@ -1,8 +1,11 @@
 from django import forms
+from recipes.forms.image_placeholder_mixin import ImagePlaceholderMixin
+from recipes.forms.recipe_child_form_mixin import RecipeChildFormMixin
+from recipes.forms.uploaded_image_field import UploadedImageField
 from recipes.models import Instruction
 
 
-class InstructionForm(forms.ModelForm):
+class InstructionForm(RecipeChildFormMixin, ImagePlaceholderMixin, forms.ModelForm):
     """Form for a single instruction step."""
 
     class Meta:
@@ -10,6 +13,7 @@ class InstructionForm(forms.ModelForm):
 
         model = Instruction
         fields = ["step", "description", "image"]
+        field_classes = {"image": UploadedImageField}
         widgets = {
             "step": forms.NumberInput(attrs={"class": "form-control"}),
             "description": forms.Textarea(
@@ -0,0 +1,106 @@
+from django.forms import BaseInlineFormSet
+from recipes.models import Instruction
+from recipes.services import spaced_step
+
+
+class BaseInstructionFormSet(BaseInlineFormSet):
+    """
+    Inline formset editing a recipe's instructions in step order.
+
+    Instructions are stored with sparse sort keys, so that one can be moved
+    by rewriting only its own row (see `recipes.services.move_instruction`).
+    The forms show and submit plain step numbers instead, 1 for the first
+    step. When the formset is saved, the submitted order is turned back into
+    sort keys spaced ``STEP_GAP`` apart, and existing instructions whose key
+    changes are reported in ``changed_objects``.
+
+    The formset is meant to be saved with ``commit=False`` and written by
+    `recipes.services.update_recipe`, which moves keys out of each other's
+    way.
+    """
+
+    def __init__(self, *args, queryset=None, **kwargs):
+        if queryset is None:
+            queryset = Instruction.objects.order_by("step", "pk")
+        self._stored_steps = None
+        super().__init__(*args, queryset=queryset, **kwargs)
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        stored = self.stored_steps().get(form.instance.pk)
+        if stored is not None:
+            form.initial["step"] = stored[0]
+        return form
+
+    def stored_steps(self):
+        """
+        Return the rank and sort key of each existing instruction.
+
+        Returns:
+            dict[int, tuple[int, int]]: ``(rank, step)`` keyed by primary key,
+            as stored before the submitted data was applied.
+        """
+        if self._stored_steps is None:
+            self._stored_steps = {
+                instruction.pk: (rank, instruction.step)
+                for rank, instruction in enumerate(self.get_queryset(), start=1)
+            }
+        return self._stored_steps
+
+    def save(self, commit=True):
+        stored_steps = self.stored_steps()
+        kept = [
+            form
+            for form in self.forms
+            if not (self.can_delete and self._should_delete_form(form))
+            and (form.instance.pk in stored_steps or form.has_changed())
+        ]
+        kept.sort(key=lambda form: form.cleaned_data["step"])
+        unmoved = {
+            index
+            for index, form in enumerate(kept)
+            if form.instance.pk in stored_steps and "step" not in form.changed_data
+        }
+        for form, step in zip(kept, _sort_keys(kept, unmoved, stored_steps)):
+            form.instance.step = step
+        saved = super().save(commit=commit)
+
+        changed = dict(self.changed_objects)
+        for form in kept:
+            instruction = form.instance
+            if instruction.pk not in stored_steps:
+                continue
+            if instruction.step == stored_steps[instruction.pk][1]:
+                continue
+            fields = changed.get(instruction, [])
+            if "step" not in fields:
+                changed[instruction] = [*fields, "step"]
+        self.changed_objects = list(changed.items())
+        return saved
+
+
+def _sort_keys(kept, unmoved, stored_steps):
+    """
+    Return sort keys for the ``kept`` forms, in submitted order.
+
+    Instructions whose step number did not change keep their key, and the
+    others are spaced out evenly between them. Unmoved instructions keep
+    their rank, so the keys of any instructions submitted between two of
+    them always fit in between.
+    """
+    steps = [None] * len(kept)
+    for index in unmoved:
+        steps[index] = stored_steps[kept[index].instance.pk][1]
+    lower, run = 0, []
+    for index in [*range(len(kept)), None]:
+        if index is not None and steps[index] is None:
+            run.append(index)
+            continue
+        upper = steps[index] if index is not None else None
+        for offset, position in enumerate(run, start=1):
+            if upper is None:
+                steps[position] = lower + spaced_step(offset)
+            else:
+                steps[position] = lower + (upper - lower) * offset // (len(run) + 1)
+        lower, run = upper, []
+    return steps
@@ -0,0 +1,22 @@
+from django import forms
+
+
+class RecipeChildFormMixin:
+    """
+    Form mixin for ingredients and instructions edited in a recipe formset.
+
+    Rows of a recipe are unique per recipe, by name or by step. When a recipe
+    is edited, two rows can legitimately swap their values, which a check of
+    each form against the database would reject. The formset already checks
+    uniqueness across all of the recipe's rows, so the per-form check is
+    skipped, and `recipes.services.update_recipe` writes swaps in an order
+    the database accepts.
+    """
+
+    def validate_unique(self):
+        exclude = self._get_validation_exclusions()
+        exclude.add("recipe")
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except forms.ValidationError as error:
+            self._update_errors(error)
@@ -1,12 +1,26 @@
 from django import forms
+from recipes.forms.image_placeholder_mixin import ImagePlaceholderMixin
+from recipes.forms.uploaded_image_field import UploadedImageField
 from recipes.models import Recipe
 
 
-class RecipeForm(forms.ModelForm):
+class RecipeForm(ImagePlaceholderMixin, forms.ModelForm):
     """Form to create a new recipe."""
 
+    servings = forms.IntegerField(
+        min_value=1,
+        required=False,
+        help_text="The number of servings the ingredients make",
+    )
+
     class Meta:
         """Form options."""
 
         model = Recipe
-        fields = ["title", "description", "difficulty", "image", "time"]
+        fields = ["title", "description", "difficulty", "image", "time", "servings"]
+        field_classes = {"image": UploadedImageField}
+
+    def clean_servings(self):
+        """Keep the recipe's number of servings when none is given."""
+        servings = self.cleaned_data.get("servings")
+        return self.instance.servings if servings is None else servings
@@ -0,0 +1,24 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+
+class UploadedImageField(forms.ImageField):
+    """
+    Image field reporting files rejected by the upload handler.
+
+    `recipes.uploads.StreamingImageUploadHandler` marks files that are over
+    the size or pixel limits with an ``upload_error`` instead of failing the
+    whole request, and this field turns that mark into a form error.
+    """
+
+    default_error_messages = {"upload_rejected": "%(reason)s"}
+
+    def to_python(self, data):
+        reason = getattr(data, "upload_error", None)
+        if reason:
+            raise ValidationError(
+                self.error_messages["upload_rejected"],
+                code="upload_rejected",
+                params={"reason": reason},
+            )
+        return super().to_python(data)
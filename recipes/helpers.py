@@ -1 +1,531 @@
-### Helper function and classes go here.
+"""
+Helper functions and classes shared across the ``recipes`` app.
+
+The main building block here is :class:`TwoTierCache`, a small caching layer
+that keeps a bounded in-process LRU in front of a shared Django cache backend
+(see ``CACHES["shared"]`` in ``settings.py``). Every caching feature in the app
+should go through the module level ``two_tier_cache`` instance rather than
+talking to Django's cache framework directly.
+
+Rebuilds of missing or expired entries are coalesced by :class:`SingleFlight`,
+so a hot key is rebuilt by one worker at a time while the others wait briefly
+or keep serving the stale value.
+"""
+
+import hashlib
+import math
+import os
+import pickle
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import caches
+
+
+class LocalLRUCache:
+    """
+    Bounded, thread-safe, in-process LRU cache with per-entry expiry.
+
+    Values are stored as pickled bytes so that callers never share mutable
+    objects through the cache, and so that the size of every entry is known.
+    Entries are evicted least-recently-used first whenever either the number
+    of entries or their total size exceeds the configured limits.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept in memory.
+        max_bytes (int): Maximum total size of the stored payloads.
+        evictions (int): Number of entries evicted to stay within the limits.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """Return the total size, in bytes, of the stored payloads."""
+        return self._size
+
+    def get(self, key, now):
+        """
+        Return the payload stored under ``key``.
+
+        Returns:
+            bytes | None: The payload, or None if missing or expired at ``now``.
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            payload, expires_at = item
+            if expires_at <= now:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key, payload, expires_at):
+        """
+        Store ``payload`` under ``key`` until ``expires_at``.
+
+        Payloads larger than ``max_bytes`` are never stored, since they would
+        immediately evict everything else.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if len(payload) > self.max_bytes:
+                return
+            self._entries[key] = (payload, expires_at)
+            self._size += len(payload)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove ``key`` if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        payload, _ = self._entries.pop(key)
+        self._size -= len(payload)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent rebuilds of the same key across threads and processes.
+
+    The first caller to ask for a key takes a short lease on it; everybody else
+    is told the lease is taken until it is released or times out. Within a
+    process, leases are tracked in memory so sibling threads never touch the
+    file system. Across processes, a lease is a file created with ``O_EXCL``
+    in ``lease_dir``, which is atomic on any local file system. Lease files
+    older than ``lease_timeout`` belong to a crashed or stuck leader and are
+    broken by the next caller.
+
+    Options default to ``settings.SINGLE_FLIGHT``.
+    """
+
+    def __init__(self, lease_dir=None, lease_timeout=None):
+        self._lease_dir = lease_dir
+        self._lease_timeout = lease_timeout
+        self._held = {}
+        self._lock = threading.Lock()
+
+    @property
+    def lease_dir(self):
+        """Return the directory holding lease files."""
+        if self._lease_dir is not None:
+            return Path(self._lease_dir)
+        config = getattr(settings, "SINGLE_FLIGHT", {})
+        return Path(config.get("LEASE_DIR", Path(settings.BASE_DIR) / "cache"))
+
+    @property
+    def lease_timeout(self):
+        """Return the number of seconds after which a lease may be broken."""
+        if self._lease_timeout is not None:
+            return self._lease_timeout
+        return getattr(settings, "SINGLE_FLIGHT", {}).get("LEASE_TIMEOUT", 10)
+
+    def acquire(self, key):
+        """
+        Try to take the lease on ``key`` without blocking.
+
+        Returns:
+            str | None: A token to pass to ``release()``, or None if another
+            thread or process holds the lease.
+        """
+        with self._lock:
+            if key in self._held:
+                return None
+            token = f"{os.getpid()}:{uuid.uuid4().hex}"
+            self._held[key] = token
+        if self._create_lease_file(key, token):
+            return token
+        with self._lock:
+            del self._held[key]
+        return None
+
+    def release(self, key, token):
+        """Release a lease taken by ``acquire()``."""
+        path = self._lease_path(key)
+        try:
+            if path.read_text() == token:
+                path.unlink()
+        except OSError:
+            pass
+        with self._lock:
+            if self._held.get(key) == token:
+                del self._held[key]
+
+    @contextmanager
+    def lease(self, key):
+        """
+        Context manager around ``acquire()`` and ``release()``.
+
+        Yields:
+            bool: True if this caller holds the lease.
+        """
+        token = self.acquire(key)
+        try:
+            yield token is not None
+        finally:
+            if token is not None:
+                self.release(key, token)
+
+    def _create_lease_file(self, key, token):
+        path = self._lease_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                descriptor = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._break_expired_lease(path):
+                    return False
+                continue
+            with os.fdopen(descriptor, "w") as lease_file:
+                lease_file.write(token)
+            return True
+        return False
+
+    def _break_expired_lease(self, path):
+        try:
+            if time.time() - path.stat().st_mtime < self.lease_timeout:
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _lease_path(self, key):
+        return self.lease_dir / (hashlib.sha1(key.encode()).hexdigest() + ".lease")
+
+
+class TwoTierCache:
+    """
+    Two-tier cache: a bounded in-process LRU in front of a shared backend.
+
+    Reads are served from the local tier when possible and fall back to the
+    shared Django cache (reachable by every worker process) before finally
+    calling the builder. Values are wrapped in an envelope recording their
+    soft expiry time and how long they took to build, which drives
+    probabilistic early refresh (the "XFetch" algorithm): as an entry gets
+    close to expiring, each reader has a growing chance of rebuilding it
+    ahead of time, so a hot key does not expire for every worker at once.
+
+    Keys are versioned per namespace. ``bump_namespace()`` increments the
+    namespace generation in the shared backend, which invalidates every key
+    in that namespace across all processes without having to enumerate them.
+    Processes re-read generations at most every ``generation_timeout``
+    seconds, and local entries live for at most ``local_timeout`` seconds,
+    which bounds how stale another process's local tier can be.
+
+    Each key also has a version in the shared backend, read on every lookup,
+    local hits included. ``delete()`` increments it, so a deleted key is gone
+    for every process at once rather than when their local copies expire.
+
+    Rebuilds in ``get_or_set()`` go through a :class:`SingleFlight` lease, so
+    only one caller rebuilds a given key at a time. Entries are kept for
+    ``stale_timeout`` seconds past their expiry; while the leader rebuilds,
+    other callers are served that stale value, or, if there is none, wait up
+    to ``wait_timeout`` seconds for the leader to finish.
+
+    Options default to ``settings.TWO_TIER_CACHE``.
+    """
+
+    def __init__(
+        self,
+        alias=None,
+        prefix="recipes",
+        default_timeout=None,
+        local_timeout=None,
+        local_max_entries=None,
+        local_max_bytes=None,
+        generation_timeout=None,
+        beta=None,
+        stale_timeout=None,
+        wait_timeout=None,
+        single_flight=None,
+    ):
+        config = getattr(settings, "TWO_TIER_CACHE", {})
+        self.alias = alias or config.get("SHARED_ALIAS", "shared")
+        self.prefix = prefix
+        self.default_timeout = _first_set(
+            default_timeout, config.get("DEFAULT_TIMEOUT"), 300
+        )
+        self.local_timeout = _first_set(local_timeout, config.get("LOCAL_TIMEOUT"), 30)
+        self.generation_timeout = _first_set(
+            generation_timeout, config.get("GENERATION_TIMEOUT"), 1
+        )
+        self.beta = _first_set(beta, config.get("EARLY_REFRESH_BETA"), 1.0)
+        self.stale_timeout = _first_set(stale_timeout, config.get("STALE_TIMEOUT"), 60)
+        self.wait_timeout = _first_set(wait_timeout, config.get("WAIT_TIMEOUT"), 2)
+        self.poll_interval = config.get("POLL_INTERVAL", 0.05)
+        self.single_flight = single_flight or SingleFlight()
+        self.local = LocalLRUCache(
+            max_entries=_first_set(
+                local_max_entries, config.get("LOCAL_MAX_ENTRIES"), 1024
+            ),
+            max_bytes=_first_set(
+                local_max_bytes, config.get("LOCAL_MAX_BYTES"), 16 * 1024 * 1024
+            ),
+        )
+        self._generations = {}
+        self._counters = dict.fromkeys(
+            [
+                "local_hits",
+                "shared_hits",
+                "misses",
+                "stale_hits",
+                "early_refreshes",
+                "coalesced_waits",
+                "sets",
+            ],
+            0,
+        )
+        self._counter_lock = threading.Lock()
+
+    @property
+    def shared(self):
+        """Return the shared Django cache backend."""
+        return caches[self.alias]
+
+    def get(self, key, default=None, namespace="default"):
+        """Return the cached value for ``key``, or ``default`` if missing or expired."""
+        now = time.time()
+        envelope = self._lookup(self.make_key(key, namespace), now)
+        if envelope is None or envelope[1] <= now:
+            return default
+        return envelope[0]
+
+    def set(self, key, value, timeout=None, namespace="default", build_time=0.0):
+        """
+        Store ``value`` in both tiers for ``timeout`` seconds.
+
+        Args:
+            build_time (float): Seconds it took to compute the value; used to
+                scale probabilistic early refresh.
+        """
+        self._set_envelope(
+            self.make_key(key, namespace), value, timeout, build_time, time.time()
+        )
+
+    def delete(self, key, namespace="default"):
+        """Remove ``key`` from both tiers, in every process."""
+        versioned_key = self.make_key(key, namespace)
+        self._increment(self._version_key(key, namespace))
+        self.local.delete(versioned_key)
+        self.shared.delete(versioned_key)
+
+    def get_or_set(self, key, builder, timeout=None, namespace="default"):
+        """
+        Return the cached value for ``key``, building and storing it if needed.
+
+        Args:
+            key (str): Cache key, unique within ``namespace``.
+            builder (Callable[[], Any]): Called with no arguments to compute
+                the value on a miss or an early refresh.
+            timeout (int, optional): Seconds until the value expires. Defaults
+                to ``default_timeout``.
+            namespace (str): Namespace used for versioning the key.
+        """
+        versioned_key = self.make_key(key, namespace)
+        now = time.time()
+        envelope = self._lookup(versioned_key, now)
+        if envelope is not None and envelope[1] > now:
+            if not self._should_refresh_early(envelope[1], envelope[2], now):
+                return envelope[0]
+            self._count("early_refreshes")
+
+        with self.single_flight.lease(versioned_key) as leader:
+            if leader:
+                latest = self.shared.get(versioned_key)
+                if self._is_newer(latest, envelope, now):
+                    # A previous leader finished between our lookup and the lease.
+                    return latest[0]
+                return self._rebuild(versioned_key, builder, timeout)
+        if envelope is not None:
+            # Someone else is rebuilding: keep serving what we have, even if stale.
+            if envelope[1] <= now:
+                self._count("stale_hits")
+            return envelope[0]
+        envelope = self._wait_for_leader(versioned_key)
+        if envelope is not None:
+            return envelope[0]
+        return self._rebuild(versioned_key, builder, timeout)
+
+    def make_key(self, key, namespace="default"):
+        """Return ``key`` qualified by its version and that of ``namespace``."""
+        generation = self.generation(namespace)
+        version = self._counter(self._version_key(key, namespace))
+        return f"{self.prefix}:{namespace}:{generation}:{key}:{version}"
+
+    def generation(self, namespace):
+        """Return the current generation of ``namespace``."""
+        now = time.monotonic()
+        cached = self._generations.get(namespace)
+        if cached is not None and now - cached[1] < self.generation_timeout:
+            return cached[0]
+        generation = self._counter(self._generation_key(namespace))
+        self._generations[namespace] = (generation, now)
+        return generation
+
+    def bump_namespace(self, namespace):
+        """Invalidate every key in ``namespace``, in every process."""
+        self._increment(self._generation_key(namespace))
+        self._generations.pop(namespace, None)
+
+    def clear_local(self):
+        """Drop the in-process tier and cached generations."""
+        self.local.clear()
+        self._generations.clear()
+
+    def metrics(self):
+        """
+        Return a snapshot of this process's cache statistics.
+
+        Returns:
+            dict: Hit, miss and refresh counters, local tier occupancy, and
+            the overall hit ratio.
+        """
+        with self._counter_lock:
+            snapshot = dict(self._counters)
+        lookups = snapshot["local_hits"] + snapshot["shared_hits"] + snapshot["misses"]
+        hits = snapshot["local_hits"] + snapshot["shared_hits"]
+        snapshot.update(
+            local_entries=len(self.local),
+            local_bytes=self.local.size,
+            local_evictions=self.local.evictions,
+            hit_ratio=hits / lookups if lookups else 0.0,
+        )
+        return snapshot
+
+    def reset_metrics(self):
+        """Reset every counter to zero."""
+        with self._counter_lock:
+            for name in self._counters:
+                self._counters[name] = 0
+        self.local.evictions = 0
+
+    def _lookup(self, versioned_key, now):
+        """
+        Return the freshest envelope for ``versioned_key`` in either tier.
+
+        The returned envelope may be past its soft expiry but still within
+        its stale window; callers check ``envelope[1]`` against ``now``.
+        """
+        local_envelope = None
+        payload = self.local.get(versioned_key, now)
+        if payload is not None:
+            local_envelope = pickle.loads(payload)
+            if local_envelope[1] > now:
+                self._count("local_hits")
+                return local_envelope
+        envelope = self.shared.get(versioned_key)
+        if envelope is not None and envelope[1] > now:
+            self._count("shared_hits")
+            self._set_local(versioned_key, envelope, now)
+            return envelope
+        self._count("misses")
+        return envelope or local_envelope
+
+    def _rebuild(self, versioned_key, builder, timeout):
+        start = time.perf_counter()
+        value = builder()
+        build_time = time.perf_counter() - start
+        self._set_envelope(versioned_key, value, timeout, build_time, time.time())
+        return value
+
+    def _wait_for_leader(self, versioned_key):
+        """Poll the shared tier until the leader stores a fresh value."""
+        self._count("coalesced_waits")
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            envelope = self.shared.get(versioned_key)
+            if envelope is not None and envelope[1] > time.time():
+                self._set_local(versioned_key, envelope, time.time())
+                return envelope
+        return None
+
+    def _set_envelope(self, versioned_key, value, timeout, build_time, now):
+        if timeout is None:
+            timeout = self.default_timeout
+        envelope = (value, now + timeout, build_time)
+        self.shared.set(versioned_key, envelope, timeout + self.stale_timeout)
+        self._set_local(versioned_key, envelope, now)
+        self._count("sets")
+
+    def _set_local(self, versioned_key, envelope, now):
+        expires_at = min(envelope[1] + self.stale_timeout, now + self.local_timeout)
+        payload = pickle.dumps(envelope, pickle.HIGHEST_PROTOCOL)
+        self.local.set(versioned_key, payload, expires_at)
+
+    def _is_newer(self, candidate, envelope, now):
+        if candidate is None or candidate[1] <= now:
+            return False
+        return envelope is None or candidate[1] > envelope[1]
+
+    def _should_refresh_early(self, expires_at, build_time, now):
+        # XFetch: -log(u) is exponentially distributed, so the chance of an
+        # early rebuild grows smoothly as expiry approaches and scales with the
+        # cost of the rebuild.
+        jitter = -math.log(1.0 - random.random())
+        return now + build_time * self.beta * jitter >= expires_at
+
+    def _counter(self, counter_key):
+        """Return the value of a generation or version in the shared backend."""
+        value = self.shared.get(counter_key)
+        if value is None:
+            # Start from the clock so that a counter lost from the shared
+            # backend can never bring back entries written under an old value.
+            self.shared.add(counter_key, int(time.time() * 1000), None)
+            value = self.shared.get(counter_key)
+        return value
+
+    def _increment(self, counter_key):
+        try:
+            self.shared.incr(counter_key)
+        except ValueError:
+            self.shared.set(counter_key, int(time.time() * 1000), None)
+
+    def _generation_key(self, namespace):
+        return f"{self.prefix}:generation:{namespace}"
+
+    def _version_key(self, key, namespace):
+        return f"{self.prefix}:version:{namespace}:{key}"
+
+    def _count(self, name):
+        with self._counter_lock:
+            self._counters[name] += 1
+
+
+def _first_set(*values):
+    """Return the first argument that is not None."""
+    for value in values:
+        if value is not None:
+            return value
+    return None
+
+
+two_tier_cache = TwoTierCache()
@@ -0,0 +1,111 @@
+"""
+Management command auditing the query plans of every view's SQL.
+
+Every URL of ``recipify/urls.py`` is requested through the Django test
+client against the current database, which should be seeded first (see the
+``seed`` command). Each statement a view runs is explained with SQLite's
+``EXPLAIN QUERY PLAN``, as are the default orderings of every model, and
+the report is written as JSON so it can be diffed between releases.
+"""
+
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from recipes.helpers import two_tier_cache
+from recipes.models import Recipe, User
+from recipes.services import audit_orderings, audit_urls, summarise_audit
+from recipify import urls
+
+# Every cache is disabled, so views run all the queries they may run.
+AUDIT_CACHES = {
+    alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    for alias in ["default", "shared"]
+}
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to audit the query plans of every view.
+
+    Views are requested as ``--user``, or as the author of the newest recipe,
+    with URL parameters taken from that user's newest recipe. Views of a
+    recipe are skipped if the user has none. Everything the views write is
+    rolled back. The report lists, per view and per model ordering, each
+    distinct statement with its plan, the tables it scans in full, the
+    clauses it sorts in a temporary B-tree and the indexes that could avoid
+    them, followed by a summary of all of them. Keys are sorted, so reports
+    of two releases can be compared with ``diff``.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Reports the query plans of the SQL run by every view"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Username of the user the views are requested as",
+        )
+        parser.add_argument(
+            "--indent",
+            type=int,
+            default=2,
+            help="Number of spaces JSON is indented by",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Query plans can only be audited on SQLite")
+        user = self._user(options["user"])
+
+        def prepare(client):
+            two_tier_cache.clear_local()
+            client.force_login(user)
+
+        with override_settings(CACHES=AUDIT_CACHES, ALLOWED_HOSTS=["*"]):
+            with transaction.atomic():
+                views = audit_urls(
+                    urls.urlpatterns,
+                    Client(raise_request_exception=False),
+                    prepare,
+                    _url_kwargs(user),
+                )
+                transaction.set_rollback(True)
+        orderings = audit_orderings()
+        report = {
+            "views": views,
+            "orderings": orderings,
+            "summary": summarise_audit(views + orderings),
+        }
+        self.stdout.write(json.dumps(report, indent=options["indent"], sort_keys=True))
+
+    def _user(self, username):
+        if username is not None:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"No user is named {username!r}")
+        recipe = Recipe.objects.select_related("author").first()
+        if recipe is not None:
+            return recipe.author
+        user = User.objects.first()
+        if user is None:
+            raise CommandError("No users to audit as; seed the database first")
+        return user
+
+
+def _url_kwargs(user):
+    """Return values for the URL parameters, from the user's newest recipe."""
+    recipe = user.recipes.first()
+    if recipe is None:
+        return {}
+    kwargs = {"pk": recipe.pk}
+    instruction = recipe.instructions.first()
+    if instruction is not None:
+        kwargs["instruction_pk"] = instruction.pk
+    revision = recipe.revisions.order_by("-number").first()
+    if revision is not None:
+        kwargs["number"] = revision.number
+    return kwargs
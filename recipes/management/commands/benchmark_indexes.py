@@ -0,0 +1,192 @@
+"""
+Management command timing the queries the model indexes are chosen for.
+
+Tables are filled with generated rows by SQL, without the ORM, and each
+query is timed with the indexes of the models and again with the indexes
+the tables had before the access path indexes were added, so every index is
+justified by a measured difference.
+"""
+
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from recipes.models import Instruction, Recipe, User
+
+# The indexes the benchmarked queries are served by, and those the tables had
+# before them: one on each foreign key.
+INDEXES_AFTER = [
+    (model, index) for model in [Recipe, User] for index in model._meta.indexes
+]
+INDEXES_BEFORE = [
+    (Recipe, models.Index(fields=["author"], name="benchmark_recipe_author_idx")),
+    (
+        Instruction,
+        models.Index(fields=["recipe"], name="benchmark_instruction_recipe_idx"),
+    ),
+]
+
+# Each instruction's recipe has this many instructions, and each author this
+# many recipes.
+STEPS_PER_RECIPE = 5
+RECIPES_PER_AUTHOR = 100
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to benchmark the access path indexes.
+
+    For each ``--rows`` value, that many users, recipes and instructions are
+    generated, and these queries are timed ``--repeat`` times each, before
+    and after the indexes, reporting the median latency:
+
+    - the newest recipes, as listed by default;
+    - the newest recipes of one author;
+    - the first users by name, as listed by default;
+    - the instructions of one recipe, in order.
+
+    Everything runs in a transaction that is rolled back, including the
+    changes to the indexes, so the database is left untouched. The default
+    sizes take several minutes and gigabytes of disk to generate.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Benchmarks the queries served by the model indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[10**4, 10**6, 10**7],
+            help="Numbers of users, recipes and instructions generated",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of times each query is timed per row count",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1 or min(options["rows"]) < 1:
+            raise CommandError("--rows and --repeat must be at least 1")
+        if connection.vendor != "sqlite":
+            raise CommandError("Indexes can only be benchmarked on SQLite")
+        self.stdout.write(
+            f"{'rows':>10} {'query':<24} {'before (ms)':>12} {'after (ms)':>12}"
+        )
+        for rows in options["rows"]:
+            with transaction.atomic():
+                self._run(rows, options["repeat"])
+                transaction.set_rollback(True)
+
+    def _run(self, rows, repeat):
+        queries = self._generate(rows)
+        after = _time_queries(queries, repeat)
+        editor = connection.schema_editor(collect_sql=True)
+        with connection.cursor() as cursor:
+            for _, index in INDEXES_AFTER:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+            for model, index in INDEXES_BEFORE:
+                cursor.execute(str(index.create_sql(model, editor)))
+        before = _time_queries(queries, repeat)
+        for name in queries:
+            self.stdout.write(
+                f"{rows:>10} {name:<24} "
+                f"{before[name] * 1000:>12.3f} {after[name] * 1000:>12.3f}"
+            )
+
+    def _generate(self, rows):
+        """Generate the rows and return the queries to time, by name."""
+        users = _generate_rows(
+            User,
+            rows,
+            username="'@benchmark' || (:base + n)",
+            email="'benchmark' || (:base + n) || '@example.org'",
+            first_name="'First ' || (n * 7919 % 1000)",
+            last_name="'Last ' || (n * 104729 % 1000)",
+        )
+        authors = max(1, rows // RECIPES_PER_AUTHOR)
+        recipes = _generate_rows(
+            Recipe,
+            rows,
+            author=f"{users} + (n - 1) % {authors} + 1",
+            title="'Recipe ' || n",
+            created_at=(
+                "strftime('%Y-%m-%d %H:%M:%f', 1577836800 + n * 60, 'unixepoch')"
+            ),
+        )
+        _generate_rows(
+            Instruction,
+            rows,
+            recipe=f"{recipes} + (n - 1) / {STEPS_PER_RECIPE} + 1",
+            step=f"(n - 1) % {STEPS_PER_RECIPE} + 1",
+            description="'Step ' || n",
+        )
+        recipe = recipes + (rows + STEPS_PER_RECIPE - 1) // STEPS_PER_RECIPE // 2 + 1
+        return {
+            "newest recipes": lambda: Recipe.objects.all()[:20],
+            "newest recipes of author": lambda: (
+                Recipe.objects.filter(author_id=users + 1)[:20]
+            ),
+            "users by name": lambda: User.objects.all()[:20],
+            "steps of recipe": lambda: (
+                Instruction.objects.filter(recipe_id=recipe).order_by("step")
+            ),
+        }
+
+
+def _generate_rows(model, rows, **expressions):
+    """
+    Insert generated rows into the table of a model, in one statement.
+
+    Each row is numbered by ``n``, from 1, and its primary key is the largest
+    one in the table plus ``n``. Fields are given SQL expressions of ``n``,
+    where ``:base`` stands for that largest primary key, and the others take
+    their default value.
+
+    Returns:
+        int: The largest primary key before the rows were inserted.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+        base = cursor.fetchone()[0]
+        template = model()
+        columns, values, params = [], [], []
+        for field in model._meta.concrete_fields:
+            columns.append(connection.ops.quote_name(field.column))
+            if field.primary_key:
+                values.append(f"{base} + n")
+            elif field.name in expressions:
+                expression = expressions[field.name].replace(":base", str(base))
+                values.append(expression.replace("%", "%%"))
+            else:
+                values.append("%s")
+                params.append(
+                    field.get_db_prep_save(getattr(template, field.attname), connection)
+                )
+        cursor.execute(
+            "WITH RECURSIVE seq(n) AS "
+            "(SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %s) "
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT {', '.join(values)} FROM seq",
+            [rows, *params],
+        )
+    return base
+
+
+def _time_queries(queries, repeat):
+    """Return the median time each query takes to be read in full."""
+    timings = {}
+    for name, queryset in queries.items():
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset())
+            samples.append(time.perf_counter() - started)
+        timings[name] = statistics.median(samples)
+    return timings
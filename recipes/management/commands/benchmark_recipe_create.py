@@ -0,0 +1,133 @@
+"""
+Management command timing recipe creation through the create view.
+
+Submissions are posted through the Django test client, so the numbers
+include form parsing, validation, image decoding, database writes and
+template rendering, but not network time.
+"""
+
+import io
+import statistics
+import tempfile
+import time
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from PIL import Image
+from recipes.models import User
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to benchmark POST latency of recipe creation.
+
+    For each ``--rows`` value, recipes with that many ingredients and that
+    many instructions are posted ``--repeat`` times, once as a valid
+    submission and once with an error in the last instruction, which makes
+    the view re-render the page. The median latency of each is reported.
+
+    Everything runs in a transaction that is rolled back, and uploaded
+    images go to a temporary media directory, so the database and media
+    library are left untouched.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Benchmarks POST latency of the recipe create view"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[5, 30, 100],
+            help="Numbers of ingredients and instructions per recipe",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of submissions timed per row count",
+        )
+        parser.add_argument(
+            "--images",
+            action="store_true",
+            help="Attach a small image to every instruction",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1 or min(options["rows"]) < 1:
+            raise CommandError("--rows and --repeat must be at least 1")
+        with tempfile.TemporaryDirectory() as media_root:
+            with override_settings(MEDIA_ROOT=media_root, ALLOWED_HOSTS=["*"]):
+                with transaction.atomic():
+                    self._run(options)
+                    transaction.set_rollback(True)
+
+    def _run(self, options):
+        client = Client()
+        client.force_login(
+            User.objects.create_user(
+                username="@benchmark",
+                email="benchmark@example.org",
+                first_name="Bench",
+                last_name="Mark",
+            )
+        )
+        url = reverse("recipe_create")
+        self.stdout.write(f"{'rows':>6} {'valid (ms)':>12} {'invalid (ms)':>14}")
+        for rows in options["rows"]:
+            timings = {True: [], False: []}
+            for run in range(options["repeat"]):
+                for valid in (True, False):
+                    data = self._submission(
+                        f"Benchmark {rows}-{run}", rows, valid, options["images"]
+                    )
+                    started = time.perf_counter()
+                    response = client.post(url, data)
+                    timings[valid].append(time.perf_counter() - started)
+                    expected_status = 302 if valid else 200
+                    if response.status_code != expected_status:
+                        raise CommandError(
+                            f"Unexpected {response.status_code} response "
+                            f"for a {'valid' if valid else 'invalid'} submission"
+                        )
+            self.stdout.write(
+                f"{rows:>6} "
+                f"{statistics.median(timings[True]) * 1000:>12.1f} "
+                f"{statistics.median(timings[False]) * 1000:>14.1f}"
+            )
+
+    def _submission(self, title, rows, valid, images):
+        data = {
+            "title": title,
+            "description": "Benchmark recipe",
+            "difficulty": 1,
+            "time": 30,
+            "ingredients-TOTAL_FORMS": rows,
+            "ingredients-INITIAL_FORMS": 0,
+            "instructions-TOTAL_FORMS": rows,
+            "instructions-INITIAL_FORMS": 0,
+        }
+        for index in range(rows):
+            data[f"ingredients-{index}-name"] = f"Ingredient {index}"
+            data[f"ingredients-{index}-quantity"] = index + 1
+            data[f"ingredients-{index}-unit"] = "g"
+            data[f"instructions-{index}-step"] = index + 1
+            data[f"instructions-{index}-description"] = f"Step {index + 1}"
+            if images:
+                data[f"instructions-{index}-image"] = _image_file(index)
+        if not valid:
+            data[f"instructions-{rows - 1}-description"] = ""
+        return data
+
+
+def _image_file(index):
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), (index % 256, 120, 40)).save(buffer, "JPEG")
+    return SimpleUploadedFile(
+        f"step-{index}.jpg", buffer.getvalue(), content_type="image/jpeg"
+    )
@@ -0,0 +1,39 @@
+"""
+Management command computing the nutrition of recipes that changed.
+
+Recipe pages show stored nutrient totals and never compute them while
+serving a request. This command is meant to be run periodically, or after
+``load_nutrition``, to bring the totals of stale recipes up to date.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from recipes.services import NUTRITION_BATCH_SIZE, refresh_stale_nutrition
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to compute the nutrition of stale recipes.
+
+    Only recipes created or whose ingredients were edited since their
+    nutrition was last computed are handled, in batches that each take three
+    queries to read and one transaction to write.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Computes the nutrition of recipes whose ingredients changed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=NUTRITION_BATCH_SIZE,
+            help="Number of recipes computed per transaction",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        written = refresh_stale_nutrition(batch_size=options["batch_size"])
+        self.stdout.write(f"Computed the nutrition of {written} recipe(s).")
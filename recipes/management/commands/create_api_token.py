@@ -0,0 +1,39 @@
+"""
+Management command issuing an API token to a user.
+
+Partner integrations call the JSON API without a browser session, so they
+authenticate with a token sent in an ``Authorization: Bearer`` header.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from recipes.models import User
+from recipes.services import issue_api_token
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to issue an API token.
+
+    The token's key is printed once. Only its digest is stored, so a lost
+    key cannot be recovered; issue a new token and delete the old one.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Issues an API token for a user and prints its key"
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="Username of the token's user")
+        parser.add_argument(
+            "--name",
+            default="",
+            help="What the token is used for, such as the partner's name",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user is named {options['username']!r}")
+        self.stdout.write(issue_api_token(user, name=options["name"]))
@@ -0,0 +1,78 @@
+"""
+Management command removing media files and rows that nothing references.
+
+Failed recipe submissions and deleted recipes leave uploaded images and
+ownerless instructions behind. This command reconciles the media directory
+with the file columns in the database and removes what is left over.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from recipes.services import GC_BATCH_SIZE, GC_GRACE_PERIOD, collect_media_garbage
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to garbage collect unreferenced media.
+
+    Instructions without a recipe and variants of unused images are deleted
+    first, then every file under ``MEDIA_ROOT`` that no row references is
+    removed. Both the rows and the files are handled in batches, so the
+    command runs in bounded memory however large the library is. With
+    ``--dry-run`` nothing is changed and the report shows what would be
+    reclaimed.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Removes unreferenced media files and instructions without a recipe"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be removed without removing anything",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=GC_BATCH_SIZE,
+            help="Number of rows or files handled per query",
+        )
+        parser.add_argument(
+            "--grace-period",
+            type=float,
+            default=GC_GRACE_PERIOD,
+            help="Seconds a file must be untouched before it can be removed",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        if options["grace_period"] < 0:
+            raise CommandError("--grace-period cannot be negative")
+
+        def on_remove(name, size):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{name} ({size} bytes)")
+
+        report = collect_media_garbage(
+            dry_run=options["dry_run"],
+            batch_size=options["batch_size"],
+            grace_period=options["grace_period"],
+            on_remove=on_remove,
+        )
+        verb = "Would remove" if report.dry_run else "Removed"
+        self.stdout.write(
+            f"Scanned {report.files_scanned} file(s). "
+            f"{verb} {report.files_removed} file(s), reclaiming "
+            f"{report.bytes_reclaimed} bytes."
+        )
+        self.stdout.write(
+            f"{verb} {report.instructions_removed} instruction(s) without a "
+            f"recipe and {report.variants_removed} unused image variant(s)."
+        )
+        if not report.dry_run:
+            self.stdout.write(
+                f"Corrected {report.blobs_reconciled} blob reference count(s)."
+            )
@@ -0,0 +1,60 @@
+"""
+Management command loading the nutrition reference dataset from CSV.
+
+Recipes show their calories and macros from totals computed offline, by
+matching their ingredients to the foods of this dataset. A dataset of
+common foods ships with the app, and any other CSV file with the same
+columns can be loaded in its place or on top of it.
+"""
+
+import csv
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from recipes.services import NUTRITION_BATCH_SIZE, load_nutrition_references
+
+DEFAULT_DATASET = Path(__file__).resolve().parents[2] / "data" / "nutrition.csv"
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to load nutrition reference foods from CSV.
+
+    The file has a header row with the columns ``name``, ``calories``,
+    ``protein``, ``fat`` and ``carbohydrate``, per 100 g, and optionally
+    ``grams_per_ml`` and ``grams_per_item``. Foods already loaded are
+    updated, matched on their normalised name, and every recipe is marked
+    for its nutrition to be computed again by ``compute_nutrition``.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Loads the nutrition reference dataset from a CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default=DEFAULT_DATASET,
+            help="The CSV file to load. Defaults to the dataset shipped with the app",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=NUTRITION_BATCH_SIZE,
+            help="Number of foods written per query",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        try:
+            with open(options["path"], newline="", encoding="utf-8") as file:
+                loaded = load_nutrition_references(
+                    csv.DictReader(file), batch_size=options["batch_size"]
+                )
+        except OSError as error:
+            raise CommandError(f"Cannot read {options['path']}: {error}")
+        except ValueError as error:
+            raise CommandError(str(error))
+        self.stdout.write(f"Loaded {loaded} nutrition reference food(s).")
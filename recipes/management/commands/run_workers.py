@@ -0,0 +1,107 @@
+"""
+Management command running background jobs from the `Job` table.
+
+Jobs are claimed from the database in batches and run in a pool of worker
+processes, so CPU-heavy work such as image resizing never blocks requests.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from recipes import worker
+from recipes.services import claim_jobs, process_pending_jobs
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to process queued background jobs.
+
+    The command polls for due jobs and keeps up to ``--concurrency`` of them
+    running at once in a process pool. With ``--concurrency 0`` jobs run one
+    at a time inside the command process, which is handy for debugging.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Runs queued background jobs in a pool of worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Number of worker processes (0 runs jobs in this process)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "JOB_QUEUE", {}).get("POLL_INTERVAL", 1.0),
+            help="Seconds to sleep when no jobs are due",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no jobs are due instead of polling forever",
+        )
+
+    def handle(self, *args, **options):
+        """Django entrypoint for the command."""
+        concurrency = options["concurrency"]
+        if concurrency < 0:
+            raise CommandError("--concurrency must be zero or more.")
+        try:
+            if concurrency == 0:
+                completed = self.run_inline(options["poll_interval"], options["once"])
+            else:
+                completed = self.run_pool(
+                    concurrency, options["poll_interval"], options["once"]
+                )
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping workers.")
+            return
+        self.stdout.write(f"Processed {completed} job(s).")
+
+    def run_inline(self, poll_interval, once):
+        """Run due jobs one batch at a time in this process."""
+        completed = 0
+        while True:
+            processed = process_pending_jobs()
+            completed += processed
+            if not processed:
+                if once:
+                    return completed
+                time.sleep(poll_interval)
+
+    def run_pool(self, concurrency, poll_interval, once):
+        """Keep up to ``concurrency`` jobs running in a process pool."""
+        completed = 0
+        running = set()
+        # Spawned workers never inherit the parent's database connections.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=concurrency,
+            mp_context=context,
+            initializer=worker.initialize,
+        ) as pool:
+            while True:
+                free_slots = concurrency - len(running)
+                if free_slots:
+                    for job_id in claim_jobs(free_slots):
+                        running.add(pool.submit(worker.run, job_id))
+                if not running:
+                    if once:
+                        return completed
+                    time.sleep(poll_interval)
+                    continue
+                done, running = wait(
+                    running, timeout=poll_interval, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    try:
+                        future.result()
+                    except Exception as error:
+                        self.stderr.write(f"Worker error: {error!r}")
+                completed += len(done)
@@ -0,0 +1,56 @@
+"""
+Management command moving media out of flat upload directories.
+
+Older uploads were stored directly in ``recipe/images`` and
+``recipe/instructions``. This command moves them into the sharded blob
+layout used by `recipes.storage.ContentAddressedStorage`.
+"""
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from recipes.services import SHARD_BATCH_SIZE, shard_media_files
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to migrate existing media to sharded paths.
+
+    Rows are rewritten in batches of ``--batch-size``, each in its own
+    transaction, while the site keeps serving the old files. The command can
+    be stopped at any point and run again to carry on where it left off.
+    Run ``gc_media`` afterwards to remove the old copies.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Moves media files from flat upload directories into sharded paths"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SHARD_BATCH_SIZE,
+            help="Number of rows rewritten per transaction",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        if not hasattr(default_storage, "blob_directory"):
+            raise CommandError("The default storage does not use sharded paths")
+
+        def on_batch(model, field_name, count):
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"Moved {count} {model._meta.label}.{field_name} file(s)"
+                )
+
+        moved, skipped = shard_media_files(
+            batch_size=options["batch_size"], on_batch=on_batch
+        )
+        self.stdout.write(f"Moved {moved} file(s).")
+        if skipped:
+            self.stdout.write(
+                self.style.WARNING(f"Skipped {skipped} row(s) with missing files.")
+            )
@@ -0,0 +1,39 @@
+"""
+Management command deleting expired idempotency keys.
+
+Every rendered recipe form can leave a key behind once it is submitted.
+Keys are only needed while a replay of the submission is likely, so this
+command is meant to be run periodically to keep the table small.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from recipes.services import IDEMPOTENCY_SWEEP_BATCH_SIZE, sweep_idempotency_keys
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to delete expired idempotency keys.
+
+    Keys are deleted in batches, each in its own transaction, so the
+    command does not hold locks on the table for long however many keys
+    have expired.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    help = "Deletes expired idempotency keys of submitted forms"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IDEMPOTENCY_SWEEP_BATCH_SIZE,
+            help="Number of keys deleted per query",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        removed = sweep_idempotency_keys(batch_size=options["batch_size"])
+        self.stdout.write(f"Deleted {removed} expired idempotency key(s).")
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0008_instruction_image"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageVariant",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        help_text="The storage name of the original image",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[("webp", "WebP"), ("jpeg", "JPEG")], max_length=4
+                    ),
+                ),
+                (
+                    "width",
+                    models.PositiveIntegerField(
+                        help_text="The width of the variant in pixels"
+                    ),
+                ),
+                (
+                    "height",
+                    models.PositiveIntegerField(
+                        help_text="The height of the variant in pixels"
+                    ),
+                ),
+                (
+                    "file",
+                    models.ImageField(max_length=255, upload_to="recipe/variants"),
+                ),
+            ],
+            options={
+                "ordering": ["source", "format", "width"],
+                "unique_together": {("source", "format", "width")},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0010_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "digest",
+                    models.CharField(
+                        db_index=True,
+                        help_text="SHA-256 of the file content",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="The storage name of the blob",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "size",
+                    models.PositiveBigIntegerField(
+                        help_text="The size of the blob in bytes"
+                    ),
+                ),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+    ]
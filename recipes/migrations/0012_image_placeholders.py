@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0011_mediablob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="instruction",
+            name="image_placeholder",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="A tiny inline preview of the image, shown while it loads",
+            ),
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="image_placeholder",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="A tiny inline preview of the image, shown while it loads",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:08
+
+from django.db import migrations, models
+from django.db.models import F
+
+# recipes.services.STEP_GAP at the time of this migration.
+STEP_GAP = 1024
+
+
+def spread_steps(apps, schema_editor):
+    """Space existing step numbers apart, keeping their order."""
+    Instruction = apps.get_model("recipes", "Instruction")
+    # Negate first, so no row takes a value another row still holds.
+    Instruction.objects.update(step=-F("step"))
+    Instruction.objects.update(step=-F("step") * STEP_GAP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0012_image_placeholders"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="instruction",
+            name="step",
+            field=models.IntegerField(
+                help_text="Sort key of the instruction within its recipe. Keys are sparse, and the step number shown is the instruction's rank"
+            ),
+        ),
+        migrations.RunPython(spread_steps, migrations.RunPython.noop),
+    ]
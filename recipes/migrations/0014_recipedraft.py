@@ -0,0 +1,69 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0013_sparse_instruction_steps"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeDraft",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "data",
+                    models.BinaryField(
+                        help_text="The form data, as zlib-compressed JSON"
+                    ),
+                ),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recipe_drafts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="The recipe being edited, or empty for a new recipe",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="drafts",
+                        to="recipes.recipe",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("author", "recipe"), name="unique_recipe_draft"
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("recipe__isnull", True)),
+                        fields=("author",),
+                        name="unique_new_recipe_draft",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0015_idempotencykey"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeRevision",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField()),
+                (
+                    "is_snapshot",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the data is the full recipe rather than a delta",
+                    ),
+                ),
+                (
+                    "data",
+                    models.BinaryField(help_text="The snapshot or delta, as zlib JSON"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="revisions",
+                        to="recipes.recipe",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("recipe", "number"), name="unique_recipe_revision"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0016_reciperevision"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1,
+                editable=False,
+                help_text="Incremented by every edit, to detect concurrent edits",
+            ),
+        ),
+    ]
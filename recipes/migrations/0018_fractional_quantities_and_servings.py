@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:48
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0017_recipe_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="servings",
+            field=models.PositiveIntegerField(
+                default=4,
+                help_text="The number of servings the ingredients make",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ingredient",
+            name="quantity",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=3,
+                help_text="The quantity of the ingredient, such as 0.5 for half a cup",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+    ]
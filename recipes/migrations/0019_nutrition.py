@@ -0,0 +1,107 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0018_fractional_quantities_and_servings"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NutritionReference",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(help_text="The name of the food", max_length=100),
+                ),
+                (
+                    "normalised_name",
+                    models.CharField(
+                        help_text="The name, as ingredients are matched",
+                        max_length=100,
+                        unique=True,
+                    ),
+                ),
+                ("calories", models.FloatField(help_text="Energy per 100 g, in kcal")),
+                ("protein", models.FloatField(help_text="Protein per 100 g, in grams")),
+                ("fat", models.FloatField(help_text="Fat per 100 g, in grams")),
+                (
+                    "carbohydrate",
+                    models.FloatField(help_text="Carbohydrate per 100 g, in grams"),
+                ),
+                (
+                    "grams_per_ml",
+                    models.FloatField(
+                        blank=True, help_text="The density of the food", null=True
+                    ),
+                ),
+                (
+                    "grams_per_item",
+                    models.FloatField(
+                        blank=True,
+                        help_text="The weight of one piece of the food",
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="calories",
+            field=models.FloatField(
+                editable=False,
+                help_text="Energy of the whole recipe, in kcal",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="carbohydrate",
+            field=models.FloatField(
+                editable=False,
+                help_text="Carbohydrate of the whole recipe, in grams",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="fat",
+            field=models.FloatField(
+                editable=False, help_text="Fat of the whole recipe, in grams", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="nutrition_stale",
+            field=models.BooleanField(
+                db_index=True,
+                default=True,
+                editable=False,
+                help_text="Whether the ingredients changed since nutrition was computed",
+            ),
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="protein",
+            field=models.FloatField(
+                editable=False,
+                help_text="Protein of the whole recipe, in grams",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0019_nutrition"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeSummary",
+            fields=[
+                (
+                    "recipe",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="recipes.recipe",
+                    ),
+                ),
+                ("author_name", models.CharField(max_length=150)),
+                ("title", models.CharField(max_length=100)),
+                ("ingredient_count", models.PositiveIntegerField(default=0)),
+                ("step_count", models.PositiveIntegerField(default=0)),
+                (
+                    "time_display",
+                    models.CharField(
+                        help_text="The time taken, as shown by Recipe.get_time()",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "thumbnail",
+                    models.CharField(
+                        blank=True,
+                        help_text="The storage name of the smallest image of the recipe",
+                        max_length=255,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                (
+                    "author",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recipe_summaries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(fields=["-created_at"], name="summary_newest_idx"),
+                    models.Index(
+                        fields=["author", "-created_at"],
+                        name="summary_author_newest_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
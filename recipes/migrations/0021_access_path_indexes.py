@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("recipes", "0020_recipesummary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(fields=["-created_at"], name="recipe_newest_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(
+                fields=["author", "-created_at"], name="recipe_author_newest_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["last_name", "first_name"], name="user_name_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="instruction",
+            name="recipe",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="instructions",
+                to="recipes.recipe",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="recipe",
+            name="author",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="recipes",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:49
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def drop_original_thumbnails(apps, schema_editor):
+    """Copy placeholders, and stop using original uploads as thumbnails."""
+    Recipe = apps.get_model("recipes", "Recipe")
+    RecipeSummary = apps.get_model("recipes", "RecipeSummary")
+    recipes = Recipe.objects.filter(pk=OuterRef("recipe_id"))
+    RecipeSummary.objects.update(
+        image_placeholder=Subquery(recipes.values("image_placeholder")[:1])
+    )
+    RecipeSummary.objects.filter(thumbnail=F("recipe__image")).update(thumbnail="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0021_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipesummary",
+            name="image_placeholder",
+            field=models.TextField(
+                blank=True,
+                default="",
+                help_text="The tiny inline preview of the recipe's image, shown until the thumbnail exists and while it loads",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="recipesummary",
+            name="thumbnail",
+            field=models.CharField(
+                blank=True,
+                help_text="The storage name of the smallest JPEG variant of the recipe's image, or empty until one is generated",
+                max_length=255,
+            ),
+        ),
+        migrations.RunPython(drop_original_thumbnails, migrations.RunPython.noop),
+    ]
@@ -2,3 +2,12 @@ from .user import *
 from .recipe import *
 from .ingredient import *
 from .instruction import *
+from .image_variant import *
+from .job import *
+from .media_blob import *
+from .recipe_draft import *
+from .idempotency_key import *
+from .recipe_revision import *
+from .nutrition_reference import *
+from .recipe_summary import *
+from .api_token import *
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import models
+
+
+class ApiToken(models.Model):
+    """
+    Model used to authenticate API clients that have no browser session.
+
+    Clients send the token's key in an ``Authorization: Bearer`` header. Only
+    a SHA-256 digest of the key is stored, so the key is shown once, when
+    the token is issued by `recipes.services.issue_api_token`.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="api_tokens",
+    )
+    name = models.CharField(
+        max_length=100, blank=True, help_text="What the token is used for"
+    )
+    digest = models.CharField(
+        max_length=64, unique=True, help_text="SHA-256 of the token's key"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Model options."""
+
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"API token {self.name or self.pk} of {self.user}"
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """
+    Model used to remember a form submission that has been carried out.
+
+    A key is issued with each rendered form and sent back when it is
+    submitted. The first submission stores the response it redirected to,
+    and replays of it, from a double click or a retried request, are given
+    that response again instead of repeating the work. Keys are swept once
+    they expire.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    key = models.CharField(max_length=64)
+    location = models.CharField(
+        max_length=2048, blank=True, help_text="Where the submission redirected to"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        """Model options."""
+
+        ordering = ["id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_idempotency_key"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Idempotency key {self.key} of {self.user}"
@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class ImageVariant(models.Model):
+    """
+    Model used for a resized copy of an uploaded image.
+
+    Variants are keyed by the storage name of the original image rather than
+    by a foreign key, so the same rows serve both `Recipe.image` and
+    `Instruction.image`.
+    """
+
+    class Format(models.TextChoices):
+        WEBP = "webp", "WebP"
+        JPEG = "jpeg", "JPEG"
+
+    source = models.CharField(
+        max_length=255, help_text="The storage name of the original image"
+    )
+    format = models.CharField(max_length=4, choices=Format.choices)
+    width = models.PositiveIntegerField(help_text="The width of the variant in pixels")
+    height = models.PositiveIntegerField(
+        help_text="The height of the variant in pixels"
+    )
+    file = models.ImageField(upload_to="recipe/variants", max_length=255)
+
+    class Meta:
+        """Model options."""
+
+        unique_together = ("source", "format", "width")
+        ordering = ["source", "format", "width"]
+
+    def __str__(self):
+        return f"{self.source} ({self.width}w {self.format})"
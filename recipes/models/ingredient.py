@@ -1,3 +1,4 @@
+from decimal import Decimal
 from django.db import models
 from .recipe import Recipe
 
@@ -11,8 +12,12 @@ class Ingredient(models.Model):
     name = models.CharField(
         max_length=100, blank=False, help_text="The name of the ingredient"
     )
-    quantity = models.IntegerField(
-        blank=True, null=True, help_text="The quantity of the ingredient"
+    quantity = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        blank=True,
+        null=True,
+        help_text="The quantity of the ingredient, such as 0.5 for half a cup",
     )
     unit = models.CharField(
         max_length=50, blank=True, help_text="The unit of measurement"
@@ -28,10 +33,16 @@ class Ingredient(models.Model):
         string = ""
 
         if self.quantity or self.quantity == 0:
-            string += str(self.quantity) + " "
+            string += self.get_quantity() + " "
         if self.unit:
             string += str(self.unit) + " "
 
         string += self.name
 
         return string
+
+    def get_quantity(self):
+        """Return the quantity without trailing zeros, or "" if there is none."""
+        if self.quantity is None:
+            return ""
+        return format(Decimal(self.quantity).normalize(), "f")
@@ -12,9 +12,15 @@ class Instruction(models.Model):
         null=True,
         blank=True,
         related_name="instructions",
+        # Lookups by recipe are served by the (recipe, step) unique index.
+        db_index=False,
     )
     step = models.IntegerField(
-        blank=False, help_text="The step number of the instruction"
+        blank=False,
+        help_text=(
+            "Sort key of the instruction within its recipe. Keys are sparse, "
+            "and the step number shown is the instruction's rank"
+        ),
     )
     description = models.TextField(
         max_length=500, blank=False, help_text="The text of the instruction"
@@ -25,6 +31,12 @@ class Instruction(models.Model):
         null=True,
         help_text="An optional image for this instruction step",
     )
+    image_placeholder = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="A tiny inline preview of the image, shown while it loads",
+    )
 
     class Meta:
         """Model options."""
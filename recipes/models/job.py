@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    Model used for a unit of background work.
+
+    Jobs are written in the same transaction as the change that needs them
+    and are processed out of band by `manage.py run_workers`.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    kind = models.CharField(max_length=50, help_text="The name of the job handler")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(
+        default=timezone.now, help_text="The job is not run before this time"
+    )
+    claimed_by = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="A running job whose lock expires is picked up again",
+    )
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Model options."""
+
+        ordering = ["id"]
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"{self.kind} job {self.pk} ({self.status})"
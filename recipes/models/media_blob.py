@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    Model used to count references to a content-addressed media file.
+
+    Every upload stored through `recipes.storage.ContentAddressedStorage`
+    adds a reference to the blob holding its content, so identical uploads
+    share one file on disk.
+    """
+
+    digest = models.CharField(
+        max_length=64, db_index=True, help_text="SHA-256 of the file content"
+    )
+    name = models.CharField(
+        max_length=255, unique=True, help_text="The storage name of the blob"
+    )
+    size = models.PositiveBigIntegerField(help_text="The size of the blob in bytes")
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Model options."""
+
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} references)"
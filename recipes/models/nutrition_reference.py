@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class NutritionReference(models.Model):
+    """
+    Model used for the nutrients of one food, from a reference dataset.
+
+    Nutrients are given per 100 g. Quantities measured by volume or by the
+    item are weighed with the food's density and typical item weight,
+    where the dataset knows them. Ingredients are matched to foods by their
+    normalised name, which is unique and indexed.
+    """
+
+    name = models.CharField(max_length=100, help_text="The name of the food")
+    normalised_name = models.CharField(
+        max_length=100, unique=True, help_text="The name, as ingredients are matched"
+    )
+    calories = models.FloatField(help_text="Energy per 100 g, in kcal")
+    protein = models.FloatField(help_text="Protein per 100 g, in grams")
+    fat = models.FloatField(help_text="Fat per 100 g, in grams")
+    carbohydrate = models.FloatField(help_text="Carbohydrate per 100 g, in grams")
+    grams_per_ml = models.FloatField(
+        blank=True, null=True, help_text="The density of the food"
+    )
+    grams_per_item = models.FloatField(
+        blank=True, null=True, help_text="The weight of one piece of the food"
+    )
+
+    class Meta:
+        """Model options."""
+
+        ordering = ["id"]
+
+    def __str__(self):
+        return self.name
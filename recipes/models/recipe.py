@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.core.validators import MinValueValidator
 
 
 class Recipe(models.Model):
@@ -11,7 +12,10 @@ class Recipe(models.Model):
         HARD = 3, "Hard"
 
     author = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="recipes"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="recipes",
+        db_index=False,
     )
     title = models.CharField(max_length=100, blank=False)
     description = models.TextField(blank=True, help_text="A description of the recipe.")
@@ -27,11 +31,48 @@ class Recipe(models.Model):
         null=True,
         help_text="An optional image for the recipe",
     )
+    image_placeholder = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="A tiny inline preview of the image, shown while it loads",
+    )
     time = models.IntegerField(
         blank=False,
         default=30,
         help_text="Time taken to complete the recipe (in minutes)",
     )
+    servings = models.PositiveIntegerField(
+        default=4,
+        validators=[MinValueValidator(1)],
+        help_text="The number of servings the ingredients make",
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text="Incremented by every edit, to detect concurrent edits",
+    )
+
+    calories = models.FloatField(
+        null=True, editable=False, help_text="Energy of the whole recipe, in kcal"
+    )
+    protein = models.FloatField(
+        null=True, editable=False, help_text="Protein of the whole recipe, in grams"
+    )
+    fat = models.FloatField(
+        null=True, editable=False, help_text="Fat of the whole recipe, in grams"
+    )
+    carbohydrate = models.FloatField(
+        null=True,
+        editable=False,
+        help_text="Carbohydrate of the whole recipe, in grams",
+    )
+    nutrition_stale = models.BooleanField(
+        default=True,
+        editable=False,
+        db_index=True,
+        help_text="Whether the ingredients changed since nutrition was computed",
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -39,6 +80,14 @@ class Recipe(models.Model):
         """Model options."""
 
         ordering = ["-created_at"]
+        # The newest recipes overall and of one author, which also serves
+        # lookups by author alone.
+        indexes = [
+            models.Index(fields=["-created_at"], name="recipe_newest_idx"),
+            models.Index(
+                fields=["author", "-created_at"], name="recipe_author_newest_idx"
+            ),
+        ]
 
     def __str__(self):
         """Return the recipe title."""
@@ -57,3 +106,18 @@ class Recipe(models.Model):
 
         hours = minutes / 60
         return f"{hours:.1f} hrs"
+
+    def get_nutrition_per_serving(self):
+        """
+        Return the nutrients of one serving, or ``None`` if not yet computed.
+
+        Returns:
+            dict[str, float] | None: Calories, protein, fat and carbohydrate
+            of one serving, rounded to whole numbers.
+        """
+        if self.calories is None:
+            return None
+        return {
+            name: round(getattr(self, name) / self.servings)
+            for name in ["calories", "protein", "fat", "carbohydrate"]
+        }
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db import models
+from .recipe import Recipe
+
+
+class RecipeDraft(models.Model):
+    """
+    Model used to keep the unsaved state of a recipe form.
+
+    There is at most one draft per user for a new recipe, and one per user
+    and recipe being edited. The form data is stored as compressed JSON and
+    the draft is discarded once it expires or the form is submitted.
+    """
+
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="recipe_drafts",
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="drafts",
+        help_text="The recipe being edited, or empty for a new recipe",
+    )
+    data = models.BinaryField(help_text="The form data, as zlib-compressed JSON")
+    expires_at = models.DateTimeField(db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Model options."""
+
+        ordering = ["id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["author", "recipe"], name="unique_recipe_draft"
+            ),
+            models.UniqueConstraint(
+                fields=["author"],
+                condition=models.Q(recipe__isnull=True),
+                name="unique_new_recipe_draft",
+            ),
+        ]
+
+    def __str__(self):
+        if self.recipe_id:
+            return f"Draft of recipe {self.recipe_id} by {self.author}"
+        return f"Draft of a new recipe by {self.author}"
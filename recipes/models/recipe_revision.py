@@ -0,0 +1,37 @@
+from django.db import models
+from .recipe import Recipe
+
+
+class RecipeRevision(models.Model):
+    """
+    Model used for one saved version of a recipe and its children.
+
+    Revisions are numbered from 1 per recipe. Most store only a compressed
+    delta from the previous revision, and every few revisions a full
+    snapshot is stored instead, so any version can be rebuilt from a
+    bounded number of rows. See `recipes.services.recipe_revisions`.
+    """
+
+    recipe = models.ForeignKey(
+        Recipe, on_delete=models.CASCADE, related_name="revisions"
+    )
+    number = models.PositiveIntegerField()
+    is_snapshot = models.BooleanField(
+        default=False,
+        help_text="Whether the data is the full recipe rather than a delta",
+    )
+    data = models.BinaryField(help_text="The snapshot or delta, as zlib JSON")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Model options."""
+
+        ordering = ["id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipe", "number"], name="unique_recipe_revision"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Revision {self.number} of recipe {self.recipe_id}"
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models
+from .recipe import Recipe
+
+
+class RecipeSummary(models.Model):
+    """
+    Model used for the fields lists of recipes show, kept in one narrow row.
+
+    Rows are written by `recipes.services.refresh_recipe_summaries` in the
+    same transaction as the recipe changes they summarise, so lists read
+    counts, names and thumbnails without joins or ``GROUP BY``. Indexes
+    cover the newest recipes overall and the newest recipes of one author,
+    which also serves lookups by author alone.
+    """
+
+    recipe = models.OneToOneField(
+        Recipe, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="recipe_summaries",
+        db_index=False,
+    )
+    author_name = models.CharField(max_length=150)
+    title = models.CharField(max_length=100)
+    ingredient_count = models.PositiveIntegerField(default=0)
+    step_count = models.PositiveIntegerField(default=0)
+    time_display = models.CharField(
+        max_length=20, help_text="The time taken, as shown by Recipe.get_time()"
+    )
+    thumbnail = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text=(
+            "The storage name of the smallest JPEG variant of the recipe's "
+            "image, or empty until one is generated"
+        ),
+    )
+    image_placeholder = models.TextField(
+        blank=True,
+        default="",
+        help_text=(
+            "The tiny inline preview of the recipe's image, shown until the "
+            "thumbnail exists and while it loads"
+        ),
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        """Model options."""
+
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at"], name="summary_newest_idx"),
+            models.Index(
+                fields=["author", "-created_at"], name="summary_author_newest_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Summary of {self.title}"
+
+    def get_thumbnail_url(self):
+        """Return the URL of the thumbnail, or "" if the recipe has no image."""
+        return default_storage.url(self.thumbnail) if self.thumbnail else ""
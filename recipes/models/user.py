@@ -25,6 +25,9 @@ class User(AbstractUser):
         """Model options."""
 
         ordering = ["last_name", "first_name"]
+        indexes = [
+            models.Index(fields=["last_name", "first_name"], name="user_name_idx")
+        ]
 
     def full_name(self):
         """Return a string containing the user's full name."""
@@ -0,0 +1,18 @@
+from .jobs import *
+from .images import *
+from .image_queue import *
+from .recipe_detail import *
+from .media_gc import *
+from .media_sharding import *
+from .recipe_revisions import *
+from .recipe_writer import *
+from .instruction_order import *
+from .recipe_drafts import *
+from .idempotency import *
+from .recipe_fork import *
+from .recipe_scaling import *
+from .shopping_list import *
+from .recipe_nutrition import *
+from .recipe_summaries import *
+from .query_audit import *
+from .api_tokens import *
@@ -0,0 +1,27 @@
+import hashlib
+import secrets
+from recipes.models import ApiToken
+
+
+def issue_api_token(user, name=""):
+    """
+    Issue a new API token for a user.
+
+    Returns:
+        str: The token's key. It is not stored, so it cannot be shown again.
+    """
+    key = secrets.token_urlsafe(32)
+    ApiToken.objects.create(user=user, name=name, digest=_digest(key))
+    return key
+
+
+def authenticate_api_token(key):
+    """Return the active user an API token's key belongs to, or ``None``."""
+    token = ApiToken.objects.select_related("user").filter(digest=_digest(key)).first()
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
+
+def _digest(key):
+    return hashlib.sha256(key.encode()).hexdigest()
@@ -0,0 +1,110 @@
+import secrets
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from recipes.models import IdempotencyKey
+
+IDEMPOTENCY_KEY_DEFAULTS = {"TTL": 24 * 60 * 60}
+
+IDEMPOTENCY_SWEEP_BATCH_SIZE = 1000
+
+# Longest key accepted from a client, the length of the key column.
+IDEMPOTENCY_KEY_MAX_LENGTH = 64
+
+
+def issue_idempotency_key():
+    """Return a new key to send with a rendered form."""
+    return secrets.token_urlsafe(32)
+
+
+def replayed_location(user, key):
+    """
+    Return where a submission already carried out with ``key`` redirected.
+
+    Args:
+        user (User): The user submitting the form.
+        key (str): The key sent with the form.
+
+    Returns:
+        str: The location of the original redirect, or ``None`` if no
+        submission with ``key`` has completed or its key has expired.
+    """
+    return (
+        IdempotencyKey.objects.filter(user=user, key=key, expires_at__gt=timezone.now())
+        .values_list("location", flat=True)
+        .first()
+    )
+
+
+def run_once(user, key, action):
+    """
+    Carry out a submission, unless one with the same key already has.
+
+    The key is claimed by inserting its row in the same transaction as the
+    writes made by ``action``, so of two concurrent submissions only one can
+    commit, and the other finds the row of the first once it is released.
+    A key whose row has expired but not been swept yet is reused.
+
+    Args:
+        user (User): The user submitting the form.
+        key (str): The key sent with the form. If empty, ``action`` is
+            always run.
+        action (callable): Carries out the submission and returns the
+            location to redirect to.
+
+    Returns:
+        tuple[str, bool]: The location to redirect to, and whether it is
+        that of an earlier submission, in which case ``action`` was not run.
+    """
+    if not key:
+        return action(), False
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=_config("TTL"))
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user, key=key, expires_at=expires_at
+                )
+        except IntegrityError:
+            record = IdempotencyKey.objects.select_for_update().get(user=user, key=key)
+            if record.expires_at > now:
+                return record.location, True
+            record.expires_at = expires_at
+        record.location = action()
+        record.save(update_fields=["location", "expires_at"])
+    return record.location, False
+
+
+def sweep_idempotency_keys(batch_size=IDEMPOTENCY_SWEEP_BATCH_SIZE, now=None):
+    """
+    Delete expired idempotency keys, ``batch_size`` rows at a time.
+
+    Each batch is deleted in its own short transaction, so sweeping a large
+    backlog does not hold locks for long.
+
+    Args:
+        batch_size (int): Number of keys deleted per query.
+        now (datetime, optional): Keys that expired by then are deleted.
+
+    Returns:
+        int: The number of keys deleted.
+    """
+    expired = IdempotencyKey.objects.filter(
+        expires_at__lte=now or timezone.now()
+    ).order_by()
+    removed = 0
+    while True:
+        batch = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return removed
+        with transaction.atomic():
+            IdempotencyKey.objects.filter(pk__in=batch).delete()
+        removed += len(batch)
+
+
+def _config(name):
+    return getattr(settings, "IDEMPOTENCY_KEYS", {}).get(
+        name, IDEMPOTENCY_KEY_DEFAULTS[name]
+    )
@@ -0,0 +1,60 @@
+from recipes.services.images import generate_variants
+from recipes.services.jobs import enqueue_many, job_handler
+from recipes.services.recipe_detail import invalidate_recipe_detail
+from recipes.services.recipe_summaries import refresh_recipe_summaries
+
+
+def enqueue_recipe_variants(recipe, instructions=None):
+    """
+    Queue variant generation for a recipe's image and its instructions' images.
+
+    Each image gets its own job so workers can resize them in parallel.
+
+    Args:
+        recipe (Recipe): The saved recipe.
+        instructions (list[Instruction], optional): The recipe's
+            instructions, if the caller already has them. They are loaded
+            from the database otherwise.
+
+    Returns:
+        int: The number of jobs queued.
+    """
+    sources = [recipe.image.name] if recipe.image else []
+    if instructions is None:
+        sources.extend(
+            recipe.instructions.exclude(image="")
+            .exclude(image__isnull=True)
+            .values_list("image", flat=True)
+        )
+    else:
+        sources.extend(
+            instruction.image.name for instruction in instructions if instruction.image
+        )
+    return enqueue_image_variants(sources, recipe.pk)
+
+
+def enqueue_image_variants(sources, recipe_id):
+    """
+    Queue variant generation for images of the recipe ``recipe_id``.
+
+    Returns:
+        int: The number of jobs queued.
+    """
+    enqueue_many(
+        "image_variants",
+        [{"source": source, "recipe_id": recipe_id} for source in sources],
+    )
+    return len(sources)
+
+
+@job_handler("image_variants")
+def generate_variants_job(source, recipe_id=None):
+    """
+    Job handler generating the variants of ``source``.
+
+    The recipe's summary is written again, so lists show the new thumbnail.
+    """
+    generate_variants(source)
+    if recipe_id is not None:
+        refresh_recipe_summaries([recipe_id])
+        invalidate_recipe_detail(recipe_id)
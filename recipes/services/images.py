@@ -0,0 +1,142 @@
+import base64
+import io
+import os
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+from recipes.models import ImageVariant
+
+VARIANT_WIDTHS = (320, 640, 1280)
+
+VARIANT_ENCODINGS = {
+    ImageVariant.Format.WEBP: ("WEBP", {"quality": 80, "method": 4}),
+    ImageVariant.Format.JPEG: (
+        "JPEG",
+        {"quality": 82, "optimize": True, "progressive": True},
+    ),
+}
+
+PLACEHOLDER_SIZE = 24
+
+PLACEHOLDER_ENCODING = ("WEBP", {"quality": 40, "method": 6})
+
+
+def make_placeholder(image_file):
+    """
+    Encode a tiny preview of an image as a ``data:`` URI.
+
+    The preview is at most ``PLACEHOLDER_SIZE`` pixels on its longest side,
+    which keeps it to a few hundred bytes, small enough to be inlined in the
+    page and stretched and blurred while the real image loads. JPEG images
+    are decoded at a reduced scale, so this stays cheap for large uploads.
+
+    Args:
+        image_file (File): The uploaded image.
+
+    Returns:
+        str: The preview as a ``data:image/webp;base64,...`` URI.
+    """
+    image_file.seek(0)
+    with Image.open(image_file) as image:
+        image.draft("RGB", (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        image = _flatten(ImageOps.exif_transpose(image))
+    image_file.seek(0)
+    image.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    pillow_format, options = PLACEHOLDER_ENCODING
+    buffer = io.BytesIO()
+    image.save(buffer, pillow_format, **options)
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return f"data:image/{pillow_format.lower()};base64,{encoded}"
+
+
+def generate_variants(source, storage=None):
+    """
+    Create and record the resized variants of an uploaded image.
+
+    The image is rotated according to its EXIF orientation and then resized
+    to each width in ``VARIANT_WIDTHS`` (never upscaled), largest first so
+    every resize starts from the previous, smaller result. Each size is saved
+    as WebP and as JPEG without any of the original metadata.
+
+    Variants that already exist are left untouched, so calling this twice for
+    the same image is cheap.
+
+    Args:
+        source (str): The storage name of the original image.
+        storage (Storage, optional): Storage holding the original and the
+            variants. Defaults to ``default_storage``.
+
+    Returns:
+        list[ImageVariant]: The variants of the image.
+    """
+    storage = storage or default_storage
+    existing = list(ImageVariant.objects.filter(source=source))
+    if existing:
+        return existing
+
+    with storage.open(source) as original:
+        with Image.open(original) as image:
+            image = ImageOps.exif_transpose(image)
+            image = _flatten(image)
+
+    variants = []
+    for width in sorted(_target_widths(image.width), reverse=True):
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+        for variant_format, (pillow_format, options) in VARIANT_ENCODINGS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, pillow_format, **options)
+            name = storage.save(
+                _variant_name(source, width, variant_format),
+                ContentFile(buffer.getvalue()),
+            )
+            variants.append(
+                ImageVariant(
+                    source=source,
+                    format=variant_format,
+                    width=width,
+                    height=height,
+                    file=name,
+                )
+            )
+    ImageVariant.objects.bulk_create(variants, ignore_conflicts=True)
+    return list(ImageVariant.objects.filter(source=source))
+
+
+def variants_by_source(sources):
+    """
+    Return the variants of several images in one query.
+
+    Args:
+        sources (Iterable[str]): Storage names of original images.
+
+    Returns:
+        dict[str, list[ImageVariant]]: Variants keyed by source name. Images
+        without variants are missing from the result.
+    """
+    grouped = {}
+    names = {source for source in sources if source}
+    if not names:
+        return grouped
+    for variant in ImageVariant.objects.filter(source__in=names):
+        grouped.setdefault(variant.source, []).append(variant)
+    return grouped
+
+
+def _target_widths(original_width):
+    return {min(width, original_width) for width in VARIANT_WIDTHS}
+
+
+def _flatten(image):
+    """Return ``image`` as RGB, compositing any transparency onto white."""
+    if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _variant_name(source, width, variant_format):
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return f"recipe/variants/{stem}-{width}w.{variant_format}"
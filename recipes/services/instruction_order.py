@@ -0,0 +1,79 @@
+from django.db import transaction
+from django.db.models import F, Min
+from recipes.models import Instruction
+
+# Distance between the sort keys of neighbouring instructions after they are
+# written in order, leaving room for ten midpoint moves between any two.
+STEP_GAP = 1024
+
+
+def spaced_step(rank):
+    """Return the sort key of the instruction at ``rank``, counted from 1."""
+    return rank * STEP_GAP
+
+
+def move_instruction(instruction, after=None):
+    """
+    Move an instruction to just after another one of the same recipe.
+
+    ``Instruction.step`` is a sparse sort key rather than the number shown
+    to users, which is the instruction's rank and is worked out when the
+    recipe is displayed. The moved instruction takes the key halfway between
+    its new neighbours, so a move writes a single row, whatever the length
+    of the recipe. When the neighbours have no key left between them, the
+    recipe's keys are first spread out again with `rebalance_steps`.
+
+    Args:
+        instruction (Instruction): The instruction to move.
+        after (Instruction, optional): The instruction it should follow, or
+            ``None`` to make it the first step.
+
+    Returns:
+        Instruction: ``instruction``, with its new sort key.
+    """
+    others = Instruction.objects.filter(recipe_id=instruction.recipe_id).exclude(
+        pk=instruction.pk
+    )
+    with transaction.atomic():
+        lower, upper = _neighbour_steps(others, after)
+        if upper is not None and upper - lower < 2:
+            rebalance_steps(instruction.recipe_id)
+            lower, upper = _neighbour_steps(others, after)
+        instruction.step = lower + STEP_GAP if upper is None else (lower + upper) // 2
+        Instruction.objects.filter(pk=instruction.pk).update(step=instruction.step)
+    return instruction
+
+
+def rebalance_steps(recipe_id):
+    """
+    Spread the sort keys of a recipe's instructions `STEP_GAP` apart.
+
+    The order of the instructions is kept. Keys are first moved to values no
+    real row can have, so the per-recipe unique constraint holds throughout.
+
+    Args:
+        recipe_id (int): The primary key of the recipe.
+
+    Returns:
+        int: The number of instructions rewritten.
+    """
+    instructions = list(
+        Instruction.objects.filter(recipe_id=recipe_id)
+        .order_by("step", "pk")
+        .only("pk", "step")
+    )
+    with transaction.atomic():
+        Instruction.objects.filter(recipe_id=recipe_id).update(step=-F("pk"))
+        for rank, instruction in enumerate(instructions, start=1):
+            instruction.step = spaced_step(rank)
+        Instruction.objects.bulk_update(instructions, ["step"])
+    return len(instructions)
+
+
+def _neighbour_steps(others, after):
+    """Return the sort keys an instruction placed after ``after`` goes between."""
+    lower = (
+        others.filter(pk=after.pk).values_list("step", flat=True).get() if after else 0
+    )
+    upper = others.filter(step__gt=lower).aggregate(upper=Min("step"))["upper"]
+    return lower, upper
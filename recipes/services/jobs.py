@@ -0,0 +1,131 @@
+import traceback
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from recipes.models import Job
+
+JOB_HANDLERS = {}
+
+
+def job_handler(kind):
+    """
+    Register the decorated function as the handler for jobs of ``kind``.
+
+    Handlers are called with the job payload as keyword arguments.
+    """
+
+    def register(function):
+        JOB_HANDLERS[kind] = function
+        return function
+
+    return register
+
+
+def enqueue(kind, **payload):
+    """
+    Queue a job of ``kind`` to be run by a worker.
+
+    Call this inside the transaction making the change that needs the job,
+    so the job is only visible to workers once that change is committed.
+
+    Returns:
+        Job: The queued job.
+    """
+    return Job.objects.create(kind=kind, payload=payload)
+
+
+def enqueue_many(kind, payloads):
+    """
+    Queue one job of ``kind`` per payload with a single INSERT.
+
+    Returns:
+        list[Job]: The queued jobs.
+    """
+    return Job.objects.bulk_create(
+        [Job(kind=kind, payload=payload) for payload in payloads]
+    )
+
+
+def claim_jobs(limit, worker_id=None):
+    """
+    Atomically claim up to ``limit`` jobs that are due.
+
+    A job is due if it is pending and its ``run_after`` has passed, or if it
+    is running but its lock has expired because its worker died. Claimed jobs
+    are marked running and locked for ``JOB_QUEUE["LEASE_TIMEOUT"]`` seconds.
+
+    Returns:
+        list[int]: Primary keys of the claimed jobs.
+    """
+    now = timezone.now()
+    worker_id = worker_id or uuid.uuid4().hex
+    due = Q(status=Job.Status.PENDING, run_after__lte=now) | Q(
+        status=Job.Status.RUNNING, locked_until__lt=now
+    )
+    candidates = list(Job.objects.filter(due).values_list("pk", flat=True)[:limit])
+    if not candidates:
+        return []
+    # Re-check the due condition in the UPDATE so concurrent workers racing
+    # for the same rows each claim a disjoint subset.
+    Job.objects.filter(due, pk__in=candidates).update(
+        status=Job.Status.RUNNING,
+        claimed_by=worker_id,
+        locked_until=now + timedelta(seconds=_config("LEASE_TIMEOUT", 300)),
+        attempts=F("attempts") + 1,
+    )
+    return list(
+        Job.objects.filter(
+            pk__in=candidates, claimed_by=worker_id, status=Job.Status.RUNNING
+        ).values_list("pk", flat=True)
+    )
+
+
+def run_job(job_id):
+    """
+    Run the claimed job ``job_id`` and record the outcome.
+
+    Failed jobs are retried with exponential backoff until they have been
+    attempted ``JOB_QUEUE["MAX_ATTEMPTS"]`` times.
+
+    Returns:
+        str: The resulting job status.
+    """
+    job = Job.objects.get(pk=job_id)
+    try:
+        handler = JOB_HANDLERS[job.kind]
+        handler(**job.payload)
+    except Exception:
+        if job.attempts >= _config("MAX_ATTEMPTS", 5):
+            status = Job.Status.FAILED
+        else:
+            status = Job.Status.PENDING
+        Job.objects.filter(pk=job.pk).update(
+            status=status,
+            locked_until=None,
+            run_after=timezone.now() + timedelta(seconds=2**job.attempts),
+            last_error=traceback.format_exc(),
+        )
+        return status
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.Status.DONE, locked_until=None, last_error=""
+    )
+    return Job.Status.DONE
+
+
+def process_pending_jobs(limit=100):
+    """
+    Claim and run due jobs in the current process.
+
+    Returns:
+        int: The number of jobs run.
+    """
+    job_ids = claim_jobs(limit)
+    for job_id in job_ids:
+        run_job(job_id)
+    return len(job_ids)
+
+
+def _config(name, default):
+    return getattr(settings, "JOB_QUEUE", {}).get(name, default)
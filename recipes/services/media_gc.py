@@ -0,0 +1,229 @@
+import os
+import time
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models import Count, Q
+from recipes.models import ImageVariant, Instruction, MediaBlob
+
+GC_BATCH_SIZE = 1000
+
+GC_GRACE_PERIOD = 3600
+
+
+@dataclass
+class MediaGarbageReport:
+    """What a garbage collection run removed, or would remove on a dry run."""
+
+    dry_run: bool = False
+    files_scanned: int = 0
+    files_removed: int = 0
+    bytes_reclaimed: int = 0
+    instructions_removed: int = 0
+    variants_removed: int = 0
+    blobs_reconciled: int = 0
+
+
+def collect_media_garbage(
+    dry_run=False,
+    batch_size=GC_BATCH_SIZE,
+    grace_period=GC_GRACE_PERIOD,
+    storage=None,
+    now=None,
+    on_remove=None,
+):
+    """
+    Remove media files and rows that nothing references any more.
+
+    Runs in three passes, each in batches of ``batch_size`` so memory use
+    does not grow with the size of the media library:
+
+    1. Instructions whose recipe was deleted are removed.
+    2. Image variants whose original image is no longer used are removed.
+    3. The media directory is walked, and each batch of file names is checked
+       against every file column in the project. Unreferenced files are
+       deleted, and the reference counts of shared blobs are corrected.
+
+    Files modified within ``grace_period`` seconds are left alone, as they may
+    belong to an upload whose row has not been committed yet.
+
+    Args:
+        dry_run (bool): Report what would be removed without changing
+            anything.
+        batch_size (int): Number of rows or file names handled per query.
+        grace_period (float): Minimum age in seconds of a file to remove it.
+        storage (Storage, optional): Storage holding the media files.
+            Defaults to ``default_storage``.
+        now (float, optional): Current time as a Unix timestamp.
+        on_remove (callable, optional): Called with the name and size of
+            each file that is removed, or would be on a dry run.
+
+    Returns:
+        MediaGarbageReport: Counts of everything removed.
+    """
+    storage = storage or default_storage
+    now = time.time() if now is None else now
+    report = MediaGarbageReport(dry_run=dry_run)
+    report.instructions_removed = _delete_in_batches(
+        Instruction.objects.filter(recipe__isnull=True), batch_size, dry_run
+    )
+    report.variants_removed = _delete_in_batches(
+        ImageVariant.objects.exclude(_live_sources_filter()), batch_size, dry_run
+    )
+    references = file_references()
+    for batch in _batched(_walk_media(storage), batch_size):
+        report.files_scanned += len(batch)
+        settled = [
+            (name, size)
+            for name, size, modified_at in batch
+            if now - modified_at >= grace_period
+        ]
+        counts = _reference_counts(references, [name for name, _ in settled])
+        orphans = [(name, size) for name, size in settled if name not in counts]
+        report.files_removed += len(orphans)
+        report.bytes_reclaimed += sum(size for _, size in orphans)
+        if on_remove:
+            for name, size in orphans:
+                on_remove(name, size)
+        if not dry_run:
+            _remove_files(storage, [name for name, _ in orphans])
+            report.blobs_reconciled += _reconcile_blobs(storage, counts)
+    return report
+
+
+def _delete_in_batches(queryset, batch_size, dry_run):
+    """Delete the rows of ``queryset`` ``batch_size`` at a time."""
+    if dry_run:
+        return queryset.count()
+    removed = 0
+    while True:
+        batch = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return removed
+        with transaction.atomic():
+            queryset.model.objects.filter(pk__in=batch).delete()
+        removed += len(batch)
+
+
+def _live(model):
+    """Return the rows of ``model`` that keep their files alive."""
+    if model is Instruction:
+        return Instruction.objects.filter(recipe__isnull=False)
+    if model is ImageVariant:
+        return ImageVariant.objects.filter(_live_sources_filter())
+    return model._default_manager.all()
+
+
+def _live_sources_filter():
+    """Match variants whose original is still used by a live row."""
+    return reduce(
+        or_,
+        (
+            Q(source__in=_live(model).values(field_name))
+            for model, field_name in file_references()
+            if model is not ImageVariant
+        ),
+    )
+
+
+def file_references():
+    """Return ``(model, field name)`` for every file column in the project."""
+    return [
+        (model, model_field.name)
+        for model in apps.get_models()
+        for model_field in model._meta.get_fields()
+        if isinstance(model_field, models.FileField)
+    ]
+
+
+def _reference_counts(references, names):
+    """Count how many live rows reference each of ``names``."""
+    counts = {}
+    for model, field_name in references:
+        rows = (
+            _live(model)
+            .filter(**{f"{field_name}__in": names})
+            .values_list(field_name)
+            .annotate(references=Count("pk"))
+            .order_by()
+        )
+        for name, references_count in rows:
+            counts[name] = counts.get(name, 0) + references_count
+    return counts
+
+
+def _walk_media(storage):
+    """Yield ``(name, size, modified_at)`` for every file under the media root."""
+    root = storage.path("")
+    pending = [root] if os.path.isdir(root) else []
+    while pending:
+        directory = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    name = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                    yield name, stat.st_size, stat.st_mtime
+
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _remove_files(storage, names):
+    """Delete unreferenced files along with their blob rows."""
+    if not names:
+        return
+    MediaBlob.objects.filter(name__in=names).delete()
+    for name in names:
+        try:
+            os.remove(storage.path(name))
+        except FileNotFoundError:
+            pass
+
+
+def _reconcile_blobs(storage, counts):
+    """
+    Set each referenced blob's count to its real number of references.
+
+    Returns:
+        int: The number of blob rows corrected or created.
+    """
+    if not hasattr(storage, "is_blob"):
+        return 0
+    blob_counts = {name: n for name, n in counts.items() if storage.is_blob(name)}
+    if not blob_counts:
+        return 0
+    blobs = {
+        blob.name: blob for blob in MediaBlob.objects.filter(name__in=list(blob_counts))
+    }
+    stale = []
+    for blob in blobs.values():
+        if blob.ref_count != blob_counts[blob.name]:
+            blob.ref_count = blob_counts[blob.name]
+            stale.append(blob)
+    MediaBlob.objects.bulk_update(stale, ["ref_count"])
+    missing = [
+        MediaBlob(
+            name=name,
+            digest=storage.digest_from_name(name),
+            size=storage.size(name),
+            ref_count=n,
+        )
+        for name, n in blob_counts.items()
+        if name not in blobs
+    ]
+    MediaBlob.objects.bulk_create(missing, ignore_conflicts=True)
+    return len(stale) + len(missing)
@@ -0,0 +1,157 @@
+from collections import Counter
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Case, Value, When
+from recipes.helpers import two_tier_cache
+from recipes.models import ImageVariant, Recipe
+from .media_gc import file_references
+from .recipe_detail import RECIPE_DETAIL_NAMESPACE
+from .recipe_summaries import refresh_recipe_summaries
+
+SHARD_BATCH_SIZE = 500
+
+
+def shard_media_files(batch_size=SHARD_BATCH_SIZE, storage=None, on_batch=None):
+    """
+    Move files stored in flat upload directories into sharded blob paths.
+
+    Every file column is scanned for names outside the blob directory. Each
+    batch of such rows is copied into the content-addressed storage, which
+    nests blobs two levels deep by hash prefix, and the rows are rewritten to
+    the new names in one transaction, each only if its file has not changed
+    since the batch was read. Variants keep pointing at their
+    original through ``ImageVariant.source``, which is rewritten as well, and
+    the summaries of the recipes whose image or thumbnail moved are written
+    again in the same transaction.
+
+    Rows that have been moved no longer match the scan, so the migration can
+    be interrupted and resumed at any time. The old files are left in place
+    for requests still holding their names; ``manage.py gc_media`` removes
+    them once nothing references them.
+
+    Args:
+        batch_size (int): Number of rows rewritten per transaction.
+        storage (Storage, optional): The content-addressed storage holding
+            the files. Defaults to ``default_storage``.
+        on_batch (callable, optional): Called with the model, the field name
+            and the number of rows moved after each batch is committed.
+
+    Returns:
+        tuple[int, int]: The number of rows moved and the number of rows
+        skipped because their file is missing.
+    """
+    storage = storage or default_storage
+    moved = skipped = 0
+    for model, field_name in file_references():
+        unsharded = (
+            model._default_manager.exclude(**{f"{field_name}__isnull": True})
+            .exclude(**{field_name: ""})
+            .exclude(**{f"{field_name}__startswith": f"{storage.blob_directory}/"})
+            .order_by("pk")
+        )
+        last_pk = 0
+        while True:
+            rows = list(
+                unsharded.filter(pk__gt=last_pk).only("pk", field_name)[:batch_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+            with transaction.atomic():
+                batch_moved, renamed = _move_rows(storage, rows, field_name)
+                if model is not ImageVariant:
+                    _rename_variant_sources(renamed)
+                refresh_recipe_summaries(_summarised_recipes(model, renamed))
+            two_tier_cache.bump_namespace(RECIPE_DETAIL_NAMESPACE)
+            moved += batch_moved
+            skipped += len(rows) - batch_moved
+            if on_batch:
+                on_batch(model, field_name, batch_moved)
+    return moved, skipped
+
+
+def _move_rows(storage, rows, field_name):
+    """
+    Copy the files of ``rows`` into blobs and point the rows at them.
+
+    Rows are read before their files are copied, so each one is only
+    rewritten if it still holds the name it was read with. A row given a new
+    file in the meantime keeps it, and the reference its copy took is
+    dropped again.
+
+    Returns:
+        tuple[int, dict[str, str]]: The number of rows moved, and the new
+        file names keyed by the old names of the rows moved.
+    """
+    manager = type(rows[0])._default_manager
+    copies = {}
+    for old_name in {getattr(row, field_name).name for row in rows}:
+        if storage.exists(old_name):
+            with storage.open(old_name) as original:
+                copies[old_name] = storage.save(old_name, original)
+    used, renamed = Counter(), {}
+    for row in rows:
+        old_name = getattr(row, field_name).name
+        new_name = copies.get(old_name)
+        if new_name is None:
+            continue
+        if manager.filter(pk=row.pk, **{field_name: old_name}).update(
+            **{field_name: new_name}
+        ):
+            used[old_name] += 1
+            renamed[old_name] = new_name
+    for old_name, new_name in copies.items():
+        if not used[old_name]:
+            storage.delete(new_name)
+        for _ in range(used[old_name] - 1):
+            storage.add_reference(new_name)
+    return sum(used.values()), renamed
+
+
+def _rename_variant_sources(renamed):
+    """
+    Point the variants of moved images at the images' new names.
+
+    Originals with the same content end up in the same blob, and only one
+    set of variants is kept for it.
+    """
+    if not renamed:
+        return
+    with_variants = set(
+        ImageVariant.objects.filter(source__in=set(renamed))
+        .values_list("source", flat=True)
+        .order_by()
+        .distinct()
+    )
+    if not with_variants:
+        return
+    taken = set(
+        ImageVariant.objects.filter(source__in=set(renamed.values()))
+        .values_list("source", flat=True)
+        .order_by()
+        .distinct()
+    )
+    kept = {}
+    for old_name in with_variants:
+        new_name = renamed[old_name]
+        if new_name not in taken:
+            kept[old_name] = new_name
+            taken.add(new_name)
+    ImageVariant.objects.filter(source__in=with_variants - set(kept)).delete()
+    ImageVariant.objects.filter(source__in=kept).update(
+        source=Case(
+            *(When(source=old, then=Value(new)) for old, new in kept.items()),
+            default="source",
+        )
+    )
+
+
+def _summarised_recipes(model, renamed):
+    """Return the primary keys of the recipes whose summary a batch changed."""
+    if not renamed:
+        return []
+    if model is ImageVariant:
+        images = ImageVariant.objects.filter(file__in=renamed.values()).values("source")
+    else:
+        images = [*renamed, *renamed.values()]
+    return list(Recipe.objects.filter(image__in=images).values_list("pk", flat=True))
@@ -0,0 +1,234 @@
+import re
+from contextlib import contextmanager
+from django.apps import apps
+from django.db import connection, transaction
+from django.urls import URLPattern
+from django.views.static import serve
+
+# The query plan lines SQLite writes for a full table scan, and for sorting
+# rows in a temporary B-tree because no index gives their order.
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+TEMP_BTREE = re.compile(r"^USE TEMP B-TREE FOR (.+)$")
+
+# Statements that have a query plan.
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+_COLUMN = r'"(\w+)"\."(\w+)"'
+
+
+@contextmanager
+def capture_statements():
+    """
+    Record every statement run on the default database, with its parameters.
+
+    Unlike ``CaptureQueriesContext``, statements are kept as written by the
+    ORM, with placeholders, so they are the same whatever the data.
+
+    Yields:
+        list[tuple[str, tuple]]: The statements and their parameters, in
+        the order they ran. Bulk statements are recorded once.
+    """
+    statements = []
+
+    def record(execute, sql, params, many, context):
+        if not many:
+            statements.append((sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        yield statements
+
+
+def explain_statement(sql, params=()):
+    """
+    Run ``EXPLAIN QUERY PLAN`` on a statement and report what it costs.
+
+    Args:
+        sql (str): The statement, with placeholders.
+        params (tuple): Its parameters.
+
+    Returns:
+        dict: The ``plan`` as written by SQLite, the tables read by a
+        ``full_scans``, the clauses sorted in ``temp_btrees``, and the
+        ``index_candidates`` that could avoid them. A candidate names a
+        table and the columns of an index, with a leading ``-`` for
+        descending ones, from the columns the statement filters and orders
+        that table by.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = [row[3] for row in cursor.fetchall()]
+    full_scans = sorted({m[1] for m in map(FULL_SCAN.match, plan) if m})
+    temp_btrees = sorted({m[1] for m in map(TEMP_BTREE.match, plan) if m})
+
+    where, order = _clauses(sql)
+    filtered = {}
+    for table, column in re.findall(_COLUMN, where):
+        filtered.setdefault(table, [])
+        if column not in filtered[table]:
+            filtered[table].append(column)
+    ordered = {}
+    for table, column, direction in re.findall(_COLUMN + r" (ASC|DESC)", order):
+        prefix = "-" if direction == "DESC" else ""
+        ordered.setdefault(table, []).append(prefix + column)
+
+    candidates = []
+    sorted_tables = sorted(ordered) if "ORDER BY" in temp_btrees else []
+    for table in sorted({*full_scans, *sorted_tables}):
+        columns = filtered.get(table, []) if table in full_scans else []
+        columns = (
+            [*columns, *ordered.get(table, [])] if table in sorted_tables else columns
+        )
+        if columns:
+            candidates.append({"table": table, "columns": columns})
+    return {
+        "plan": plan,
+        "full_scans": full_scans,
+        "temp_btrees": temp_btrees,
+        "index_candidates": candidates,
+    }
+
+
+def audit_statements(statements):
+    """
+    Explain each distinct statement of a list once.
+
+    Returns:
+        list[dict]: One entry per distinct statement, in the order each
+        first ran, with its ``sql``, how many times it ran as ``count`` and
+        the report of `explain_statement`.
+    """
+    audited = {}
+    for sql, params in statements:
+        if sql in audited:
+            audited[sql]["count"] += 1
+        elif sql.lstrip().upper().startswith(EXPLAINABLE):
+            audited[sql] = {"sql": sql, "count": 1, **explain_statement(sql, params)}
+    return list(audited.values())
+
+
+def audit_urls(patterns, client, prepare, kwargs):
+    """
+    Request every URL of a URLconf and audit the statements each one runs.
+
+    Each URL is requested with GET, or with an empty POST if it only allows
+    POST. Everything a request writes is rolled back, so the database is
+    left as it was. Included URLconfs, such as the admin, and static file
+    views are skipped.
+
+    Args:
+        patterns (list): The ``urlpatterns`` of the URLconf.
+        client (Client): The test client making the requests.
+        prepare (Callable[[Client], None]): Called with the client before
+            each request, to log it in and reset any cached state.
+        kwargs (dict[str, int]): Values for the URLs' parameters, such as
+            ``pk``. URLs needing a parameter without a value are skipped.
+
+    Returns:
+        list[dict]: One entry per URL pattern, with its ``name``, ``route``,
+        the ``method`` and ``path`` requested, the response ``status`` and
+        the audited ``statements``, or the reason it was ``skipped``.
+    """
+    report = []
+    for pattern in patterns:
+        entry = {"name": getattr(pattern, "name", None), "route": str(pattern.pattern)}
+        report.append(entry)
+        if not isinstance(pattern, URLPattern) or pattern.callback is serve:
+            entry["skipped"] = "not a view of this project"
+            continue
+        missing = sorted(set(pattern.pattern.converters) - kwargs.keys())
+        if missing:
+            entry["skipped"] = f"no value for {', '.join(missing)}"
+            continue
+        path = "/" + _route_path(pattern, kwargs)
+        with transaction.atomic():
+            prepare(client)
+            with capture_statements() as statements:
+                response = client.get(path)
+                entry["method"] = "GET"
+                if response.status_code == 405:
+                    response = client.post(path)
+                    entry["method"] = "POST"
+            entry.update(
+                path=path,
+                status=response.status_code,
+                statements=audit_statements(statements),
+            )
+            transaction.set_rollback(True)
+    return report
+
+
+def audit_orderings(app_label="recipes"):
+    """
+    Audit the default ``ordering`` of every model of an app.
+
+    The default queryset of each model that has an ordering is explained,
+    as are the querysets of its reverse relations, which filter on a
+    foreign key and sort by the same ordering.
+
+    Returns:
+        list[dict]: One entry per model, with its ``model`` label, its
+        ``ordering`` and the audited ``statements``.
+    """
+    report = []
+    for model in apps.get_app_config(app_label).get_models():
+        if not model._meta.ordering:
+            continue
+        querysets = [model._default_manager.all()]
+        for field in model._meta.concrete_fields:
+            if field.is_relation:
+                querysets.append(model._default_manager.filter(**{field.attname: 0}))
+        report.append(
+            {
+                "model": model._meta.label,
+                "ordering": list(model._meta.ordering),
+                "statements": audit_statements(
+                    queryset.query.sql_with_params() for queryset in querysets
+                ),
+            }
+        )
+    return report
+
+
+def summarise_audit(report):
+    """
+    Count the full scans, temporary B-trees and index candidates of a report.
+
+    Returns:
+        dict: ``full_scans`` and ``temp_btrees`` as the number of statements
+        with any, and the distinct ``index_candidates`` of all of them.
+    """
+    statements = [
+        statement for entry in report for statement in entry.get("statements", [])
+    ]
+    candidates = {
+        (candidate["table"], tuple(candidate["columns"]))
+        for statement in statements
+        for candidate in statement["index_candidates"]
+    }
+    return {
+        "statements": len(statements),
+        "full_scans": sum(1 for s in statements if s["full_scans"]),
+        "temp_btrees": sum(1 for s in statements if s["temp_btrees"]),
+        "index_candidates": [
+            {"table": table, "columns": list(columns)}
+            for table, columns in sorted(candidates)
+        ],
+    }
+
+
+def _clauses(sql):
+    """Return the ``WHERE`` and ``ORDER BY`` clauses of the outermost query."""
+    order = ""
+    match = re.search(r" ORDER BY (.*?)(?: LIMIT .*)?$", sql)
+    if match and ")" not in match[1]:
+        sql, order = sql[: match.start()], match[1]
+    where = sql.split(" WHERE ", 1)[1] if " WHERE " in sql else ""
+    return where, order
+
+
+def _route_path(pattern, kwargs):
+    route = str(pattern.pattern)
+    for name in pattern.pattern.converters:
+        route = re.sub(rf"<(?:\w+:)?{name}>", str(kwargs[name]), route)
+    return route
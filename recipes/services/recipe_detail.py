@@ -0,0 +1,56 @@
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from recipes.helpers import two_tier_cache
+from recipes.models import Instruction, Recipe
+from recipes.services.images import variants_by_source
+
+RECIPE_DETAIL_NAMESPACE = "recipe_detail"
+
+
+def get_recipe_detail(pk):
+    """
+    Return the recipe with primary key ``pk`` and its children, from cache.
+
+    The recipe is cached with its ingredients and instructions prefetched.
+    Concurrent misses for the same recipe are coalesced, so an expiring hot
+    recipe is loaded from the database once rather than by every worker.
+
+    Raises:
+        Http404: If no such recipe exists. Missing recipes are not cached.
+    """
+    return two_tier_cache.get_or_set(
+        _cache_key(pk),
+        lambda: load_recipe_detail(pk),
+        namespace=RECIPE_DETAIL_NAMESPACE,
+    )
+
+
+def load_recipe_detail(pk):
+    """
+    Load the recipe with primary key ``pk`` and its children from the database.
+
+    The recipe and each instruction get an ``image_variants`` attribute
+    listing the resized variants of their image.
+    """
+    queryset = Recipe.objects.prefetch_related(
+        "ingredients",
+        Prefetch("instructions", queryset=Instruction.objects.order_by("step")),
+    )
+    recipe = get_object_or_404(queryset, pk=pk)
+    instructions = recipe.instructions.all()
+    variants = variants_by_source(
+        [recipe.image.name] + [instruction.image.name for instruction in instructions]
+    )
+    recipe.image_variants = variants.get(recipe.image.name, [])
+    for instruction in instructions:
+        instruction.image_variants = variants.get(instruction.image.name, [])
+    return recipe
+
+
+def invalidate_recipe_detail(pk):
+    """Drop the cached detail of the recipe with primary key ``pk``."""
+    two_tier_cache.delete(_cache_key(pk), namespace=RECIPE_DETAIL_NAMESPACE)
+
+
+def _cache_key(pk):
+    return f"recipe:{pk}"
@@ -0,0 +1,102 @@
+import json
+import zlib
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from recipes.models import RecipeDraft
+
+RECIPE_DRAFT_DEFAULTS = {"TTL": 7 * 24 * 60 * 60, "MAX_BYTES": 64 * 1024}
+
+
+def load_draft(author, recipe=None):
+    """
+    Return the form data saved in a user's draft of a recipe.
+
+    Args:
+        author (User): The user editing the recipe.
+        recipe (Recipe, optional): The recipe being edited, or ``None`` for
+            a new recipe.
+
+    Returns:
+        dict[str, object]: The drafted values keyed by form field name, as
+        they would be posted. Empty if there is no draft or it has expired.
+    """
+    draft = _drafts(author, recipe).first()
+    if draft is None:
+        return {}
+    if draft.expires_at <= timezone.now():
+        draft.delete()
+        return {}
+    return _decode(draft.data)
+
+
+def save_draft(author, patch, recipe=None):
+    """
+    Apply a patch to a user's draft of a recipe and extend its lifetime.
+
+    Only the fields that changed are sent while the user types, so a patch
+    is small, and saving it rewrites one row. Fields patched to ``None``
+    are removed from the draft.
+
+    Args:
+        author (User): The user editing the recipe.
+        patch (dict[str, object]): Changed values keyed by form field name.
+        recipe (Recipe, optional): The recipe being edited, or ``None`` for
+            a new recipe.
+
+    Returns:
+        RecipeDraft: The saved draft.
+
+    Raises:
+        ValueError: If the compressed draft would exceed
+            ``RECIPE_DRAFTS["MAX_BYTES"]``.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        draft = _drafts(author, recipe).select_for_update().first()
+        if draft is None:
+            try:
+                with transaction.atomic():
+                    return _apply(RecipeDraft(author=author, recipe=recipe), patch, now)
+            except IntegrityError:
+                # A concurrent first save created the draft since the SELECT.
+                draft = _drafts(author, recipe).select_for_update().get()
+        return _apply(draft, patch, now)
+
+
+def discard_draft(author, recipe=None):
+    """Delete a user's draft of a recipe, once the form has been saved."""
+    _drafts(author, recipe).delete()
+
+
+def _apply(draft, patch, now):
+    """Apply a patch to a draft, save it and return it."""
+    data = _decode(draft.data) if draft.pk and draft.expires_at > now else {}
+    for name, value in patch.items():
+        if value is None:
+            data.pop(name, None)
+        else:
+            data[name] = value
+    draft.data = _encode(data)
+    if len(draft.data) > _config("MAX_BYTES"):
+        raise ValueError("The draft is too large.")
+    draft.expires_at = now + timedelta(seconds=_config("TTL"))
+    draft.save()
+    return draft
+
+
+def _drafts(author, recipe):
+    return RecipeDraft.objects.filter(author=author, recipe=recipe)
+
+
+def _encode(data):
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+
+
+def _decode(payload):
+    return json.loads(zlib.decompress(payload))
+
+
+def _config(name):
+    return getattr(settings, "RECIPE_DRAFTS", {}).get(name, RECIPE_DRAFT_DEFAULTS[name])
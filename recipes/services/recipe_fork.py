@@ -0,0 +1,83 @@
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from recipes.models import Ingredient, Instruction, Recipe
+from recipes.services.recipe_summaries import refresh_recipe_summaries
+
+# Fields of a recipe that belong to the fork rather than being copied.
+FORK_OWN_FIELDS = {"id", "author", "version", "created_at"}
+
+
+def fork_recipe(recipe, author, storage=None):
+    """
+    Copy a recipe and all its children into a new recipe of ``author``.
+
+    The recipe row is copied through the ORM, then the ingredients and the
+    instructions are each copied by a single ``INSERT ... SELECT`` run by
+    the database, so no child is loaded into Python and the number of
+    statements does not depend on the size of the recipe. Images are not
+    duplicated: the fork points at the same files, and a reference is added
+    to all of them in one statement, so that deleting either recipe's image
+    keeps the other's.
+    Resized variants are keyed by file name, so they are shared as well.
+    The fork gets its own summary. Its history starts with its first edit,
+    which records the copy as its first revision.
+
+    Args:
+        recipe (Recipe): The recipe to copy.
+        author (User): The owner of the fork.
+        storage (Storage, optional): The storage holding the images.
+            Defaults to ``default_storage``.
+
+    Returns:
+        Recipe: The saved fork.
+    """
+    storage = storage or default_storage
+    fork = Recipe(
+        author=author,
+        **{
+            field.attname: getattr(recipe, field.attname)
+            for field in Recipe._meta.concrete_fields
+            if field.name not in FORK_OWN_FIELDS
+        },
+    )
+    with transaction.atomic():
+        fork.save()
+        for model in (Ingredient, Instruction):
+            _copy_children(model, recipe.pk, fork.pk)
+        images = list(
+            Instruction.objects.filter(recipe=fork)
+            .exclude(image="")
+            .exclude(image__isnull=True)
+            .values_list("image", flat=True)
+        )
+        if fork.image:
+            images.append(fork.image.name)
+        storage.add_references(images)
+        refresh_recipe_summaries([fork.pk])
+    return fork
+
+
+def _copy_children(model, source_id, target_id):
+    """
+    Copy the rows of ``model`` belonging to one recipe to another, in SQL.
+
+    Returns:
+        int: The number of rows copied.
+    """
+    quote = connection.ops.quote_name
+    recipe_column = model._meta.get_field("recipe").column
+    columns = ", ".join(
+        quote(field.column)
+        for field in model._meta.concrete_fields
+        if not field.primary_key and field.column != recipe_column
+    )
+    table = quote(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({quote(recipe_column)}, {columns}) "
+            f"SELECT %s, {columns} FROM {table} "
+            f"WHERE {quote(recipe_column)} = %s "
+            f"ORDER BY {quote(model._meta.pk.column)}",
+            [target_id, source_id],
+        )
+        return cursor.rowcount
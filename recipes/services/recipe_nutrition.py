@@ -0,0 +1,169 @@
+from django.db import transaction
+from recipes.models import Ingredient, NutritionReference, Recipe
+from recipes.services.recipe_detail import invalidate_recipe_detail
+from recipes.services.recipe_scaling import base_quantities
+from recipes.services.shopping_list import normalise_ingredient_name
+
+NUTRITION_BATCH_SIZE = 500
+
+# The nutrients of a food, per 100 g, and of a recipe, in total.
+NUTRIENTS = ["calories", "protein", "fat", "carbohydrate"]
+
+# Fields of a recipe written only by `refresh_stale_nutrition`.
+NUTRITION_FIELDS = {*NUTRIENTS, "nutrition_stale"}
+
+
+def load_nutrition_references(rows, batch_size=NUTRITION_BATCH_SIZE):
+    """
+    Insert or update foods of the nutrition reference dataset.
+
+    Foods are matched on their normalised name, so loading a newer version
+    of a dataset updates the foods it already holds. Every recipe is then
+    marked as stale, to be computed again with the new values.
+
+    Args:
+        rows (Iterable[dict[str, str]]): The foods, as read from a CSV file
+            with ``name``, the `NUTRIENTS` per 100 g, and the optional
+            ``grams_per_ml`` and ``grams_per_item`` columns.
+        batch_size (int): Number of foods written per query.
+
+    Returns:
+        int: The number of foods loaded.
+
+    Raises:
+        ValueError: If a row has no name, or a value is not a number. Nothing
+            is loaded then.
+    """
+    references = {}
+    for line, row in enumerate(rows, start=2):
+        name = (row.get("name") or "").strip()
+        if not name:
+            raise ValueError(f"Line {line}: a name is required.")
+        try:
+            values = {nutrient: float(row[nutrient]) for nutrient in NUTRIENTS}
+            for field in ["grams_per_ml", "grams_per_item"]:
+                value = (row.get(field) or "").strip()
+                values[field] = float(value) if value else None
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Line {line}: invalid values for {name!r}.")
+        normalised_name = normalise_ingredient_name(name)
+        references[normalised_name] = NutritionReference(
+            name=name, normalised_name=normalised_name, **values
+        )
+
+    with transaction.atomic():
+        NutritionReference.objects.bulk_create(
+            references.values(),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["normalised_name"],
+            update_fields=["name", *NUTRIENTS, "grams_per_ml", "grams_per_item"],
+        )
+        Recipe.objects.update(nutrition_stale=True)
+    return len(references)
+
+
+def reference_names(name):
+    """
+    Return the normalised names an ingredient may be listed under, best first.
+
+    The ingredient's own normalised name comes first, followed by its
+    singular forms, so "Eggs" is found as "egg" and "Tomatoes" as "tomato".
+    """
+    name = normalise_ingredient_name(name)
+    names = [name]
+    if name.endswith("es"):
+        names.append(name[:-2])
+    if name.endswith("s"):
+        names.append(name[:-1])
+    return names
+
+
+def compute_nutrition(recipe_ids):
+    """
+    Compute the nutrient totals of some recipes from their ingredients.
+
+    The ingredients of every recipe are read in one query and matched to
+    the reference foods in a second one, through the unique index on their
+    normalised names. Quantities are weighed in grams, from the base unit
+    of their dimension and the food's density or item weight, and summed
+    per recipe in one pass. Ingredients with no matching food, no quantity,
+    or a unit the food cannot be weighed in count for nothing.
+
+    Args:
+        recipe_ids (Iterable[int]): The primary keys of the recipes.
+
+    Returns:
+        dict[int, dict[str, float]]: The `NUTRIENTS` of each recipe, keyed
+        by its primary key.
+    """
+    totals = {pk: dict.fromkeys(NUTRIENTS, 0.0) for pk in recipe_ids}
+    rows = list(
+        Ingredient.objects.filter(recipe_id__in=totals).values_list(
+            "recipe_id", "name", "quantity", "unit"
+        )
+    )
+    if not rows:
+        return totals
+    recipes, names, quantities, units = zip(*rows)
+    candidates = [reference_names(name) for name in names]
+    references = NutritionReference.objects.in_bulk(
+        {name for names in candidates for name in names},
+        field_name="normalised_name",
+    )
+    quantities, units = base_quantities(quantities, units)
+
+    for recipe_id, names, quantity, unit in zip(recipes, candidates, quantities, units):
+        reference = next((references[n] for n in names if n in references), None)
+        if reference is None or quantity is None:
+            continue
+        grams_per_unit = {
+            "g": 1.0,
+            "ml": reference.grams_per_ml,
+            "": reference.grams_per_item,
+            "clove": reference.grams_per_item,
+        }.get(unit)
+        if grams_per_unit is None:
+            continue
+        hundreds_of_grams = float(quantity) * grams_per_unit / 100
+        for nutrient in NUTRIENTS:
+            totals[recipe_id][nutrient] += hundreds_of_grams * getattr(
+                reference, nutrient
+            )
+    return totals
+
+
+def refresh_stale_nutrition(batch_size=NUTRITION_BATCH_SIZE):
+    """
+    Compute the nutrition of every recipe whose ingredients changed.
+
+    Recipes are marked as stale when they are created, when their
+    ingredients are edited and when the reference dataset is loaded, so
+    only those are computed again, in batches. Each recipe's totals are
+    written by an UPDATE conditional on its version, so a recipe edited
+    while its nutrition was computed stays stale for the next run.
+
+    Args:
+        batch_size (int): Number of recipes computed per transaction.
+
+    Returns:
+        int: The number of recipes whose nutrition was written.
+    """
+    written, last_pk = 0, 0
+    while True:
+        batch = list(
+            Recipe.objects.filter(nutrition_stale=True, pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", "version")[:batch_size]
+        )
+        if not batch:
+            return written
+        last_pk = batch[-1][0]
+        totals = compute_nutrition([pk for pk, _ in batch])
+        with transaction.atomic():
+            for pk, version in batch:
+                if Recipe.objects.filter(pk=pk, version=version).update(
+                    nutrition_stale=False, **totals[pk]
+                ):
+                    written += 1
+                    transaction.on_commit(lambda pk=pk: invalidate_recipe_detail(pk))
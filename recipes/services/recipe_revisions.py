@@ -0,0 +1,290 @@
+import json
+import zlib
+from decimal import Decimal
+from typing import NamedTuple
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import DecimalField, FileField, Subquery
+from recipes.models import Ingredient, Instruction, Recipe, RecipeRevision
+from recipes.services.recipe_nutrition import NUTRITION_FIELDS
+
+RECIPE_REVISION_DEFAULTS = {"SNAPSHOT_EVERY": 10}
+
+# Fields that identify a row or are derived from its children, rather than
+# describe the recipe, and so are not versioned.
+RECIPE_UNVERSIONED_FIELDS = {"id", "author", "version", "created_at", *NUTRITION_FIELDS}
+CHILD_UNVERSIONED_FIELDS = {"id", "recipe"}
+
+CHILD_MODELS = {"ingredients": Ingredient, "instructions": Instruction}
+
+
+class RevisionHead(NamedTuple):
+    """The latest revision of a recipe, rebuilt."""
+
+    number: int
+    snapshot_number: int
+    state: dict
+
+
+class RecipeVersion(NamedTuple):
+    """A version of a recipe rebuilt from its revisions, as unsaved rows."""
+
+    number: int
+    recipe: Recipe
+    ingredients: list
+    instructions: list
+
+
+def recipe_state(recipe, ingredients, instructions):
+    """
+    Return the versioned state of a recipe and its children.
+
+    The state holds the recipe's fields under ``"recipe"``, and the fields
+    of each child keyed by its primary key under ``"ingredients"`` and
+    ``"instructions"``, as JSON values.
+
+    Args:
+        recipe (Recipe): The saved recipe.
+        ingredients (list[Ingredient]): Its saved ingredients.
+        instructions (list[Instruction]): Its saved instructions.
+
+    Returns:
+        dict: The state, as stored in revisions.
+    """
+    state = {"recipe": _row(recipe, RECIPE_UNVERSIONED_FIELDS)}
+    for name, children in (
+        ("ingredients", ingredients),
+        ("instructions", instructions),
+    ):
+        state[name] = {
+            str(child.pk): _row(child, CHILD_UNVERSIONED_FIELDS) for child in children
+        }
+    return json.loads(json.dumps(state, cls=DjangoJSONEncoder))
+
+
+def load_recipe_state(recipe_id):
+    """Return the versioned state of a recipe as stored in the database."""
+    return recipe_state(
+        Recipe.objects.get(pk=recipe_id),
+        Ingredient.objects.filter(recipe_id=recipe_id),
+        Instruction.objects.filter(recipe_id=recipe_id),
+    )
+
+
+def head_revision(recipe_id):
+    """
+    Return the latest revision of a recipe, rebuilt.
+
+    Returns:
+        RevisionHead: The latest revision, or ``None`` if the recipe has no
+        history yet.
+    """
+    return _rebuild(recipe_id)
+
+
+def ensure_revision_history(recipe_id):
+    """
+    Return the latest revision of a recipe, starting its history if needed.
+
+    Recipes saved before they were versioned, or by code that does not
+    record revisions, get their current state recorded as a first snapshot,
+    so the state before an edit can always be restored. Call this inside
+    the edit's transaction, once the recipe row is locked, for instance by
+    the UPDATE of its version, and before any versioned field is written.
+
+    Returns:
+        RevisionHead: The latest revision.
+    """
+    return head_revision(recipe_id) or record_revision(recipe_id, None)
+
+
+def record_revision(recipe_id, previous, state=None):
+    """
+    Record the state of a recipe as its next revision.
+
+    Call this inside the transaction that changed the recipe, so the
+    revision is committed or rolled back with the change. The revision
+    stores the delta from ``previous``, or a full snapshot if there is no
+    previous revision or the last snapshot is ``RECIPE_REVISIONS
+    ["SNAPSHOT_EVERY"]`` revisions old. Nothing is recorded if the state did
+    not change.
+
+    Args:
+        recipe_id (int): The primary key of the recipe.
+        previous (RevisionHead): The recipe's latest revision, as returned
+            by `ensure_revision_history` before the change, or ``None`` for
+            a new recipe.
+        state (dict, optional): The state to record. Defaults to the state
+            of the recipe in the database.
+
+    Returns:
+        RevisionHead: The new latest revision.
+    """
+    if state is None:
+        state = load_recipe_state(recipe_id)
+    if previous is None:
+        RecipeRevision.objects.create(**_snapshot(recipe_id, 1, state))
+        return RevisionHead(1, 1, state)
+    if state == previous.state:
+        return previous
+    number = previous.number + 1
+    if number - previous.snapshot_number >= _config("SNAPSHOT_EVERY"):
+        RecipeRevision.objects.create(**_snapshot(recipe_id, number, state))
+        return RevisionHead(number, number, state)
+    RecipeRevision.objects.create(
+        recipe_id=recipe_id,
+        number=number,
+        data=_encode(_delta(previous.state, state)),
+    )
+    return RevisionHead(number, previous.snapshot_number, state)
+
+
+def record_first_revisions(states):
+    """
+    Record the first revision of many new recipes with one INSERT.
+
+    Args:
+        states (dict[int, dict]): The state of each recipe, keyed by its
+            primary key.
+    """
+    RecipeRevision.objects.bulk_create(
+        RecipeRevision(**_snapshot(recipe_id, 1, state))
+        for recipe_id, state in states.items()
+    )
+
+
+def recipe_version(recipe, number):
+    """
+    Rebuild a version of a recipe.
+
+    Only the revisions from the last snapshot up to ``number`` are read, in
+    one query, so the work is bounded by ``RECIPE_REVISIONS
+    ["SNAPSHOT_EVERY"]`` whatever the length of the history.
+
+    Args:
+        recipe (Recipe): The recipe.
+        number (int): The number of the revision to rebuild.
+
+    Returns:
+        RecipeVersion: The version, as unsaved rows. Children keep the
+        primary key they had in that version.
+
+    Raises:
+        RecipeRevision.DoesNotExist: If the recipe has no such revision.
+    """
+    head = _rebuild(recipe.pk, number)
+    if head is None:
+        raise RecipeRevision.DoesNotExist(
+            f"Recipe {recipe.pk} has no revision {number}."
+        )
+    version = _instance(Recipe, head.state["recipe"])
+    version.pk, version.author_id = recipe.pk, recipe.author_id
+    version.created_at = recipe.created_at
+    children = {}
+    for name, model in CHILD_MODELS.items():
+        children[name] = []
+        for pk, row in sorted(head.state[name].items(), key=lambda item: int(item[0])):
+            child = _instance(model, row)
+            child.pk, child.recipe_id = int(pk), recipe.pk
+            children[name].append(child)
+    children["instructions"].sort(key=lambda instruction: instruction.step)
+    return RecipeVersion(number, version, **children)
+
+
+def _rebuild(recipe_id, number=None):
+    """Rebuild revision ``number`` of a recipe, or its latest revision."""
+    revisions = RecipeRevision.objects.filter(recipe_id=recipe_id)
+    if number is not None:
+        revisions = revisions.filter(number__lte=number)
+    last_snapshot = (
+        revisions.filter(is_snapshot=True).order_by("-number").values("number")[:1]
+    )
+    rows = list(
+        revisions.filter(number__gte=Subquery(last_snapshot))
+        .order_by("number")
+        .values_list("number", "data")
+    )
+    if not rows or (number is not None and rows[-1][0] != number):
+        return None
+    state = _decode(rows[0][1])
+    for _, data in rows[1:]:
+        for section, changes in _decode(data).items():
+            values = state.setdefault(section, {})
+            values.update(changes.get("set", {}))
+            for key in changes.get("unset", []):
+                values.pop(key, None)
+    return RevisionHead(rows[-1][0], rows[0][0], state)
+
+
+def _delta(old, new):
+    """Return the changes turning state ``old`` into state ``new``."""
+    delta = {}
+    for section in old.keys() | new.keys():
+        before, after = old.get(section, {}), new.get(section, {})
+        changes = {}
+        changed = {
+            key: value
+            for key, value in after.items()
+            if key not in before or before[key] != value
+        }
+        if changed:
+            changes["set"] = changed
+        removed = [key for key in before if key not in after]
+        if removed:
+            changes["unset"] = removed
+        if changes:
+            delta[section] = changes
+    return delta
+
+
+def _snapshot(recipe_id, number, state):
+    return {
+        "recipe_id": recipe_id,
+        "number": number,
+        "is_snapshot": True,
+        "data": _encode(state),
+    }
+
+
+def _row(instance, unversioned):
+    row = {}
+    for field in type(instance)._meta.concrete_fields:
+        if field.name in unversioned:
+            continue
+        value = field.value_from_object(instance)
+        if isinstance(field, FileField):
+            value = value.name or ""
+        elif isinstance(field, DecimalField) and value is not None:
+            # Submitted and stored decimals differ in their trailing zeros.
+            value = field.to_python(value).quantize(
+                Decimal(1).scaleb(-field.decimal_places)
+            )
+        row[field.attname] = value
+    return row
+
+
+def _instance(model, row):
+    values = {}
+    for attname, value in row.items():
+        try:
+            field = model._meta.get_field(attname)
+        except FieldDoesNotExist:
+            # A field removed since the revision was recorded.
+            continue
+        values[field.attname] = field.to_python(value)
+    return model(**values)
+
+
+def _encode(data):
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+
+
+def _decode(payload):
+    return json.loads(zlib.decompress(payload))
+
+
+def _config(name):
+    return getattr(settings, "RECIPE_REVISIONS", {}).get(
+        name, RECIPE_REVISION_DEFAULTS[name]
+    )
@@ -0,0 +1,271 @@
+import math
+from decimal import Decimal
+from fractions import Fraction
+from itertools import repeat
+from typing import NamedTuple
+from recipes.models import Ingredient
+
+
+class Unit(NamedTuple):
+    """
+    A unit of measurement that quantities can be converted from and to.
+
+    Attributes:
+        dimension (str): What the unit measures. Only units of the same
+            dimension convert into each other.
+        size (Fraction): The size of the unit in the base unit of its
+            dimension: millilitres, grams or single items.
+        ladder (str | None): The key in `UNIT_LADDERS` of the units a scaled
+            quantity may be re-expressed in, or ``None`` to keep the unit.
+        singular (str): The spelling used for at most one of the unit.
+        plural (str): The spelling used for more than one of the unit.
+    """
+
+    dimension: str
+    size: Fraction
+    ladder: str | None
+    singular: str
+    plural: str
+
+
+_TSP = Fraction("4.92892159375")
+_CUP = _TSP * 48
+_OZ = Fraction("28.349523125")
+_LB = Fraction("453.59237")
+
+# Every unit offered by `IngredientForm.UNIT_CHOICES`, including no unit.
+UNITS = {
+    "": Unit("count", Fraction(1), None, "", ""),
+    "pinch": Unit("volume", _TSP / 16, "us_volume", "pinch", "pinch"),
+    "dash": Unit("volume", _TSP / 8, "us_volume", "dash", "dash"),
+    "tsp": Unit("volume", _TSP, "us_volume", "tsp", "tsp"),
+    "tbsp": Unit("volume", _TSP * 3, "us_volume", "tbsp", "tbsp"),
+    "cup": Unit("volume", _CUP, "us_volume", "cup", "cups"),
+    "cups": Unit("volume", _CUP, "us_volume", "cup", "cups"),
+    "ml": Unit("volume", Fraction(1), "metric_volume", "ml", "ml"),
+    "l": Unit("volume", Fraction(1000), "metric_volume", "l", "l"),
+    "g": Unit("mass", Fraction(1), "metric_mass", "g", "g"),
+    "kg": Unit("mass", Fraction(1000), "metric_mass", "kg", "kg"),
+    "oz": Unit("mass", _OZ, "imperial_mass", "oz", "oz"),
+    "lb": Unit("mass", _LB, "imperial_mass", "lb", "lbs"),
+    "lbs": Unit("mass", _LB, "imperial_mass", "lb", "lbs"),
+    "piece": Unit("count", Fraction(1), None, "piece", "pieces"),
+    "pieces": Unit("count", Fraction(1), None, "piece", "pieces"),
+    "clove": Unit("clove", Fraction(1), None, "clove", "clove"),
+}
+
+# The unit every quantity of a dimension is summed in.
+BASE_UNITS = {"volume": "ml", "mass": "g", "count": "", "clove": "clove"}
+
+# The units a scaled quantity may be re-expressed in, by system of
+# measurement. Metric and US quantities are never converted into each other.
+UNIT_LADDERS = {
+    "us_volume": ["pinch", "dash", "tsp", "tbsp", "cup"],
+    "metric_volume": ["ml", "l"],
+    "metric_mass": ["g", "kg"],
+    "imperial_mass": ["oz", "lb"],
+}
+
+# Factors converting a quantity in one unit to another of the same dimension,
+# keyed by ``(from_unit, to_unit)``.
+CONVERSION_TABLE = {
+    (source, target): UNITS[source].size / UNITS[target].size
+    for source in UNITS
+    for target in UNITS
+    if UNITS[source].dimension == UNITS[target].dimension
+}
+
+# A quantity stays in its own unit down to this much of it, so that half a
+# cup is not turned into 8 tbsp, before moving to a smaller unit.
+SMALLEST_FRACTION = Fraction(1, 4)
+
+# The ladder of each unit, largest unit first, with the factor converting a
+# quantity in the unit to each unit of the ladder.
+_LADDERS = {
+    source: [
+        (target, CONVERSION_TABLE[source, target])
+        for target in reversed(UNIT_LADDERS[unit.ladder])
+    ]
+    for source, unit in UNITS.items()
+    if unit.ladder
+}
+
+_PLACES = Ingredient._meta.get_field("quantity").decimal_places
+
+
+def scale_quantities(quantities, units, factors):
+    """
+    Scale whole columns of quantities and re-express them in sensible units.
+
+    Each quantity is multiplied by its factor and written in the largest
+    unit of its system in which it is at least 1, so 48 tsp become 1 cup
+    and 1500 g become 1.5 kg, but 2 tbsp are not turned into 0.125 cups.
+    A quantity keeps its own unit down to `SMALLEST_FRACTION` of it, so half
+    a cup stays half a cup, and plural spellings such as "cups" are used
+    for more than one.
+    The conversion factors come from `CONVERSION_TABLE`, worked out once
+    when the module is loaded, and the arithmetic is exact until the result
+    is rounded to the places an `Ingredient` stores. Quantities in units
+    the table does not know are scaled and keep their unit.
+
+    Args:
+        quantities (Sequence[Decimal | None]): The quantities, ``None`` for
+            ingredients with no quantity, which are left as they are.
+        units (Sequence[str]): The unit of each quantity.
+        factors (Sequence[Fraction] | Fraction): The factor to scale each
+            quantity by, or one factor for all of them.
+
+    Returns:
+        tuple[list[Decimal | None], list[str]]: The scaled quantities and
+        their units.
+    """
+    if not isinstance(factors, (list, tuple)):
+        factors = repeat(Fraction(factors))
+    scaled = [
+        (
+            _normalise(Fraction(quantity) * factor, unit)
+            if quantity is not None
+            else (None, unit)
+        )
+        for quantity, unit, factor in zip(quantities, units, factors)
+    ]
+    return [quantity for quantity, _ in scaled], [unit for _, unit in scaled]
+
+
+def convert_quantities(quantities, units, unit):
+    """
+    Convert whole columns of quantities to one unit.
+
+    Args:
+        quantities (Sequence[Decimal | None]): The quantities to convert.
+        units (Sequence[str]): The unit of each quantity.
+        unit (str): The unit to convert them to.
+
+    Returns:
+        tuple[list[Decimal | None], list[str]]: The converted quantities and
+        their units. Quantities with no conversion to ``unit``, such as
+        grams to cups, are returned unchanged.
+    """
+    converted, converted_units = [], []
+    for quantity, source in zip(quantities, units):
+        factor = CONVERSION_TABLE.get((source, unit))
+        if quantity is None or factor is None:
+            converted.append(quantity)
+            converted_units.append(source)
+        else:
+            converted.append(_round(Fraction(quantity) * factor))
+            converted_units.append(unit)
+    return converted, converted_units
+
+
+def base_quantities(quantities, units):
+    """
+    Convert whole columns of quantities to the base unit of their dimension.
+
+    The quantities are exact and not rounded, so that they can be summed.
+
+    Args:
+        quantities (Sequence[Decimal | None]): The quantities to convert.
+        units (Sequence[str]): The unit of each quantity.
+
+    Returns:
+        tuple[list[Fraction | None], list[str]]: The converted quantities and
+        their base units, `BASE_UNITS` of their dimension. Quantities in units
+        the table does not know keep their unit.
+    """
+    converted, converted_units = [], []
+    for quantity, unit in zip(quantities, units):
+        base = BASE_UNITS[UNITS[unit].dimension] if unit in UNITS else unit
+        if quantity is not None:
+            quantity = Fraction(quantity) * CONVERSION_TABLE.get((unit, base), 1)
+        converted.append(quantity)
+        converted_units.append(base)
+    return converted, converted_units
+
+
+def scale_ingredients(ingredients, servings, from_servings):
+    """
+    Scale the ingredients of one recipe to a number of servings.
+
+    Args:
+        ingredients (Iterable[Ingredient]): The recipe's ingredients.
+        servings (int): The number of servings wanted.
+        from_servings (int): The number of servings the ingredients make.
+
+    Returns:
+        list[Ingredient]: Unsaved copies of the ingredients, scaled.
+    """
+    ingredients = list(ingredients)
+    quantities, units = scale_quantities(
+        [ingredient.quantity for ingredient in ingredients],
+        [ingredient.unit for ingredient in ingredients],
+        Fraction(servings, from_servings),
+    )
+    return [
+        _scaled_copy(ingredient, quantity, unit)
+        for ingredient, quantity, unit in zip(ingredients, quantities, units)
+    ]
+
+
+def scale_recipes(recipes, servings):
+    """
+    Scale the ingredients of many recipes, such as a meal plan, at once.
+
+    The ingredients of all the recipes are read in one query and scaled
+    together by `scale_quantities`.
+
+    Args:
+        recipes (Iterable[Recipe]): The saved recipes.
+        servings (int): The number of servings wanted of each recipe.
+
+    Returns:
+        dict[int, list[Ingredient]]: Unsaved scaled copies of each recipe's
+        ingredients, keyed by the recipe's primary key.
+    """
+    factors = {recipe.pk: Fraction(servings, recipe.servings) for recipe in recipes}
+    ingredients = list(Ingredient.objects.filter(recipe_id__in=factors))
+    quantities, units = scale_quantities(
+        [ingredient.quantity for ingredient in ingredients],
+        [ingredient.unit for ingredient in ingredients],
+        [factors[ingredient.recipe_id] for ingredient in ingredients],
+    )
+    scaled = {pk: [] for pk in factors}
+    for ingredient, quantity, unit in zip(ingredients, quantities, units):
+        scaled[ingredient.recipe_id].append(_scaled_copy(ingredient, quantity, unit))
+    return scaled
+
+
+def _normalise(quantity, unit):
+    if unit not in UNITS:
+        return _round(quantity), unit
+    singular = UNITS[unit].singular
+    target, factor = singular, 1
+    if quantity:
+        for candidate, candidate_factor in _LADDERS.get(unit, []):
+            target, factor = candidate, candidate_factor
+            threshold = SMALLEST_FRACTION if candidate == singular else 1
+            if quantity * factor >= threshold:
+                break
+    quantity = _round(quantity * factor)
+    return quantity, UNITS[target].plural if quantity > 1 else target
+
+
+def _round(quantity):
+    """
+    Round a quantity half away from zero to the places an `Ingredient` stores.
+
+    The rounding is done on integers, so it is exact and cannot overflow the
+    precision of the decimal context, however large the quantity.
+    """
+    rounded = math.floor(abs(quantity) * 10**_PLACES + Fraction(1, 2))
+    return Decimal(f"{'-' if quantity < 0 else ''}{rounded}E-{_PLACES}")
+
+
+def _scaled_copy(ingredient, quantity, unit):
+    return Ingredient(
+        id=ingredient.id,
+        recipe_id=ingredient.recipe_id,
+        name=ingredient.name,
+        quantity=quantity,
+        unit=unit,
+    )
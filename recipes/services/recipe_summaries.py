@@ -0,0 +1,127 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from recipes.models import Ingredient, Instruction, Recipe, RecipeSummary
+from recipes.services.images import variants_by_source
+
+RECIPE_SUMMARY_BATCH_SIZE = 500
+
+# Fields of a summary that are copied from its user.
+AUTHOR_FIELDS = {"first_name", "last_name", "username"}
+
+
+def refresh_recipe_summaries(recipe_ids):
+    """
+    Write the summary rows of some recipes from the recipes themselves.
+
+    Call this inside the transaction changing the recipes, after their
+    children are written, so that lists never see a recipe without its
+    summary or with outdated counts. The recipes are read with their
+    ingredient and instruction counts in one query, and their summaries are
+    inserted or replaced by one more, with a third for the thumbnails of
+    recipes with an image.
+
+    Args:
+        recipe_ids (Iterable[int]): The primary keys of the recipes.
+
+    Returns:
+        int: The number of summaries written.
+    """
+    recipes = list(
+        Recipe.objects.filter(pk__in=list(recipe_ids))
+        .select_related("author")
+        .annotate(
+            ingredient_count=_child_count(Ingredient),
+            step_count=_child_count(Instruction),
+        )
+    )
+    variants = variants_by_source(recipe.image.name for recipe in recipes)
+    summaries = [
+        RecipeSummary(
+            recipe=recipe,
+            author_id=recipe.author_id,
+            author_name=_author_name(recipe.author),
+            title=recipe.title,
+            ingredient_count=recipe.ingredient_count,
+            step_count=recipe.step_count,
+            time_display=recipe.get_time(),
+            thumbnail=_thumbnail(recipe.image.name, variants),
+            image_placeholder=recipe.image_placeholder,
+            created_at=recipe.created_at,
+        )
+        for recipe in recipes
+    ]
+    RecipeSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=["recipe"],
+        update_fields=[
+            field.name
+            for field in RecipeSummary._meta.concrete_fields
+            if not field.primary_key
+        ],
+    )
+    return len(summaries)
+
+
+def refresh_author_summaries(user):
+    """Copy the current name of ``user`` to the summaries of their recipes."""
+    return RecipeSummary.objects.filter(author=user).update(
+        author_name=_author_name(user)
+    )
+
+
+def rebuild_recipe_summaries(batch_size=RECIPE_SUMMARY_BATCH_SIZE):
+    """
+    Write the summary of every recipe again, in batches.
+
+    Meant for filling the table for recipes written before it existed, or
+    by code that bypasses the recipe services. Each batch is written in its
+    own transaction.
+
+    Args:
+        batch_size (int): Number of recipes summarised per transaction.
+
+    Returns:
+        int: The number of summaries written.
+    """
+    written, last_pk = 0, 0
+    while True:
+        batch = list(
+            Recipe.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not batch:
+            return written
+        last_pk = batch[-1]
+        with transaction.atomic():
+            written += refresh_recipe_summaries(batch)
+
+
+def _child_count(model):
+    children = (
+        model.objects.filter(recipe=OuterRef("pk"))
+        .order_by()
+        .values("recipe")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(children), 0)
+
+
+def _author_name(user):
+    return user.get_full_name() or user.username
+
+
+def _thumbnail(image, variants):
+    """
+    Return the smallest JPEG variant of ``image``, or "" if there is none.
+
+    The original upload is never used, as it may be megabytes; lists show
+    the recipe's inline placeholder until its variants are generated.
+    """
+    for variant in variants.get(image, []):
+        if variant.format == "jpeg":
+            return variant.file.name
+    return ""
@@ -0,0 +1,386 @@
+from typing import NamedTuple
+from django.core.files.storage import default_storage
+from django.db import router, transaction
+from django.db.models import CharField, F, FileField, Value
+from django.db.models.signals import post_save
+from django.db.models.functions import Cast, Concat
+from recipes.models import Ingredient, Instruction, Recipe
+from recipes.services.image_queue import (
+    enqueue_image_variants,
+    enqueue_recipe_variants,
+)
+from recipes.services.recipe_nutrition import NUTRITION_FIELDS
+from recipes.services.recipe_summaries import refresh_recipe_summaries
+from recipes.services.recipe_revisions import (
+    CHILD_MODELS,
+    CHILD_UNVERSIONED_FIELDS,
+    RECIPE_UNVERSIONED_FIELDS,
+    ensure_revision_history,
+    recipe_state,
+    recipe_version,
+    record_first_revisions,
+    record_revision,
+)
+
+DELETE_BATCH_SIZE = 500
+
+CREATE_BATCH_SIZE = 200
+
+# Values that can never clash with a real row, used to move a row's unique
+# field out of the way while rows swap values.
+PARKED_VALUES = {
+    Ingredient: {"name": Concat(Value("\0"), Cast("pk", CharField()))},
+    Instruction: {"step": -F("pk")},
+}
+
+# Fields that forms fill in from another field, and so change along with it.
+DEPENDENT_FIELDS = {"image": ["image_placeholder"]}
+
+
+class RecipeConflict(Exception):
+    """Raised when a recipe was edited by someone else since it was loaded."""
+
+
+class ChildChanges(NamedTuple):
+    """The rows of one kind to insert, update and delete for a recipe."""
+
+    created: list
+    updated: list
+    deleted: list
+
+    @classmethod
+    def from_formset(cls, formset):
+        """
+        Collect the changes submitted through a validated inline formset.
+
+        Only forms that changed are included, so untouched rows cost nothing.
+        """
+        formset.save(commit=False)
+        return cls(
+            created=formset.new_objects,
+            updated=[
+                (child, _with_dependent_fields(changed))
+                for child, changed in formset.changed_objects
+            ],
+            deleted=formset.deleted_objects,
+        )
+
+
+def create_recipe(recipe, ingredients, instructions):
+    """
+    Insert a validated recipe together with its children.
+
+    Everything is written in one transaction: the recipe row, one bulk
+    INSERT for the ingredients and one for the instructions, the recipe's
+    first revision and its summary, so the cost of creating a recipe does
+    not grow with its number of rows. Callers are expected to have
+    validated everything beforehand, against the unsaved recipe, so nothing
+    needs to be undone when a child turns out invalid.
+
+    Args:
+        recipe (Recipe): The unsaved recipe, with its author set.
+        ingredients (list[Ingredient]): Unsaved ingredients of the recipe.
+        instructions (list[Instruction]): Unsaved instructions of the recipe.
+
+    Returns:
+        Recipe: The saved recipe.
+    """
+    with transaction.atomic():
+        recipe.save()
+        for child in [*ingredients, *instructions]:
+            child.recipe = recipe
+        Ingredient.objects.bulk_create(ingredients)
+        Instruction.objects.bulk_create(instructions)
+        record_revision(
+            recipe.pk, None, state=recipe_state(recipe, ingredients, instructions)
+        )
+        refresh_recipe_summaries([recipe.pk])
+        enqueue_recipe_variants(recipe, instructions)
+    return recipe
+
+
+def create_recipes(entries, batch_size=CREATE_BATCH_SIZE, on_batch=None):
+    """
+    Insert many validated recipes, with their children, in batches.
+
+    Each batch is written in its own transaction with four bulk INSERTs:
+    one for the recipes, one for all of their ingredients, one for all of
+    their instructions and one for their first revisions, followed by the
+    summaries of the recipes. The recipes' primary keys come back from the
+    first INSERT, so the cost of a batch does not grow with its number of
+    rows, and an import can be resumed after the last committed batch.
+    Children are expected to be validated against their unsaved recipe, as
+    for `create_recipe`.
+
+    Args:
+        entries (list[tuple[Recipe, list[Ingredient], list[Instruction]]]):
+            The unsaved recipes, with their author set, and their children.
+        batch_size (int): Number of recipes written per transaction.
+        on_batch (callable, optional): Called with the recipes of each batch
+            once it is committed.
+
+    Returns:
+        list[Recipe]: The saved recipes, in the order given.
+    """
+    saved = []
+    for start in range(0, len(entries), batch_size):
+        batch = entries[start : start + batch_size]
+        with transaction.atomic():
+            recipes = Recipe.objects.bulk_create([recipe for recipe, _, _ in batch])
+            ingredients, instructions = [], []
+            for recipe, recipe_ingredients, recipe_instructions in batch:
+                for child in [*recipe_ingredients, *recipe_instructions]:
+                    child.recipe = recipe
+                ingredients.extend(recipe_ingredients)
+                instructions.extend(recipe_instructions)
+            Ingredient.objects.bulk_create(ingredients)
+            Instruction.objects.bulk_create(instructions)
+            record_first_revisions(
+                {
+                    recipe.pk: recipe_state(recipe, *children)
+                    for recipe, *children in batch
+                }
+            )
+            refresh_recipe_summaries([recipe.pk for recipe in recipes])
+            for recipe, _, recipe_instructions in batch:
+                enqueue_recipe_variants(recipe, recipe_instructions)
+        saved.extend(recipes)
+        if on_batch:
+            on_batch(recipes)
+    return saved
+
+
+def update_recipe(
+    recipe, ingredients, instructions, image_changed=False, expected_version=None
+):
+    """
+    Save an edited recipe, writing only the children that changed.
+
+    Edits are checked optimistically: the transaction starts with an UPDATE
+    incrementing the recipe's ``version``, conditional on it still being
+    the one the edit started from. A concurrent edit that got there first
+    makes this one fail before anything else is written, and no lock is
+    held while the user edits or while the edit is validated. Recipes with
+    no history get their unedited state recorded as a first revision, under
+    the row lock that UPDATE took.
+
+    In the same transaction, removed children are deleted in batches,
+    changed children are written with one ``bulk_update`` per kind, and
+    added children are inserted with one ``bulk_create`` per kind. Children
+    that swap names or steps are first moved to values no real row can
+    have, so the per-recipe unique constraints hold after every statement.
+    The edited recipe is recorded as a new revision and its summary is
+    written again. If its ingredients changed, its nutrition is marked as
+    stale.
+
+    Args:
+        recipe (Recipe): The validated, edited recipe.
+        ingredients (ChildChanges): Changes to the recipe's ingredients.
+        instructions (ChildChanges): Changes to the recipe's instructions.
+        image_changed (bool): Whether a new recipe image was uploaded.
+        expected_version (int, optional): The version the edit started
+            from. Defaults to the version ``recipe`` was loaded with.
+
+    Returns:
+        Recipe: The saved recipe, with its new version.
+
+    Raises:
+        RecipeConflict: If the recipe is no longer at ``expected_version``.
+    """
+    if expected_version is None:
+        expected_version = recipe.version
+    with transaction.atomic():
+        _claim_version(recipe, expected_version)
+        # The claimed row is locked, and the version is not part of a
+        # revision, so a missing history starts from the unedited recipe.
+        previous = ensure_revision_history(recipe.pk)
+        _save_fields(recipe, nutrition_stale=any(ingredients))
+        for model, changes in ((Ingredient, ingredients), (Instruction, instructions)):
+            _apply_child_changes(model, recipe, changes)
+        record_revision(recipe.pk, previous)
+        refresh_recipe_summaries([recipe.pk])
+        sources = [recipe.image.name] if image_changed and recipe.image else []
+        sources.extend(
+            instruction.image.name
+            for instruction in _touched_images(instructions)
+            if instruction.image
+        )
+        enqueue_image_variants(sources, recipe.pk)
+    return recipe
+
+
+def restore_revision(recipe, number, storage=None, expected_version=None):
+    """
+    Roll a recipe and its children back to one of its revisions.
+
+    The restored version is written by `update_recipe`, as an edit turning
+    the current recipe into that version, so only the rows that differ are
+    written and the rollback is itself recorded as a new revision. Children
+    removed since the revision are inserted again as new rows. Images are
+    shared with the rows that used them, by adding a reference to each
+    file. An image whose file has since been removed by ``gc_media`` cannot
+    be restored, and the current one is kept instead.
+
+    Args:
+        recipe (Recipe): The recipe to roll back.
+        number (int): The number of the revision to restore.
+        storage (Storage, optional): The storage holding the images.
+            Defaults to ``default_storage``.
+        expected_version (int, optional): The version the rollback was
+            chosen at. Defaults to the version of ``recipe``.
+
+    Returns:
+        Recipe: The saved recipe.
+
+    Raises:
+        RecipeRevision.DoesNotExist: If the recipe has no such revision.
+        RecipeConflict: If the recipe is no longer at ``expected_version``.
+    """
+    storage = storage or default_storage
+    version = recipe_version(recipe, number)
+    with transaction.atomic():
+        changed = _restore_fields(recipe, version.recipe, storage)
+        changes = {}
+        for name, model in CHILD_MODELS.items():
+            current = {child.pk: child for child in model.objects.filter(recipe=recipe)}
+            restored = {child.pk: child for child in getattr(version, name)}
+            updated = []
+            for pk in current.keys() & restored.keys():
+                child_changed = _restore_fields(current[pk], restored[pk], storage)
+                if child_changed:
+                    updated.append((current[pk], child_changed))
+            created = []
+            for pk, child in restored.items():
+                if pk not in current:
+                    created.append(model())
+                    _restore_fields(created[-1], child, storage)
+            changes[name] = ChildChanges(
+                created=created,
+                updated=updated,
+                deleted=[child for pk, child in current.items() if pk not in restored],
+            )
+        return update_recipe(
+            recipe,
+            changes["ingredients"],
+            changes["instructions"],
+            image_changed="image" in changed,
+            expected_version=expected_version,
+        )
+
+
+def _claim_version(recipe, expected_version):
+    """
+    Increment the version of ``recipe`` if it is still ``expected_version``.
+
+    Raises:
+        RecipeConflict: If the recipe is at another version, or was deleted.
+    """
+    if not Recipe.objects.filter(pk=recipe.pk, version=expected_version).update(
+        version=expected_version + 1
+    ):
+        raise RecipeConflict(
+            f"Recipe {recipe.pk} was changed since version {expected_version}."
+        )
+    recipe.version = expected_version + 1
+
+
+def _save_fields(recipe, nutrition_stale=False):
+    """
+    Write every field of ``recipe``, once its version has been claimed.
+
+    Like ``save()``, new uploads are stored and ``post_save`` is sent, so
+    cached data for the recipe is dropped. The nutrition fields are left to
+    `refresh_stale_nutrition`, and only marked as stale if asked to.
+    """
+    values = {
+        field.attname: field.pre_save(recipe, add=False)
+        for field in Recipe._meta.concrete_fields
+        if not field.primary_key and field.name not in NUTRITION_FIELDS
+    }
+    if nutrition_stale:
+        values["nutrition_stale"] = recipe.nutrition_stale = True
+    Recipe.objects.filter(pk=recipe.pk).update(**values)
+    using = router.db_for_write(Recipe, instance=recipe)
+    post_save.send(
+        sender=Recipe,
+        instance=recipe,
+        created=False,
+        update_fields=None,
+        raw=False,
+        using=using,
+    )
+
+
+def _apply_child_changes(model, recipe, changes):
+    deleted_ids = [child.pk for child in changes.deleted]
+    for start in range(0, len(deleted_ids), DELETE_BATCH_SIZE):
+        model.objects.filter(
+            pk__in=deleted_ids[start : start + DELETE_BATCH_SIZE]
+        ).delete()
+
+    updated = [child for child, _ in changes.updated]
+    fields = sorted({field for _, changed in changes.updated for field in changed})
+    for child, changed in changes.updated:
+        for field_name in changed:
+            field = model._meta.get_field(field_name)
+            if isinstance(field, FileField):
+                # bulk_update() skips pre_save(), which stores new uploads.
+                field.pre_save(child, add=False)
+    parked = {
+        field: value for field, value in PARKED_VALUES[model].items() if field in fields
+    }
+    moving = [
+        child.pk for child, changed in changes.updated if parked.keys() & set(changed)
+    ]
+    if moving:
+        model.objects.filter(pk__in=moving).update(**parked)
+    if updated:
+        model.objects.bulk_update(updated, fields)
+
+    for child in changes.created:
+        child.recipe = recipe
+    model.objects.bulk_create(changes.created)
+
+
+def _restore_fields(target, source, storage):
+    """
+    Copy the versioned fields of a restored row ``source`` onto ``target``.
+
+    A reference is added to each restored image. Images whose file no
+    longer exists are not restored, nor are the fields depending on them.
+
+    Returns:
+        list[str]: The names of the fields that changed.
+    """
+    unversioned = RECIPE_UNVERSIONED_FIELDS | CHILD_UNVERSIONED_FIELDS
+    changed, skipped = [], set()
+    for field in type(target)._meta.concrete_fields:
+        if field.name in unversioned or field.name in skipped:
+            continue
+        old, new = field.value_from_object(target), field.value_from_object(source)
+        if isinstance(field, FileField):
+            old, new = old.name or "", new.name or ""
+            if new != old and new and not storage.exists(new):
+                skipped.update(DEPENDENT_FIELDS.get(field.name, []))
+                continue
+            if new != old and new:
+                storage.add_reference(new)
+        if old != new:
+            setattr(target, field.attname, new)
+            changed.append(field.name)
+    return changed
+
+
+def _with_dependent_fields(changed):
+    fields = list(changed)
+    for field in changed:
+        fields.extend(DEPENDENT_FIELDS.get(field, []))
+    return fields
+
+
+def _touched_images(instructions):
+    """Yield instructions whose image was added or replaced."""
+    yield from instructions.created
+    for instruction, changed in instructions.updated:
+        if "image" in changed:
+            yield instruction
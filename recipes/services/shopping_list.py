@@ -0,0 +1,125 @@
+import hashlib
+import json
+from decimal import Decimal
+from fractions import Fraction
+from typing import NamedTuple
+from recipes.helpers import two_tier_cache
+from recipes.models import Ingredient
+from recipes.services.recipe_scaling import base_quantities, scale_quantities
+
+SHOPPING_LIST_NAMESPACE = "shopping_list"
+
+
+class ShoppingListItem(NamedTuple):
+    """
+    One line of a shopping list.
+
+    Attributes:
+        name (str): The name of the ingredient, as first written.
+        quantity (Decimal | None): The total quantity, or ``None`` if no
+            recipe gives one.
+        unit (str): The unit of the quantity.
+    """
+
+    name: str
+    quantity: Decimal | None
+    unit: str
+
+    def get_quantity(self):
+        """Return the quantity without trailing zeros, or "" if there is none."""
+        if self.quantity is None:
+            return ""
+        return format(self.quantity.normalize(), "f")
+
+
+def get_shopping_list(recipe_ids, servings=None):
+    """
+    Return the merged shopping list of some recipes, from cache.
+
+    Lists are cached by a hash of the selection, so the same recipes picked
+    in any order share one entry. Every cached list is dropped when any
+    recipe or ingredient changes (see `invalidate_shopping_lists`).
+
+    Args:
+        recipe_ids (Iterable[int]): The primary keys of the recipes.
+        servings (int, optional): The number of servings to make of each
+            recipe. Defaults to the number each recipe makes.
+
+    Returns:
+        list[ShoppingListItem]: The items, as built by `build_shopping_list`.
+    """
+    recipe_ids = sorted(set(recipe_ids))
+    return two_tier_cache.get_or_set(
+        _cache_key(recipe_ids, servings),
+        lambda: build_shopping_list(recipe_ids, servings),
+        namespace=SHOPPING_LIST_NAMESPACE,
+    )
+
+
+def build_shopping_list(recipe_ids, servings=None):
+    """
+    Merge the ingredients of some recipes into one shopping list.
+
+    The ingredients of every recipe are read in one query. Their quantities
+    are converted to the base unit of their dimension, such as tsp to ml and
+    lb to g, and summed by normalised name in one pass. Quantities that
+    cannot be converted into each other, such as flour by weight and by the
+    cup, make separate items. The totals are then written in a sensible
+    unit, so 1500 g become 1.5 kg.
+
+    Args:
+        recipe_ids (Iterable[int]): The primary keys of the recipes.
+        servings (int, optional): The number of servings to make of each
+            recipe. Defaults to the number each recipe makes.
+
+    Returns:
+        list[ShoppingListItem]: The items, ordered by name.
+    """
+    rows = list(
+        Ingredient.objects.filter(recipe_id__in=recipe_ids).values_list(
+            "name", "quantity", "unit", "recipe__servings"
+        )
+    )
+    names, quantities, units, recipe_servings = zip(*rows) if rows else ([],) * 4
+    if servings is not None:
+        quantities = [
+            (
+                Fraction(quantity) * Fraction(servings, made)
+                if quantity is not None
+                else None
+            )
+            for quantity, made in zip(quantities, recipe_servings)
+        ]
+    quantities, units = base_quantities(quantities, units)
+
+    totals = {}
+    for name, quantity, unit in zip(names, quantities, units):
+        key = (normalise_ingredient_name(name), unit)
+        if key not in totals:
+            totals[key] = [name, None]
+        if quantity is not None:
+            totals[key][1] = (totals[key][1] or 0) + quantity
+
+    keys = sorted(totals)
+    quantities, units = scale_quantities(
+        [totals[key][1] for key in keys], [unit for _, unit in keys], 1
+    )
+    return [
+        ShoppingListItem(totals[key][0], quantity, unit)
+        for key, quantity, unit in zip(keys, quantities, units)
+    ]
+
+
+def invalidate_shopping_lists():
+    """Drop every cached shopping list, in every process."""
+    two_tier_cache.bump_namespace(SHOPPING_LIST_NAMESPACE)
+
+
+def normalise_ingredient_name(name):
+    """Return ``name`` folded to lower case with single spaces, for matching."""
+    return " ".join(name.casefold().split())
+
+
+def _cache_key(recipe_ids, servings):
+    selection = json.dumps({"recipes": recipe_ids, "servings": servings})
+    return f"selection:{hashlib.sha256(selection.encode()).hexdigest()}"
@@ -0,0 +1,62 @@
+"""
+Signal receivers for the ``recipes`` app.
+
+Receivers are connected in ``RecipesConfig.ready()``.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from recipes.models import Ingredient, Instruction, Recipe, User
+from recipes.services import (
+    AUTHOR_FIELDS,
+    invalidate_recipe_detail,
+    invalidate_shopping_lists,
+    refresh_author_summaries,
+)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_recipe(sender, instance, **kwargs):
+    """Drop cached data for a recipe that was saved or deleted."""
+    _invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+@receiver(post_save, sender=Instruction)
+@receiver(post_delete, sender=Instruction)
+def invalidate_recipe_child(sender, instance, **kwargs):
+    """Drop cached data for the recipe owning a changed ingredient or instruction."""
+    if instance.recipe_id is not None:
+        _invalidate(instance.recipe_id)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def invalidate_ingredients(sender, instance, **kwargs):
+    """Drop cached shopping lists when a recipe or its ingredients change."""
+    invalidate_shopping_lists()
+    transaction.on_commit(invalidate_shopping_lists)
+
+
+@receiver(post_save, sender=User)
+def refresh_author_name(sender, instance, created, update_fields=None, **kwargs):
+    """Copy a user's new name to the summaries of their recipes."""
+    if created or (update_fields is not None and not AUTHOR_FIELDS & update_fields):
+        return
+    refresh_author_summaries(instance)
+
+
+def _invalidate(pk):
+    """
+    Drop cached data for a recipe now, and again once the change commits.
+
+    A request reading the recipe before the transaction commits would cache
+    the old data again, so the second invalidation clears that.
+    """
+    invalidate_recipe_detail(pk)
+    transaction.on_commit(lambda: invalidate_recipe_detail(pk))
@@ -0,0 +1,156 @@
+"""
+Storage backends for the ``recipes`` app.
+
+`ContentAddressedStorage` is configured as the default storage in
+``settings.STORAGES``, so every `ImageField` in the app stores its files
+through it.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from collections import Counter
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from recipes.models import MediaBlob
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that keeps one copy of each distinct file content.
+
+    Uploads are streamed to a temporary file while being hashed, then moved
+    to ``blobs/<aa>/<bb>/<sha256><ext>``. If a blob with the same content
+    already exists the temporary file is simply discarded, and the upload
+    is pointed at the existing blob. Each save adds a reference to the blob's
+    `MediaBlob` row, and ``delete()`` only removes the file once its last
+    reference is gone. The requested name only contributes its extension.
+
+    Reference counts are updated in the caller's database transaction, so
+    they roll back with it; ``manage.py gc_media`` cleans up any blob files
+    left behind by a rollback.
+    """
+
+    blob_directory = "blobs"
+
+    def get_available_name(self, name, max_length=None):
+        """Return ``name`` unchanged; the final name is chosen by ``_save()``."""
+        return name
+
+    def _save(self, name, content):
+        digest, size, temporary_path = self._spool(content)
+        blob_name = self.blob_name(digest, os.path.splitext(name)[1])
+        path = self.path(blob_name)
+        if os.path.exists(path):
+            os.unlink(temporary_path)
+            # Refresh the blob's age so gc_media's grace period covers this
+            # new reference until the row using it is committed.
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.chmod(temporary_path, self.file_permissions_mode or 0o644)
+            os.replace(temporary_path, path)
+        self.add_reference(blob_name, digest=digest, size=size)
+        return blob_name
+
+    def delete(self, name):
+        """
+        Drop one reference to ``name``, removing the file with the last one.
+
+        Files outside the blob directory are deleted immediately.
+        """
+        if not self.is_blob(name):
+            return super().delete(name)
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is not None and blob.ref_count > 1:
+                MediaBlob.objects.filter(pk=blob.pk).update(
+                    ref_count=F("ref_count") - 1
+                )
+                return
+            if blob is not None:
+                blob.delete()
+        super().delete(name)
+
+    def add_reference(self, name, digest=None, size=None):
+        """
+        Record one more reference to the blob stored as ``name``.
+
+        Used when a file is shared by reference, for example when a recipe is
+        copied, so that deleting one copy does not remove the other's file.
+        """
+        if not self.is_blob(name):
+            return
+        if MediaBlob.objects.filter(name=name).update(ref_count=F("ref_count") + 1):
+            return
+        digest = digest or self.digest_from_name(name)
+        size = size if size is not None else self.size(name)
+        try:
+            with transaction.atomic():
+                MediaBlob.objects.create(
+                    digest=digest, name=name, size=size, ref_count=1
+                )
+        except IntegrityError:
+            # A concurrent upload of the same content created the row first.
+            MediaBlob.objects.filter(name=name).update(ref_count=F("ref_count") + 1)
+
+    def add_references(self, names):
+        """
+        Record one more reference to each blob in ``names``, in one UPDATE.
+
+        A name listed several times gets as many references. Blobs without a
+        `MediaBlob` row yet, such as those stored before references were
+        counted, fall back to `add_reference`.
+        """
+        counts = Counter(name for name in names if self.is_blob(name))
+        if not counts:
+            return
+        increment = Value(1)
+        if max(counts.values()) > 1:
+            increment = Case(
+                *[When(name=name, then=Value(count)) for name, count in counts.items()]
+            )
+        blobs = MediaBlob.objects.filter(name__in=counts)
+        if blobs.update(ref_count=F("ref_count") + increment) == len(counts):
+            return
+        recorded = set(blobs.values_list("name", flat=True))
+        for name in counts.keys() - recorded:
+            for _ in range(counts[name]):
+                self.add_reference(name)
+
+    def blob_name(self, digest, extension=""):
+        """Return the storage name of the blob with the given SHA-256 digest."""
+        extension = extension.lower()
+        if not re.fullmatch(r"\.[a-z0-9]{1,10}", extension):
+            extension = ""
+        return f"{self.blob_directory}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+    def is_blob(self, name):
+        """Return True if ``name`` is a blob managed by this storage."""
+        return name.startswith(f"{self.blob_directory}/")
+
+    def digest_from_name(self, name):
+        """Return the SHA-256 digest encoded in a blob name."""
+        return os.path.splitext(os.path.basename(name))[0]
+
+    def _spool(self, content):
+        """Stream ``content`` to a temporary file, hashing it on the way."""
+        directory = self.path(f"{self.blob_directory}/tmp")
+        os.makedirs(directory, exist_ok=True)
+        hasher = hashlib.sha256()
+        size = 0
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(descriptor, "wb") as temporary_file:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    hasher.update(chunk)
+                    temporary_file.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+        return hasher.hexdigest(), size, temporary_path
@@ -0,0 +1,72 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+register = template.Library()
+
+DEFAULT_SIZES = "(min-width: 768px) 50vw, 100vw"
+
+PLACEHOLDER_IMAGE = "img/image-placeholder.svg"
+
+
+@register.filter
+def srcset(variants, variant_format="jpeg"):
+    """
+    Build a ``srcset`` attribute value from image variants.
+
+    Usage: ``{{ recipe.image_variants|srcset:"webp" }}``
+    """
+    return ", ".join(
+        f"{variant.file.url} {variant.width}w"
+        for variant in variants or []
+        if variant.format == variant_format
+    )
+
+
+@register.simple_tag
+def responsive_image(
+    variants, alt="", sizes=DEFAULT_SIZES, css_class="", placeholder=""
+):
+    """
+    Render a ``<picture>`` that lets the browser pick the smallest variant.
+
+    WebP variants are offered first, with JPEG variants as the ``<img>``
+    fallback. The image is lazy-loaded over its inline ``placeholder``, so
+    the first paint needs no image bytes. Variants are generated by a
+    background worker, so until they exist only the placeholder is rendered,
+    or a static stand-in image for rows without one.
+
+    Usage: ``{% responsive_image recipe.image_variants alt=recipe.title
+    placeholder=recipe.image_placeholder %}``
+    """
+    jpegs = [variant for variant in variants or [] if variant.format == "jpeg"]
+    if not jpegs:
+        return format_html(
+            '<img src="{}" alt="{}" class="{} image-pending">',
+            placeholder or static(PLACEHOLDER_IMAGE),
+            alt,
+            css_class,
+        )
+    largest = jpegs[-1]
+    placeholder_style = (
+        format_html(' style="background-image: url({})"', placeholder)
+        if placeholder
+        else ""
+    )
+    return format_html(
+        "<picture>"
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" '
+        'alt="{}" class="{}" loading="lazy" decoding="async"{}>'
+        "</picture>",
+        srcset(variants, "webp"),
+        sizes,
+        largest.file.url,
+        srcset(variants, "jpeg"),
+        sizes,
+        largest.width,
+        largest.height,
+        alt,
+        css_class,
+        placeholder_style,
+    )
@@ -0,0 +1,67 @@
+"""Tests of the audit_queries management command."""
+
+import json
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from recipes.models import Ingredient, Instruction, Recipe, User
+from recipes.services import create_recipe
+
+
+class AuditQueriesCommandTestCase(TestCase):
+    """Tests of the audit_queries management command."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.recipe = create_recipe(
+            Recipe(author=User.objects.get(username="@johndoe"), title="Toast"),
+            [Ingredient(name="Bread")],
+            [Instruction(step=1, description="Toast the bread.")],
+        )
+
+    def _audit(self, **options):
+        output = StringIO()
+        call_command("audit_queries", stdout=output, **options)
+        return json.loads(output.getvalue())
+
+    def test_every_view_is_audited(self):
+        report = self._audit()
+        views = {entry["name"]: entry for entry in report["views"]}
+        self.assertEqual(views["dashboard"]["status"], 200)
+        self.assertEqual(views["recipe_detail"]["path"], f"/recipes/{self.recipe.pk}/")
+        self.assertTrue(views["recipe_detail"]["statements"])
+        self.assertEqual(views[None]["skipped"], "not a view of this project")
+        self.assertEqual(views["recipe_restore"]["method"], "POST")
+        self.assertIn("plan", views["dashboard"]["statements"][0])
+        self.assertIn("index_candidates", report["summary"])
+
+    def test_views_write_nothing(self):
+        self._audit()
+        self.assertEqual(Recipe.objects.get().title, "Toast")
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    def test_report_is_stable(self):
+        self.assertEqual(self._audit(), self._audit())
+
+    def test_urls_without_parameter_values_are_skipped(self):
+        self.recipe.revisions.all().delete()
+        report = self._audit()
+        views = {entry["name"]: entry for entry in report["views"]}
+        self.assertEqual(views["recipe_restore"]["skipped"], "no value for number")
+
+    def test_unknown_user_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("audit_queries", user="@nobody", stdout=StringIO())
+
+    def test_views_of_recipes_are_skipped_without_recipes(self):
+        Recipe.objects.all().delete()
+        views = {entry["name"]: entry for entry in self._audit()["views"]}
+        self.assertEqual(views["recipe_detail"]["skipped"], "no value for pk")
+        self.assertEqual(views["dashboard"]["status"], 200)
+
+    def test_empty_database_is_rejected(self):
+        User.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command("audit_queries", stdout=StringIO())
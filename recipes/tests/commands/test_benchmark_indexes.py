@@ -0,0 +1,33 @@
+"""Tests of the benchmark_indexes management command."""
+
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from recipes.models import Instruction, Recipe, User
+
+
+class BenchmarkIndexesCommandTestCase(TestCase):
+    """Tests of the benchmark_indexes management command."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def test_every_query_is_timed(self):
+        output = StringIO()
+        call_command("benchmark_indexes", rows=[50], repeat=1, stdout=output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[1].split()[0], "50")
+        self.assertIn("newest recipes of author", output.getvalue())
+        self.assertIn("steps of recipe", output.getvalue())
+
+    def test_database_is_left_untouched(self):
+        call_command("benchmark_indexes", rows=[50], repeat=1, stdout=StringIO())
+        self.assertEqual(User.objects.count(), 1)
+        self.assertFalse(Recipe.objects.exists())
+        self.assertFalse(Instruction.objects.exists())
+        call_command("benchmark_indexes", rows=[50], repeat=1, stdout=StringIO())
+
+    def test_rows_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_indexes", rows=[0], stdout=StringIO())
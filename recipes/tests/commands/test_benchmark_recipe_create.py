@@ -0,0 +1,26 @@
+"""Tests of the benchmark_recipe_create management command."""
+
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from recipes.models import Recipe, User
+
+
+class BenchmarkRecipeCreateCommandTestCase(TestCase):
+    """Tests of the benchmark_recipe_create management command."""
+
+    def test_reports_latency_and_leaves_no_data(self):
+        output = StringIO()
+        call_command(
+            "benchmark_recipe_create", rows=[2], repeat=1, images=True, stdout=output
+        )
+        lines = output.getvalue().splitlines()
+        self.assertIn("valid (ms)", lines[0])
+        self.assertEqual(lines[1].split()[0], "2")
+        self.assertFalse(Recipe.objects.exists())
+        self.assertFalse(User.objects.filter(username="@benchmark").exists())
+
+    def test_invalid_repeat_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_recipe_create", repeat=0)
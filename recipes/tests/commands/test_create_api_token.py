@@ -0,0 +1,29 @@
+"""Tests of the create_api_token management command."""
+
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from recipes.models import ApiToken, User
+from recipes.services import authenticate_api_token
+
+
+class CreateApiTokenCommandTestCase(TestCase):
+    """Tests of the create_api_token management command."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def test_token_is_issued_and_printed_once(self):
+        output = StringIO()
+        call_command("create_api_token", "@johndoe", name="Partner", stdout=output)
+        key = output.getvalue().strip()
+        token = ApiToken.objects.get()
+        self.assertEqual(token.name, "Partner")
+        self.assertNotEqual(token.digest, key)
+        self.assertEqual(
+            authenticate_api_token(key), User.objects.get(username="@johndoe")
+        )
+
+    def test_unknown_user_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("create_api_token", "@nobody", stdout=StringIO())
@@ -0,0 +1,41 @@
+"""Tests of the gc_media management command."""
+
+import shutil
+import tempfile
+from io import StringIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+
+class GcMediaCommandTestCase(TestCase):
+    """Tests of the gc_media management command."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.name = default_storage.save("recipe/images/a.jpg", ContentFile(b"orphan"))
+
+    def test_dry_run_reports_reclaimable_bytes(self):
+        output = StringIO()
+        call_command(
+            "gc_media", dry_run=True, grace_period=0, verbosity=2, stdout=output
+        )
+        self.assertIn(f"{self.name} (6 bytes)", output.getvalue())
+        self.assertIn("Would remove 1 file(s), reclaiming 6 bytes.", output.getvalue())
+        self.assertTrue(default_storage.exists(self.name))
+
+    def test_removes_unreferenced_files(self):
+        output = StringIO()
+        call_command("gc_media", grace_period=0, stdout=output)
+        self.assertIn("Removed 1 file(s), reclaiming 6 bytes.", output.getvalue())
+        self.assertFalse(default_storage.exists(self.name))
+
+    def test_invalid_batch_size_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("gc_media", batch_size=0)
@@ -0,0 +1,55 @@
+"""Tests of the load_nutrition and compute_nutrition management commands."""
+
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from recipes.models import Ingredient, NutritionReference, Recipe, User
+
+
+class LoadNutritionCommandTestCase(TestCase):
+    """Tests of the load_nutrition and compute_nutrition management commands."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def test_shipped_dataset_is_loaded(self):
+        output = StringIO()
+        call_command("load_nutrition", stdout=output)
+        self.assertIn("nutrition reference food(s)", output.getvalue())
+        self.assertTrue(NutritionReference.objects.filter(normalised_name="egg"))
+
+    def test_csv_file_is_loaded(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "foods.csv"
+            path.write_text("name,calories,protein,fat,carbohydrate\nKale,49,4,1,9\n")
+            call_command("load_nutrition", str(path), stdout=StringIO())
+        self.assertEqual(NutritionReference.objects.get().name, "Kale")
+
+    def test_invalid_csv_file_is_rejected(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "foods.csv"
+            path.write_text("name,calories\nKale,49\n")
+            with self.assertRaises(CommandError):
+                call_command("load_nutrition", str(path))
+        self.assertFalse(NutritionReference.objects.exists())
+
+    def test_missing_file_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("load_nutrition", "/nonexistent/foods.csv")
+
+    def test_stale_recipes_are_computed(self):
+        author = User.objects.get(username="@johndoe")
+        recipe = Recipe.objects.create(author=author, title="Omelette", servings=1)
+        Ingredient.objects.create(recipe=recipe, name="Eggs", quantity=2)
+        call_command("load_nutrition", stdout=StringIO())
+        output = StringIO()
+        call_command("compute_nutrition", batch_size=1, stdout=output)
+        self.assertIn("Computed the nutrition of 1 recipe(s).", output.getvalue())
+        self.assertEqual(Recipe.objects.get().calories, 143)
+
+    def test_batch_size_must_be_positive(self):
+        for command in ["load_nutrition", "compute_nutrition"]:
+            with self.assertRaises(CommandError):
+                call_command(command, batch_size=0)
@@ -0,0 +1,25 @@
+"""Tests of the rebuild_recipe_summaries management command."""
+
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from recipes.models import Recipe, RecipeSummary, User
+
+
+class RebuildRecipeSummariesCommandTestCase(TestCase):
+    """Tests of the rebuild_recipe_summaries management command."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def test_recipes_are_summarised(self):
+        author = User.objects.get(username="@johndoe")
+        Recipe.objects.create(author=author, title="Toast")
+        output = StringIO()
+        call_command("rebuild_recipe_summaries", batch_size=1, stdout=output)
+        self.assertIn("Rebuilt the summaries of 1 recipe(s).", output.getvalue())
+        self.assertEqual(RecipeSummary.objects.get().title, "Toast")
+
+    def test_batch_size_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            call_command("rebuild_recipe_summaries", batch_size=0)
@@ -0,0 +1,27 @@
+"""Tests of the run_workers management command."""
+
+from io import StringIO
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from recipes.models import ImageVariant, Job
+from recipes.services import enqueue
+from recipes.tests.helpers import make_image_file
+
+
+class RunWorkersCommandTestCase(TestCase):
+    """Tests of the run_workers management command."""
+
+    def test_inline_worker_processes_image_jobs(self):
+        source = default_storage.save("recipe/images/photo.jpg", make_image_file())
+        enqueue("image_variants", source=source)
+        output = StringIO()
+        call_command("run_workers", concurrency=0, once=True, stdout=output)
+        self.assertIn("Processed 1 job(s).", output.getvalue())
+        self.assertEqual(Job.objects.get().status, Job.Status.DONE)
+        self.assertTrue(ImageVariant.objects.filter(source=source).exists())
+
+    def test_negative_concurrency_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("run_workers", concurrency=-1, once=True)
@@ -0,0 +1,33 @@
+"""Tests of the shard_media management command."""
+
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from recipes.models import Recipe, User
+from recipes.tests.helpers import write_legacy_file
+
+
+class ShardMediaCommandTestCase(TestCase):
+    """Tests of the shard_media management command."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def test_moves_files_and_reports_missing_ones(self):
+        author = User.objects.get(username="@johndoe")
+        Recipe.objects.create(
+            author=author,
+            title="Pancakes",
+            image=write_legacy_file("recipe/images/legacy.jpg", b"pancakes"),
+        )
+        Recipe.objects.create(
+            author=author, title="Waffles", image="recipe/images/missing.jpg"
+        )
+        output = StringIO()
+        call_command("shard_media", stdout=output)
+        self.assertIn("Moved 1 file(s).", output.getvalue())
+        self.assertIn("Skipped 1 row(s) with missing files.", output.getvalue())
+
+    def test_invalid_batch_size_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("shard_media", batch_size=0)
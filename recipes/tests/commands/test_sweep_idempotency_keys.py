@@ -0,0 +1,35 @@
+"""Tests of the sweep_idempotency_keys management command."""
+
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from recipes.models import IdempotencyKey, User
+
+
+class SweepIdempotencyKeysCommandTestCase(TestCase):
+    """Tests of the sweep_idempotency_keys management command."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        user = User.objects.get(username="@johndoe")
+        now = timezone.now()
+        IdempotencyKey.objects.create(user=user, key="old", expires_at=now)
+        IdempotencyKey.objects.create(
+            user=user, key="new", expires_at=now + timedelta(hours=1)
+        )
+
+    def test_expired_keys_are_deleted(self):
+        output = StringIO()
+        call_command("sweep_idempotency_keys", batch_size=1, stdout=output)
+        self.assertIn("Deleted 1 expired idempotency key(s).", output.getvalue())
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)), ["new"]
+        )
+
+    def test_batch_size_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            call_command("sweep_idempotency_keys", batch_size=0)
@@ -0,0 +1,141 @@
+"""Unit tests of the bulk recipe validator."""
+
+from django.test import TestCase
+from recipes.forms import BulkRecipeValidator, RecipeForm
+from recipes.models import Ingredient, Instruction, Recipe, User
+from recipes.views.recipe_formsets_mixin import IngredientFormSet, InstructionFormSet
+
+
+class BulkRecipeValidatorTestCase(TestCase):
+    """Unit tests of the bulk recipe validator."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.author = User.objects.get(username="@johndoe")
+        self.validator = BulkRecipeValidator(
+            RecipeForm,
+            {"ingredients": IngredientFormSet, "instructions": InstructionFormSet},
+        )
+        self.data = {
+            "title": "Soup",
+            "difficulty": 2,
+            "time": 20,
+            "ingredients": [{"name": "Leek", "quantity": 2, "unit": "g"}],
+            "instructions": [{"step": 1, "description": "Simmer."}],
+        }
+
+    def _validate(self):
+        return self.validator.validate(self.data, author=self.author)
+
+    def test_valid_recipe(self):
+        (recipe, children), errors = self._validate()
+        self.assertEqual(errors, {})
+        self.assertIsInstance(recipe, Recipe)
+        self.assertIsNone(recipe.pk)
+        self.assertEqual(recipe.author, self.author)
+        self.assertEqual(recipe.title, "Soup")
+        self.assertEqual(recipe.difficulty, 2)
+        [ingredient] = children["ingredients"]
+        self.assertIsInstance(ingredient, Ingredient)
+        self.assertEqual((ingredient.name, ingredient.quantity), ("Leek", 2))
+        [instruction] = children["instructions"]
+        self.assertIsInstance(instruction, Instruction)
+        self.assertEqual(instruction.description, "Simmer.")
+
+    def test_field_errors(self):
+        self.data["title"] = ""
+        self.data["difficulty"] = 7
+        _, errors = self._validate()
+        self.assertEqual(set(errors), {"title", "difficulty"})
+
+    def test_row_errors_are_keyed_by_index(self):
+        self.data["ingredients"].append({"name": "Salt", "unit": "bucket"})
+        _, errors = self._validate()
+        self.assertEqual(list(errors["ingredients"]), ["1"])
+        self.assertIn("unit", errors["ingredients"]["1"])
+
+    def test_form_clean_hooks_run(self):
+        self.data["ingredients"][0]["name"] = "  Leek  "
+        (_, children), errors = self._validate()
+        self.assertEqual(errors, {})
+        self.assertEqual(children["ingredients"][0].name, "Leek")
+
+    def test_at_least_one_row_of_each_kind(self):
+        self.data["ingredients"] = []
+        del self.data["instructions"]
+        _, errors = self._validate()
+        self.assertIn("__all__", errors["ingredients"])
+        self.assertIn("__all__", errors["instructions"])
+
+    def test_empty_rows_are_skipped(self):
+        self.data["instructions"].append({})
+        (_, children), errors = self._validate()
+        self.assertEqual(errors, {})
+        self.assertEqual(len(children["instructions"]), 1)
+
+    def test_rows_must_be_unique_within_the_recipe(self):
+        self.data["ingredients"].append({"name": "Leek"})
+        self.data["instructions"].append({"step": 1, "description": "Serve."})
+        _, errors = self._validate()
+        self.assertIn("__all__", errors["ingredients"])
+        self.assertIn("__all__", errors["instructions"])
+
+    def test_image_fields_are_ignored(self):
+        self.data["image"] = "secret.jpg"
+        (recipe, _), errors = self._validate()
+        self.assertEqual(errors, {})
+        self.assertFalse(recipe.image)
+
+    def test_agrees_with_the_create_view_forms(self):
+        cases = {
+            "valid": {},
+            "blank title": {"title": "  "},
+            "long title": {"title": "x" * 101},
+            "bad time": {"time": "soon"},
+            "missing difficulty": {"difficulty": None},
+            "no ingredients": {"ingredients": []},
+            "duplicate ingredient": {
+                "ingredients": [{"name": "Leek"}, {"name": "Leek"}]
+            },
+            "bad quantity": {"ingredients": [{"name": "Leek", "quantity": "lots"}]},
+            "bad unit": {"ingredients": [{"name": "Leek", "unit": "bucket"}]},
+            "blank ingredient name": {"ingredients": [{"name": " ", "unit": "g"}]},
+            "no instructions": {"instructions": []},
+            "duplicate step": {
+                "instructions": [
+                    {"step": 1, "description": "a"},
+                    {"step": 1, "description": "b"},
+                ]
+            },
+            "missing step": {"instructions": [{"description": "a"}]},
+            "blank description": {"instructions": [{"step": 1, "description": ""}]},
+        }
+        for name, changes in cases.items():
+            with self.subTest(name):
+                data = {**self.data, **changes}
+                _, errors = self.validator.validate(data, author=self.author)
+                self.assertEqual(not errors, self._forms_are_valid(data), errors)
+
+    def _forms_are_valid(self, data):
+        post = {
+            name: "" if data.get(name) is None else str(data[name])
+            for name in ("title", "description", "difficulty", "time")
+            if name in data
+        }
+        for prefix in ("ingredients", "instructions"):
+            rows = data.get(prefix, [])
+            post[f"{prefix}-TOTAL_FORMS"] = str(len(rows))
+            post[f"{prefix}-INITIAL_FORMS"] = "0"
+            for index, row in enumerate(rows):
+                for field, value in row.items():
+                    post[f"{prefix}-{index}-{field}"] = str(value)
+        form = RecipeForm(data=post)
+        form.instance.author = self.author
+        return all(
+            [
+                form.is_valid(),
+                IngredientFormSet(post, instance=form.instance).is_valid(),
+                InstructionFormSet(post, instance=form.instance).is_valid(),
+            ]
+        )
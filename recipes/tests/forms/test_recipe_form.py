@@ -4,6 +4,7 @@ from django import forms
 from django.test import TestCase
 from recipes.forms import RecipeForm
 from recipes.models import Recipe, User
+from recipes.tests.helpers import make_image_file
 
 
 class RecipeFormTestCase(TestCase):
@@ -113,8 +114,41 @@ class RecipeFormTestCase(TestCase):
         self.assertEqual(recipe.difficulty, Recipe.Difficulty.EASY)
         self.assertEqual(recipe.time, 45)
 
+    def test_form_servings_defaults_to_recipe_servings(self):
+        form = RecipeForm(data=self.form_input)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save(commit=False).servings, 4)
+
+    def test_form_servings_must_be_at_least_1(self):
+        self.form_input["servings"] = 0
+        form = RecipeForm(data=self.form_input)
+        self.assertFalse(form.is_valid())
+
     def test_form_uses_model_validation(self):
         # Title that's too long
         self.form_input["title"] = "x" * 101
         form = RecipeForm(data=self.form_input)
         self.assertFalse(form.is_valid())
+
+    def test_form_stores_placeholder_for_uploaded_image(self):
+        form = RecipeForm(data=self.form_input, files={"image": make_image_file()})
+        self.assertTrue(form.is_valid())
+        recipe = form.save(commit=False)
+        self.assertTrue(recipe.image_placeholder.startswith("data:image/webp;base64,"))
+
+    def test_form_reports_image_rejected_by_upload_handler(self):
+        image = make_image_file()
+        image.upload_error = "This file is too large."
+        form = RecipeForm(data=self.form_input, files={"image": image})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["image"], ["This file is too large."])
+
+    def test_form_clears_placeholder_with_image(self):
+        recipe = Recipe.objects.create(
+            author=self.author, title="Toast", image_placeholder="data:,"
+        )
+        form = RecipeForm(
+            data={**self.form_input, "image-clear": "on"}, instance=recipe
+        )
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save(commit=False).image_placeholder, "")
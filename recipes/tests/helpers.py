@@ -1,4 +1,9 @@
+import io
+import os
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
+from PIL import Image
 from with_asserts.mixin import AssertHTMLMixin
 
 
@@ -9,6 +14,31 @@ def reverse_with_next(url_name, next_url):
     return url
 
 
+def make_image_file(
+    name="photo.jpg", size=(2000, 1000), image_format="JPEG", orientation=None
+):
+    """Return an uploaded image file of the given size, with optional EXIF orientation."""
+    image = Image.new("RGB", size, (200, 120, 40))
+    buffer = io.BytesIO()
+    options = {}
+    if orientation is not None:
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        options["exif"] = exif
+    image.save(buffer, image_format, **options)
+    content_type = f"image/{image_format.lower()}"
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=content_type)
+
+
+def write_legacy_file(name, content):
+    """Write a file straight to the media root, as older uploads were stored."""
+    path = default_storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as legacy:
+        legacy.write(content)
+    return name
+
+
 class LogInTester:
     """Class support login in tests."""
 
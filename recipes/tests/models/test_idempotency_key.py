@@ -0,0 +1,36 @@
+"""Unit tests for the IdempotencyKey model."""
+
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+from recipes.models import IdempotencyKey, User
+
+
+class IdempotencyKeyModelTestCase(TestCase):
+    """Unit tests for the IdempotencyKey model."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        self.other = User.objects.create_user("@janedoe", password="Password123")
+
+    def _key(self, user, key="abc"):
+        return IdempotencyKey.objects.create(
+            user=user, key=key, expires_at=timezone.now()
+        )
+
+    def test_key_is_unique_per_user(self):
+        self._key(self.user)
+        with self.assertRaises(IntegrityError):
+            self._key(self.user)
+
+    def test_users_can_use_the_same_key(self):
+        self._key(self.user)
+        self._key(self.other)
+        self.assertEqual(IdempotencyKey.objects.count(), 2)
+
+    def test_keys_are_deleted_with_their_user(self):
+        self._key(self.user)
+        self.user.delete()
+        self.assertFalse(IdempotencyKey.objects.exists())
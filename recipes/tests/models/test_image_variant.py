@@ -0,0 +1,42 @@
+"""Unit tests for the ImageVariant model."""
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from recipes.models import ImageVariant
+
+
+class ImageVariantModelTestCase(TestCase):
+    """Unit tests for the ImageVariant model."""
+
+    def setUp(self):
+        self.variant = ImageVariant.objects.create(
+            source="recipe/images/photo.jpg",
+            format=ImageVariant.Format.WEBP,
+            width=320,
+            height=240,
+            file="recipe/variants/photo-320w.webp",
+        )
+
+    def test_valid_variant(self):
+        try:
+            self.variant.full_clean()
+        except ValidationError:
+            self.fail("Test variant should be valid")
+
+    def test_format_must_be_in_choices(self):
+        self.variant.format = "gif"
+        with self.assertRaises(ValidationError):
+            self.variant.full_clean()
+
+    def test_variants_must_be_unique_per_source_format_and_width(self):
+        with self.assertRaises(ValidationError):
+            ImageVariant(
+                source=self.variant.source,
+                format=self.variant.format,
+                width=self.variant.width,
+                height=240,
+                file="recipe/variants/other.webp",
+            ).full_clean()
+
+    def test_str(self):
+        self.assertEqual(str(self.variant), "recipe/images/photo.jpg (320w webp)")
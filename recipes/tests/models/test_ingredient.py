@@ -1,3 +1,4 @@
+from decimal import Decimal
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 from recipes.models import Recipe, User, Ingredient
@@ -51,6 +52,16 @@ class IngredientModelTestCase(TestCase):
         self.ingredient.quantity = 0
         self.__assert_ingredient_is_valid()
 
+    def test_quantity_can_be_fractional(self):
+        self.ingredient.quantity = Decimal("0.333")
+        self.ingredient.save()
+        self.ingredient.refresh_from_db()
+        self.assertEqual(self.ingredient.quantity, Decimal("0.333"))
+
+    def test_quantity_cannot_have_over_3_decimal_places(self):
+        self.ingredient.quantity = Decimal("0.3333")
+        self.__assert_ingredient_is_invalid()
+
     def test_unit_can_be_blank(self):
         self.ingredient.unit = ""
         self.__assert_ingredient_is_valid()
@@ -96,6 +107,12 @@ class IngredientModelTestCase(TestCase):
         self.ingredient.save()
         self.assertEqual(str(self.ingredient), "0 cup Rice")
 
+    def test_str_method_fractional_quantity(self):
+        self.ingredient.quantity = Decimal("0.5")
+        self.ingredient.save()
+        self.ingredient.refresh_from_db()
+        self.assertEqual(str(self.ingredient), "0.5 cup Rice")
+
     def test_str_method_name(self):
         self.ingredient.unit = ""
         self.ingredient.quantity = None
@@ -0,0 +1,30 @@
+"""Unit tests for the Job model."""
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from recipes.models import Job
+
+
+class JobModelTestCase(TestCase):
+    """Unit tests for the Job model."""
+
+    def setUp(self):
+        self.job = Job.objects.create(kind="image_variants", payload={"source": "a"})
+
+    def test_valid_job(self):
+        try:
+            self.job.full_clean()
+        except ValidationError:
+            self.fail("Test job should be valid")
+
+    def test_new_jobs_are_pending(self):
+        self.assertEqual(self.job.status, Job.Status.PENDING)
+        self.assertEqual(self.job.attempts, 0)
+
+    def test_status_must_be_in_choices(self):
+        self.job.status = "paused"
+        with self.assertRaises(ValidationError):
+            self.job.full_clean()
+
+    def test_str(self):
+        self.assertEqual(str(self.job), f"image_variants job {self.job.pk} (pending)")
@@ -0,0 +1,41 @@
+"""Unit tests of the NutritionReference model."""
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from recipes.models import NutritionReference
+
+
+class NutritionReferenceModelTestCase(TestCase):
+    """Unit tests of the NutritionReference model."""
+
+    def setUp(self):
+        self.reference = NutritionReference.objects.create(
+            name="Flour",
+            normalised_name="flour",
+            calories=364,
+            protein=10.3,
+            fat=1,
+            carbohydrate=76.3,
+        )
+
+    def test_valid_reference(self):
+        self.reference.full_clean()
+
+    def test_density_and_item_weight_can_be_blank(self):
+        self.assertIsNone(self.reference.grams_per_ml)
+        self.assertIsNone(self.reference.grams_per_item)
+
+    def test_normalised_name_must_be_unique(self):
+        duplicate = NutritionReference(
+            name="FLOUR",
+            normalised_name="flour",
+            calories=0,
+            protein=0,
+            fat=0,
+            carbohydrate=0,
+        )
+        with self.assertRaises(ValidationError):
+            duplicate.full_clean()
+
+    def test_str_returns_name(self):
+        self.assertEqual(str(self.reference), "Flour")
@@ -128,6 +128,25 @@ class RecipeModelTestCase(TestCase):
         self.recipe.time = 73
         self.assertEqual(self.recipe.get_time(), "1.2 hrs")
 
+    def test_default_servings_is_four(self):
+        self.assertEqual(self.recipe.servings, 4)
+
+    def test_servings_cannot_be_zero(self):
+        self.recipe.servings = 0
+        self._assert_recipe_is_invalid()
+
+    def test_nutrition_per_serving_is_none_until_computed(self):
+        self.assertTrue(self.recipe.nutrition_stale)
+        self.assertIsNone(self.recipe.get_nutrition_per_serving())
+
+    def test_nutrition_per_serving_divides_totals(self):
+        self.recipe.calories, self.recipe.protein = 1000, 42
+        self.recipe.fat, self.recipe.carbohydrate = 10, 0
+        self.assertEqual(
+            self.recipe.get_nutrition_per_serving(),
+            {"calories": 250, "protein": 10, "fat": 2, "carbohydrate": 0},
+        )
+
     def test_created_at_is_set(self):
         self.assertIsNotNone(self.recipe.created_at)
 
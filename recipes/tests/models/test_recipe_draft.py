@@ -0,0 +1,48 @@
+"""Unit tests for the RecipeDraft model."""
+
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+from recipes.models import Recipe, RecipeDraft, User
+
+
+class RecipeDraftModelTestCase(TestCase):
+    """Unit tests for the RecipeDraft model."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.author = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=self.author, title="Pancakes")
+
+    def _draft(self, recipe=None):
+        return RecipeDraft.objects.create(
+            author=self.author, recipe=recipe, data=b"", expires_at=timezone.now()
+        )
+
+    def test_one_draft_of_a_new_recipe_per_user(self):
+        self._draft()
+        with self.assertRaises(IntegrityError):
+            self._draft()
+
+    def test_one_draft_per_user_and_recipe(self):
+        self._draft(self.recipe)
+        with self.assertRaises(IntegrityError):
+            self._draft(self.recipe)
+
+    def test_drafts_of_new_and_existing_recipes_coexist(self):
+        self._draft()
+        self._draft(self.recipe)
+        self.assertEqual(self.author.recipe_drafts.count(), 2)
+
+    def test_draft_is_deleted_with_its_recipe(self):
+        self._draft(self.recipe)
+        self.recipe.delete()
+        self.assertFalse(RecipeDraft.objects.exists())
+
+    def test_str(self):
+        self.assertEqual(str(self._draft()), f"Draft of a new recipe by {self.author}")
+        self.assertEqual(
+            str(self._draft(self.recipe)),
+            f"Draft of recipe {self.recipe.pk} by {self.author}",
+        )
@@ -0,0 +1,35 @@
+"""Unit tests for the RecipeRevision model."""
+
+from django.db import IntegrityError
+from django.test import TestCase
+from recipes.models import Recipe, RecipeRevision, User
+
+
+class RecipeRevisionModelTestCase(TestCase):
+    """Unit tests for the RecipeRevision model."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        author = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=author, title="Pancakes")
+
+    def _revision(self, number):
+        return RecipeRevision.objects.create(
+            recipe=self.recipe, number=number, data=b""
+        )
+
+    def test_revision_numbers_are_unique_per_recipe(self):
+        self._revision(1)
+        with self.assertRaises(IntegrityError):
+            self._revision(1)
+
+    def test_revisions_are_deleted_with_their_recipe(self):
+        self._revision(1)
+        self.recipe.delete()
+        self.assertFalse(RecipeRevision.objects.exists())
+
+    def test_string_names_the_recipe(self):
+        self.assertEqual(
+            str(self._revision(3)), f"Revision 3 of recipe {self.recipe.pk}"
+        )
@@ -0,0 +1,42 @@
+"""Test runner used by `manage.py test`."""
+
+import shutil
+import tempfile
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class RecipesTestRunner(DiscoverRunner):
+    """
+    Test runner that isolates tests from the developer's on-disk state.
+
+    The shared cache is swapped for a process-local one so that cached values
+    never leak between test runs, where primary keys are reused. Uploaded
+    media and single-flight leases live in a temporary directory.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._temporary_root = tempfile.mkdtemp(prefix="recipes-tests-")
+        self._settings_override = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                },
+                "shared": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                    "LOCATION": "recipes-tests-shared",
+                },
+            },
+            MEDIA_ROOT=f"{self._temporary_root}/media",
+            SINGLE_FLIGHT={
+                "LEASE_DIR": f"{self._temporary_root}/leases",
+                "LEASE_TIMEOUT": 10,
+            },
+        )
+        self._settings_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._settings_override.disable()
+        shutil.rmtree(self._temporary_root, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,28 @@
+"""Tests of the API tokens partner integrations authenticate with."""
+
+from django.test import TestCase
+from recipes.models import ApiToken, User
+from recipes.services import authenticate_api_token, issue_api_token
+
+
+class ApiTokenTestCase(TestCase):
+    """Tests of the API tokens partner integrations authenticate with."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+
+    def test_key_authenticates_its_user(self):
+        key = issue_api_token(self.user, name="Partner")
+        self.assertEqual(authenticate_api_token(key), self.user)
+
+    def test_only_a_digest_of_the_key_is_stored(self):
+        key = issue_api_token(self.user)
+        self.assertNotIn(key, ApiToken.objects.values_list("digest", flat=True))
+
+    def test_unknown_and_revoked_keys_are_rejected(self):
+        key = issue_api_token(self.user)
+        self.assertIsNone(authenticate_api_token("wrong"))
+        ApiToken.objects.all().delete()
+        self.assertIsNone(authenticate_api_token(key))
@@ -0,0 +1,84 @@
+"""Unit tests of the idempotency key service."""
+
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from recipes.models import IdempotencyKey, User
+from recipes.services import (
+    issue_idempotency_key,
+    replayed_location,
+    run_once,
+    sweep_idempotency_keys,
+)
+
+
+class IdempotencyTestCase(TestCase):
+    """Unit tests of the idempotency key service."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        self.calls = 0
+
+    def _action(self):
+        self.calls += 1
+        return f"/done/{self.calls}/"
+
+    def test_issued_keys_are_distinct_and_fit_the_column(self):
+        keys = {issue_idempotency_key() for _ in range(10)}
+        self.assertEqual(len(keys), 10)
+        self.assertTrue(all(len(key) <= 64 for key in keys))
+
+    def test_first_submission_runs_and_is_recorded(self):
+        self.assertEqual(run_once(self.user, "k", self._action), ("/done/1/", False))
+        self.assertEqual(replayed_location(self.user, "k"), "/done/1/")
+
+    def test_replay_returns_original_location_without_running(self):
+        run_once(self.user, "k", self._action)
+        self.assertEqual(run_once(self.user, "k", self._action), ("/done/1/", True))
+        self.assertEqual(self.calls, 1)
+
+    def test_keys_of_other_users_are_not_replayed(self):
+        other = User.objects.create_user("@janedoe", password="Password123")
+        run_once(other, "k", self._action)
+        self.assertIsNone(replayed_location(self.user, "k"))
+        self.assertEqual(run_once(self.user, "k", self._action), ("/done/2/", False))
+
+    def test_submission_without_key_always_runs(self):
+        run_once(self.user, "", self._action)
+        run_once(self.user, "", self._action)
+        self.assertEqual(self.calls, 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_failed_submission_releases_its_key(self):
+        def fail():
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            run_once(self.user, "k", fail)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(run_once(self.user, "k", self._action), ("/done/1/", False))
+
+    @override_settings(IDEMPOTENCY_KEYS={"TTL": 60})
+    def test_expired_key_is_not_replayed_and_is_reused(self):
+        run_once(self.user, "k", self._action)
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+        self.assertIsNone(replayed_location(self.user, "k"))
+        self.assertEqual(run_once(self.user, "k", self._action), ("/done/2/", False))
+        record = IdempotencyKey.objects.get()
+        self.assertGreater(record.expires_at, timezone.now() + timedelta(seconds=50))
+
+    def test_sweep_deletes_expired_keys_in_batches(self):
+        now = timezone.now()
+        IdempotencyKey.objects.bulk_create(
+            IdempotencyKey(user=self.user, key=str(index), expires_at=now)
+            for index in range(5)
+        )
+        live = IdempotencyKey.objects.create(
+            user=self.user, key="live", expires_at=now + timedelta(hours=1)
+        )
+        # Per batch: SELECT of primary keys, SAVEPOINT, DELETE, RELEASE.
+        with self.assertNumQueries(4 * 3 + 1):
+            self.assertEqual(sweep_idempotency_keys(batch_size=2, now=now), 5)
+        self.assertQuerySetEqual(IdempotencyKey.objects.all(), [live])
@@ -0,0 +1,136 @@
+"""Unit tests of the responsive image pipeline."""
+
+import base64
+import io
+from django.core.files.storage import default_storage
+from django.test import TestCase
+from PIL import Image
+from recipes.models import ImageVariant, Instruction, Job, Recipe, User
+from recipes.services import (
+    enqueue_recipe_variants,
+    generate_variants,
+    make_placeholder,
+    process_pending_jobs,
+    variants_by_source,
+)
+from recipes.tests.helpers import make_image_file
+
+
+class GenerateVariantsTestCase(TestCase):
+    """Unit tests of image variant generation."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.source = default_storage.save("recipe/images/photo.jpg", make_image_file())
+
+    def test_variants_are_created_for_each_width_and_format(self):
+        variants = generate_variants(self.source)
+        self.assertEqual(len(variants), 6)
+        self.assertEqual(
+            sorted({(variant.format, variant.width) for variant in variants}),
+            [
+                ("jpeg", 320),
+                ("jpeg", 640),
+                ("jpeg", 1280),
+                ("webp", 320),
+                ("webp", 640),
+                ("webp", 1280),
+            ],
+        )
+
+    def test_variants_keep_the_aspect_ratio(self):
+        variant = generate_variants(self.source)[0]
+        self.assertEqual(variant.height * 2, variant.width)
+
+    def test_variant_files_match_their_records(self):
+        for variant in generate_variants(self.source):
+            with default_storage.open(variant.file.name) as stored:
+                with Image.open(stored) as image:
+                    self.assertEqual(image.size, (variant.width, variant.height))
+                    self.assertEqual(image.format.lower(), variant.format)
+
+    def test_small_images_are_not_upscaled(self):
+        source = default_storage.save(
+            "recipe/images/small.jpg", make_image_file(size=(500, 400))
+        )
+        widths = {variant.width for variant in generate_variants(source)}
+        self.assertEqual(widths, {320, 500})
+
+    def test_exif_orientation_is_applied(self):
+        source = default_storage.save(
+            "recipe/images/rotated.jpg", make_image_file(orientation=6)
+        )
+        variant = generate_variants(source)[0]
+        self.assertGreater(variant.height, variant.width)
+
+    def test_metadata_is_stripped(self):
+        source = default_storage.save(
+            "recipe/images/rotated.jpg", make_image_file(orientation=6)
+        )
+        for variant in generate_variants(source):
+            with default_storage.open(variant.file.name) as stored:
+                with Image.open(stored) as image:
+                    self.assertEqual(len(image.getexif()), 0)
+
+    def test_transparent_images_are_flattened(self):
+        source = default_storage.save(
+            "recipe/images/logo.png",
+            make_image_file("logo.png", size=(400, 400), image_format="PNG"),
+        )
+        self.assertEqual(len(generate_variants(source)), 4)
+
+    def test_generating_twice_reuses_existing_variants(self):
+        generate_variants(self.source)
+        generate_variants(self.source)
+        self.assertEqual(ImageVariant.objects.filter(source=self.source).count(), 6)
+
+    def test_enqueue_recipe_variants_covers_instruction_images(self):
+        author = User.objects.get(username="@johndoe")
+        recipe = Recipe.objects.create(author=author, title="Toast", image=self.source)
+        Instruction.objects.create(
+            recipe=recipe,
+            step=1,
+            description="Toast it.",
+            image=make_image_file("step.jpg", size=(800, 600)),
+        )
+        Instruction.objects.create(recipe=recipe, step=2, description="Eat it.")
+        self.assertEqual(enqueue_recipe_variants(recipe), 2)
+        self.assertEqual(Job.objects.filter(kind="image_variants").count(), 2)
+        self.assertEqual(process_pending_jobs(), 2)
+        self.assertEqual(ImageVariant.objects.values("source").distinct().count(), 2)
+
+    def test_variants_by_source_groups_variants(self):
+        generate_variants(self.source)
+        grouped = variants_by_source([self.source, "missing.jpg", None])
+        self.assertEqual(list(grouped), [self.source])
+        self.assertEqual(len(grouped[self.source]), 6)
+
+    def test_variants_by_source_without_sources_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(variants_by_source([None, ""]), {})
+
+
+class MakePlaceholderTestCase(TestCase):
+    """Unit tests of inline image placeholders."""
+
+    def decode(self, placeholder):
+        prefix = "data:image/webp;base64,"
+        self.assertTrue(placeholder.startswith(prefix))
+        return Image.open(io.BytesIO(base64.b64decode(placeholder[len(prefix) :])))
+
+    def test_placeholder_is_tiny(self):
+        placeholder = make_placeholder(make_image_file(size=(4000, 3000)))
+        self.assertLess(len(placeholder), 1024)
+        with self.decode(placeholder) as image:
+            self.assertEqual(image.size, (24, 18))
+
+    def test_placeholder_follows_exif_orientation(self):
+        placeholder = make_placeholder(make_image_file(size=(200, 100), orientation=6))
+        with self.decode(placeholder) as image:
+            self.assertEqual(image.size, (12, 24))
+
+    def test_file_is_rewound_for_saving(self):
+        upload = make_image_file()
+        make_placeholder(upload)
+        self.assertEqual(upload.tell(), 0)
@@ -0,0 +1,98 @@
+"""Unit tests of instruction ordering."""
+
+from django.test import TestCase
+from recipes.models import Instruction, Recipe, User
+from recipes.services import (
+    STEP_GAP,
+    move_instruction,
+    rebalance_steps,
+    spaced_step,
+)
+
+
+class InstructionOrderTestCase(TestCase):
+    """Unit tests of instruction ordering."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        author = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=author, title="Pancakes")
+        self.mix, self.rest, self.fry = [
+            Instruction.objects.create(
+                recipe=self.recipe, step=spaced_step(rank), description=description
+            )
+            for rank, description in enumerate(("Mix", "Rest", "Fry"), start=1)
+        ]
+
+    def _order(self):
+        return list(
+            self.recipe.instructions.order_by("step").values_list(
+                "description", flat=True
+            )
+        )
+
+    def test_spaced_steps_are_step_gap_apart(self):
+        self.assertEqual(spaced_step(3) - spaced_step(2), STEP_GAP)
+
+    def test_move_after_another_instruction(self):
+        move_instruction(self.mix, after=self.rest)
+        self.assertEqual(self._order(), ["Rest", "Mix", "Fry"])
+        self.assertEqual(self.mix.step, (spaced_step(2) + spaced_step(3)) // 2)
+
+    def test_move_to_the_start(self):
+        move_instruction(self.fry, after=None)
+        self.assertEqual(self._order(), ["Fry", "Mix", "Rest"])
+
+    def test_move_to_the_end(self):
+        move_instruction(self.mix, after=self.fry)
+        self.assertEqual(self._order(), ["Rest", "Fry", "Mix"])
+        self.assertEqual(self.mix.step, spaced_step(3) + STEP_GAP)
+
+    def test_move_writes_one_row(self):
+        # SAVEPOINT, the moved-after key, the next key, one UPDATE, RELEASE.
+        with self.assertNumQueries(5):
+            move_instruction(self.fry, after=self.mix)
+        self.assertEqual(self._order(), ["Mix", "Fry", "Rest"])
+
+    def test_move_rebalances_when_there_is_no_room(self):
+        Instruction.objects.filter(pk=self.rest.pk).update(step=spaced_step(1) + 1)
+        move_instruction(self.fry, after=self.mix)
+        self.assertEqual(self._order(), ["Mix", "Fry", "Rest"])
+        self.assertEqual(
+            list(
+                self.recipe.instructions.order_by("step").values_list("step", flat=True)
+            ),
+            [spaced_step(1), (spaced_step(1) + spaced_step(2)) // 2, spaced_step(2)],
+        )
+
+    def test_repeated_moves_to_the_same_place_keep_the_order(self):
+        instructions = [self.mix, self.rest, self.fry]
+        for _ in range(20):
+            first, *others = instructions
+            move_instruction(others[-1], after=first)
+            instructions = [first, others[-1], *others[:-1]]
+            self.assertEqual(
+                self._order(), [instruction.description for instruction in instructions]
+            )
+
+    def test_rebalance_keeps_order(self):
+        for step, instruction in ((5, self.mix), (6, self.rest), (7, self.fry)):
+            Instruction.objects.filter(pk=instruction.pk).update(step=step)
+        self.assertEqual(rebalance_steps(self.recipe.pk), 3)
+        self.assertEqual(self._order(), ["Mix", "Rest", "Fry"])
+        self.assertEqual(
+            list(
+                self.recipe.instructions.order_by("step").values_list("step", flat=True)
+            ),
+            [spaced_step(1), spaced_step(2), spaced_step(3)],
+        )
+
+    def test_moves_do_not_affect_other_recipes(self):
+        other = Recipe.objects.create(author=self.recipe.author, title="Stew")
+        stew = Instruction.objects.create(
+            recipe=other, step=spaced_step(1) + 1, description="Chop"
+        )
+        move_instruction(self.fry, after=self.mix)
+        stew.refresh_from_db()
+        self.assertEqual(stew.step, spaced_step(1) + 1)
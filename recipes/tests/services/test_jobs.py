@@ -0,0 +1,98 @@
+"""Unit tests of the background job queue."""
+
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from recipes.models import Job
+from recipes.services import claim_jobs, enqueue, enqueue_many, run_job
+from recipes.services.jobs import JOB_HANDLERS, process_pending_jobs
+
+
+class JobQueueTestCase(TestCase):
+    """Unit tests of the background job queue."""
+
+    def setUp(self):
+        self.calls = []
+        JOB_HANDLERS["test_record"] = lambda **payload: self.calls.append(payload)
+        JOB_HANDLERS["test_fail"] = self.fail_job
+        self.addCleanup(JOB_HANDLERS.pop, "test_record")
+        self.addCleanup(JOB_HANDLERS.pop, "test_fail")
+
+    def fail_job(self, **payload):
+        raise RuntimeError("boom")
+
+    def test_enqueue_creates_pending_job(self):
+        job = enqueue("test_record", value=1)
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(job.payload, {"value": 1})
+
+    def test_enqueue_many_uses_one_query(self):
+        with self.assertNumQueries(1):
+            enqueue_many("test_record", [{"value": 1}, {"value": 2}])
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_claim_marks_jobs_running(self):
+        job = enqueue("test_record")
+        self.assertEqual(claim_jobs(10), [job.pk])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.RUNNING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.locked_until)
+
+    def test_claimed_jobs_are_not_claimed_again(self):
+        enqueue("test_record")
+        claim_jobs(10)
+        self.assertEqual(claim_jobs(10), [])
+
+    def test_claim_respects_limit(self):
+        enqueue_many("test_record", [{}, {}, {}])
+        self.assertEqual(len(claim_jobs(2)), 2)
+
+    def test_jobs_that_are_not_due_are_not_claimed(self):
+        job = enqueue("test_record")
+        Job.objects.filter(pk=job.pk).update(
+            run_after=timezone.now() + timedelta(minutes=5)
+        )
+        self.assertEqual(claim_jobs(10), [])
+
+    def test_jobs_with_expired_locks_are_claimed_again(self):
+        job = enqueue("test_record")
+        claim_jobs(10)
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(claim_jobs(10), [job.pk])
+
+    def test_run_job_calls_handler_with_payload(self):
+        job = enqueue("test_record", value=1)
+        claim_jobs(10)
+        self.assertEqual(run_job(job.pk), Job.Status.DONE)
+        self.assertEqual(self.calls, [{"value": 1}])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DONE)
+
+    def test_failed_job_is_retried_later(self):
+        job = enqueue("test_fail")
+        claim_jobs(10)
+        self.assertEqual(run_job(job.pk), Job.Status.PENDING)
+        job.refresh_from_db()
+        self.assertIn("boom", job.last_error)
+        self.assertGreater(job.run_after, timezone.now())
+
+    @override_settings(JOB_QUEUE={"MAX_ATTEMPTS": 1})
+    def test_job_fails_after_max_attempts(self):
+        job = enqueue("test_fail")
+        claim_jobs(10)
+        self.assertEqual(run_job(job.pk), Job.Status.FAILED)
+
+    def test_unknown_job_kind_fails(self):
+        job = enqueue("no_such_kind")
+        claim_jobs(10)
+        self.assertEqual(run_job(job.pk), Job.Status.PENDING)
+        job.refresh_from_db()
+        self.assertIn("KeyError", job.last_error)
+
+    def test_process_pending_jobs(self):
+        enqueue_many("test_record", [{"value": 1}, {"value": 2}])
+        self.assertEqual(process_pending_jobs(), 2)
+        self.assertEqual(self.calls, [{"value": 1}, {"value": 2}])
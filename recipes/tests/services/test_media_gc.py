@@ -0,0 +1,133 @@
+"""Unit tests of the media garbage collector."""
+
+import os
+import shutil
+import tempfile
+import time
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from recipes.models import ImageVariant, Instruction, MediaBlob, Recipe, User
+from recipes.services import collect_media_garbage
+
+
+class CollectMediaGarbageTestCase(TestCase):
+    """Unit tests of the media garbage collector."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.author = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=self.author, title="Pancakes")
+
+    def _save(self, name, content):
+        return default_storage.save(name, ContentFile(content))
+
+    def _collect(self, **kwargs):
+        kwargs.setdefault("grace_period", 0)
+        return collect_media_garbage(**kwargs)
+
+    def test_referenced_files_are_kept(self):
+        self.recipe.image = self._save("recipe/images/a.jpg", b"recipe")
+        self.recipe.save()
+        report = self._collect()
+        self.assertEqual(report.files_removed, 0)
+        self.assertTrue(default_storage.exists(self.recipe.image.name))
+
+    def test_unreferenced_files_are_removed(self):
+        name = self._save("recipe/images/a.jpg", b"orphan")
+        report = self._collect()
+        self.assertEqual(report.files_scanned, 1)
+        self.assertEqual(report.files_removed, 1)
+        self.assertEqual(report.bytes_reclaimed, len(b"orphan"))
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+
+    def test_recent_files_are_kept(self):
+        name = self._save("recipe/images/a.jpg", b"uploading")
+        report = collect_media_garbage(grace_period=60)
+        self.assertEqual(report.files_removed, 0)
+        self.assertTrue(default_storage.exists(name))
+
+    def test_old_files_are_removed_after_grace_period(self):
+        name = self._save("recipe/images/a.jpg", b"orphan")
+        report = collect_media_garbage(grace_period=60, now=time.time() + 120)
+        self.assertEqual(report.files_removed, 1)
+        self.assertFalse(default_storage.exists(name))
+
+    def test_instructions_without_recipe_are_removed_with_their_images(self):
+        image = self._save("recipe/instructions/a.jpg", b"step")
+        Instruction.objects.create(recipe=None, step=1, description="Mix", image=image)
+        Instruction.objects.create(recipe=self.recipe, step=1, description="Mix")
+        report = self._collect(batch_size=1)
+        self.assertEqual(report.instructions_removed, 1)
+        self.assertEqual(report.files_removed, 1)
+        self.assertEqual(Instruction.objects.count(), 1)
+        self.assertFalse(default_storage.exists(image))
+
+    def test_variants_of_unused_images_are_removed(self):
+        variant = self._save("recipe/variants/a-320w.jpeg", b"variant")
+        ImageVariant.objects.create(
+            source="recipe/images/gone.jpg",
+            format=ImageVariant.Format.JPEG,
+            width=320,
+            height=160,
+            file=variant,
+        )
+        report = self._collect()
+        self.assertEqual(report.variants_removed, 1)
+        self.assertEqual(report.files_removed, 1)
+        self.assertFalse(ImageVariant.objects.exists())
+
+    def test_variants_of_used_images_are_kept(self):
+        self.recipe.image = self._save("recipe/images/a.jpg", b"recipe")
+        self.recipe.save()
+        ImageVariant.objects.create(
+            source=self.recipe.image.name,
+            format=ImageVariant.Format.JPEG,
+            width=320,
+            height=160,
+            file=self._save("recipe/variants/a-320w.jpeg", b"variant"),
+        )
+        report = self._collect()
+        self.assertEqual(report.variants_removed, 0)
+        self.assertEqual(report.files_removed, 0)
+
+    def test_dry_run_changes_nothing(self):
+        orphan = self._save("recipe/images/a.jpg", b"orphan")
+        image = self._save("recipe/instructions/b.jpg", b"step")
+        Instruction.objects.create(recipe=None, step=1, description="Mix", image=image)
+        removed = []
+        report = self._collect(
+            dry_run=True, on_remove=lambda name, size: removed.append(name)
+        )
+        self.assertEqual(report.instructions_removed, 1)
+        self.assertEqual(report.files_removed, 2)
+        self.assertEqual(report.bytes_reclaimed, len(b"orphan") + len(b"step"))
+        self.assertCountEqual(removed, [orphan, image])
+        self.assertTrue(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(image))
+        self.assertEqual(Instruction.objects.count(), 1)
+
+    def test_blob_reference_counts_are_corrected(self):
+        name = self._save("recipe/images/a.jpg", b"shared")
+        self._save("recipe/images/b.jpg", b"shared")
+        self._save("recipe/images/c.jpg", b"shared")
+        self.recipe.image = name
+        self.recipe.save()
+        report = self._collect()
+        self.assertEqual(report.blobs_reconciled, 1)
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 1)
+
+    def test_files_are_processed_in_batches(self):
+        for index in range(5):
+            self._save(f"recipe/images/{index}.jpg", f"orphan {index}".encode())
+        with self.assertNumQueries(14):
+            report = self._collect(batch_size=2)
+        self.assertEqual(report.files_removed, 5)
+        self.assertEqual(os.listdir(default_storage.path("blobs/tmp")), [])
@@ -0,0 +1,161 @@
+"""Unit tests of the sharded media migration."""
+
+from unittest import mock
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase
+from recipes.models import (
+    ImageVariant,
+    Instruction,
+    MediaBlob,
+    Recipe,
+    RecipeSummary,
+    User,
+)
+from recipes.services import refresh_recipe_summaries, shard_media_files
+from recipes.tests.helpers import write_legacy_file
+
+
+class ShardMediaFilesTestCase(TestCase):
+    """Unit tests of the sharded media migration."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.author = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(
+            author=self.author,
+            title="Pancakes",
+            image=write_legacy_file("recipe/images/legacy-a.jpg", b"pancakes"),
+        )
+
+    def test_rows_are_moved_to_blobs(self):
+        moved, skipped = shard_media_files()
+        self.recipe.refresh_from_db()
+        self.assertEqual((moved, skipped), (1, 0))
+        self.assertTrue(default_storage.is_blob(self.recipe.image.name))
+        with default_storage.open(self.recipe.image.name) as moved_file:
+            self.assertEqual(moved_file.read(), b"pancakes")
+        self.assertEqual(
+            MediaBlob.objects.get(name=self.recipe.image.name).ref_count, 1
+        )
+
+    def test_old_files_are_kept_for_gc_media(self):
+        shard_media_files()
+        self.assertTrue(default_storage.exists("recipe/images/legacy-a.jpg"))
+
+    def test_rows_sharing_a_file_count_as_separate_references(self):
+        Instruction.objects.create(
+            recipe=self.recipe,
+            step=1,
+            description="Flip",
+            image=write_legacy_file("recipe/instructions/legacy-b.jpg", b"step"),
+        )
+        Instruction.objects.create(
+            recipe=self.recipe,
+            step=2,
+            description="Serve",
+            image="recipe/instructions/legacy-b.jpg",
+        )
+        moved, _ = shard_media_files(batch_size=1)
+        self.assertEqual(moved, 3)
+        names = set(Instruction.objects.values_list("image", flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertEqual(MediaBlob.objects.get(name=names.pop()).ref_count, 2)
+
+    def test_migration_can_resume(self):
+        Recipe.objects.create(
+            author=self.author,
+            title="Waffles",
+            image=write_legacy_file("recipe/images/legacy-c.jpg", b"waffles"),
+        )
+        batches = []
+
+        def stop_after_first_batch(model, field_name, count):
+            batches.append(count)
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            shard_media_files(batch_size=1, on_batch=stop_after_first_batch)
+        moved, _ = shard_media_files(batch_size=1)
+        self.assertEqual(batches, [1])
+        self.assertEqual(moved, 1)
+        self.assertFalse(
+            Recipe.objects.filter(image__startswith="recipe/images/").exists()
+        )
+
+    def test_sharded_rows_are_left_alone(self):
+        shard_media_files()
+        self.assertEqual(shard_media_files(), (0, 0))
+
+    def test_image_changed_during_copy_is_kept(self):
+        new_name = default_storage.save("upload.jpg", ContentFile(b"new"))
+        original_open = default_storage.open
+
+        def upload_while_copying(name, *args, **kwargs):
+            Recipe.objects.filter(pk=self.recipe.pk).update(image=new_name)
+            return original_open(name, *args, **kwargs)
+
+        with mock.patch.object(default_storage, "open", upload_while_copying):
+            moved, skipped = shard_media_files()
+        self.recipe.refresh_from_db()
+        self.assertEqual((moved, skipped), (0, 1))
+        self.assertEqual(self.recipe.image.name, new_name)
+        self.assertEqual(MediaBlob.objects.get().name, new_name)
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+
+    def test_missing_files_are_skipped(self):
+        Recipe.objects.create(
+            author=self.author, title="Waffles", image="recipe/images/missing.jpg"
+        )
+        moved, skipped = shard_media_files()
+        self.assertEqual((moved, skipped), (1, 1))
+        self.assertTrue(
+            Recipe.objects.filter(image="recipe/images/missing.jpg").exists()
+        )
+
+    def test_variant_sources_follow_their_image(self):
+        variant = ImageVariant.objects.create(
+            source=self.recipe.image.name,
+            format=ImageVariant.Format.JPEG,
+            width=320,
+            height=160,
+            file=write_legacy_file("recipe/variants/legacy-a-320w.jpeg", b"small"),
+        )
+        shard_media_files()
+        self.recipe.refresh_from_db()
+        variant.refresh_from_db()
+        self.assertEqual(variant.source, self.recipe.image.name)
+        self.assertTrue(default_storage.is_blob(variant.file.name))
+
+    def test_summary_thumbnails_follow_their_variant(self):
+        ImageVariant.objects.create(
+            source=self.recipe.image.name,
+            format=ImageVariant.Format.JPEG,
+            width=320,
+            height=160,
+            file=write_legacy_file("recipe/variants/legacy-a-320w.jpeg", b"small"),
+        )
+        refresh_recipe_summaries([self.recipe.pk])
+        shard_media_files()
+        summary = RecipeSummary.objects.get(recipe=self.recipe)
+        self.assertEqual(summary.thumbnail, ImageVariant.objects.get().file.name)
+        self.assertTrue(default_storage.is_blob(summary.thumbnail))
+
+    def test_duplicate_originals_keep_one_set_of_variants(self):
+        duplicate = Recipe.objects.create(
+            author=self.author,
+            title="Pancakes again",
+            image=write_legacy_file("recipe/images/legacy-d.jpg", b"pancakes"),
+        )
+        for source in (self.recipe.image.name, duplicate.image.name):
+            ImageVariant.objects.create(
+                source=source,
+                format=ImageVariant.Format.JPEG,
+                width=320,
+                height=160,
+                file=write_legacy_file("recipe/variants/small.jpeg", b"small"),
+            )
+        shard_media_files()
+        duplicate.refresh_from_db()
+        self.assertEqual(ImageVariant.objects.get().source, duplicate.image.name)
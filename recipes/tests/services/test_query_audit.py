@@ -0,0 +1,70 @@
+"""Tests of the query plan audit of views and model orderings."""
+
+from django.test import TestCase
+from recipes.models import Recipe, User
+from recipes.services import (
+    audit_orderings,
+    audit_statements,
+    capture_statements,
+    explain_statement,
+    summarise_audit,
+)
+
+
+class QueryAuditTestCase(TestCase):
+    """Tests of the query plan audit of views and model orderings."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def test_statements_are_captured_with_placeholders(self):
+        with capture_statements() as statements:
+            list(Recipe.objects.filter(title="Toast"))
+        [(sql, params)] = statements
+        self.assertIn("%s", sql)
+        self.assertEqual(params, ("Toast",))
+
+    def test_full_scan_suggests_the_filtered_columns(self):
+        queryset = Recipe.objects.filter(title="Toast").order_by()
+        sql, params = queryset.query.sql_with_params()
+        report = explain_statement(sql, params)
+        self.assertEqual(report["full_scans"], ["recipes_recipe"])
+        self.assertEqual(
+            report["index_candidates"],
+            [{"table": "recipes_recipe", "columns": ["title"]}],
+        )
+
+    def test_indexed_lookup_has_no_candidates(self):
+        sql, params = Recipe.objects.filter(pk=1).query.sql_with_params()
+        report = explain_statement(sql, params)
+        self.assertEqual(report["full_scans"], [])
+        self.assertEqual(report["temp_btrees"], [])
+        self.assertEqual(report["index_candidates"], [])
+
+    def test_sort_suggests_an_index_in_the_order_of_the_rows(self):
+        queryset = User.objects.filter(is_active=True).order_by("-date_joined")
+        report = explain_statement(*queryset.query.sql_with_params())
+        self.assertIn("ORDER BY", report["temp_btrees"])
+        self.assertEqual(
+            report["index_candidates"],
+            [{"table": "recipes_user", "columns": ["is_active", "-date_joined"]}],
+        )
+
+    def test_repeated_statements_are_explained_once(self):
+        query = Recipe.objects.filter(title="Toast").query
+        audited = audit_statements([query.sql_with_params()] * 3)
+        self.assertEqual(len(audited), 1)
+        self.assertEqual(audited[0]["count"], 3)
+
+    def test_orderings_cover_every_ordered_model(self):
+        report = {entry["model"]: entry for entry in audit_orderings()}
+        self.assertEqual(report["recipes.Recipe"]["ordering"], ["-created_at"])
+        self.assertEqual(
+            report["recipes.User"]["ordering"], ["last_name", "first_name"]
+        )
+        self.assertIn("recipes.Ingredient", report)
+
+    def test_orderings_of_recipes_and_users_are_indexed(self):
+        summary = summarise_audit(audit_orderings())
+        tables = {candidate["table"] for candidate in summary["index_candidates"]}
+        self.assertNotIn("recipes_recipe", tables)
+        self.assertNotIn("recipes_user", tables)
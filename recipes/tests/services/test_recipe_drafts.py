@@ -0,0 +1,101 @@
+"""Unit tests of recipe drafts."""
+
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from recipes.models import Recipe, RecipeDraft, User
+from recipes.services import discard_draft, load_draft, save_draft
+
+
+class RecipeDraftsTestCase(TestCase):
+    """Unit tests of recipe drafts."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.author = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=self.author, title="Pancakes")
+
+    def test_no_draft_loads_empty(self):
+        self.assertEqual(load_draft(self.author), {})
+
+    def test_patches_are_merged(self):
+        save_draft(self.author, {"title": "Sou", "time": "20"})
+        save_draft(self.author, {"title": "Soup", "ingredients-0-name": "Leek"})
+        self.assertEqual(
+            load_draft(self.author),
+            {"title": "Soup", "time": "20", "ingredients-0-name": "Leek"},
+        )
+
+    def test_null_removes_a_field(self):
+        save_draft(self.author, {"title": "Soup", "instructions-0-DELETE": "on"})
+        save_draft(self.author, {"instructions-0-DELETE": None})
+        self.assertEqual(load_draft(self.author), {"title": "Soup"})
+
+    def test_drafts_are_kept_per_recipe(self):
+        save_draft(self.author, {"title": "Soup"})
+        save_draft(self.author, {"title": "Crêpes"}, self.recipe)
+        self.assertEqual(load_draft(self.author), {"title": "Soup"})
+        self.assertEqual(load_draft(self.author, self.recipe), {"title": "Crêpes"})
+        self.assertEqual(RecipeDraft.objects.count(), 2)
+
+    def test_concurrent_first_saves_are_merged(self):
+        save_draft(self.author, {"title": "Soup"})
+        drafts = RecipeDraft.objects.filter
+        # The first lookup misses the draft another request just created.
+        lookups = [RecipeDraft.objects.none()]
+        with mock.patch(
+            "recipes.services.recipe_drafts._drafts",
+            lambda author, recipe: (
+                lookups.pop() if lookups else drafts(author=author, recipe=recipe)
+            ),
+        ):
+            save_draft(self.author, {"time": "20"})
+        self.assertEqual(load_draft(self.author), {"title": "Soup", "time": "20"})
+        self.assertEqual(RecipeDraft.objects.count(), 1)
+
+    def test_draft_is_stored_compressed(self):
+        draft = save_draft(self.author, {"description": "stir " * 1000})
+        self.assertLess(len(draft.data), 200)
+
+    def test_saving_writes_one_row(self):
+        save_draft(self.author, {"title": "Sou"})
+        # SAVEPOINT, SELECT, UPDATE, RELEASE SAVEPOINT.
+        with self.assertNumQueries(4):
+            save_draft(self.author, {"title": "Soup"})
+
+    @override_settings(RECIPE_DRAFTS={"TTL": 60})
+    def test_saving_extends_the_lifetime(self):
+        draft = save_draft(self.author, {"title": "Soup"})
+        self.assertAlmostEqual(
+            draft.expires_at,
+            timezone.now() + timedelta(seconds=60),
+            delta=timedelta(seconds=5),
+        )
+
+    def test_expired_draft_is_discarded(self):
+        save_draft(self.author, {"title": "Soup"})
+        RecipeDraft.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(load_draft(self.author), {})
+        self.assertFalse(RecipeDraft.objects.exists())
+
+    def test_patch_to_expired_draft_starts_afresh(self):
+        save_draft(self.author, {"title": "Soup"})
+        RecipeDraft.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        save_draft(self.author, {"time": "20"})
+        self.assertEqual(load_draft(self.author), {"time": "20"})
+
+    @override_settings(RECIPE_DRAFTS={"MAX_BYTES": 100})
+    def test_oversized_draft_is_rejected(self):
+        save_draft(self.author, {"title": "Soup"})
+        with self.assertRaises(ValueError):
+            save_draft(self.author, {"description": "".join(map(str, range(500)))})
+        self.assertEqual(load_draft(self.author), {"title": "Soup"})
+
+    def test_discard_draft(self):
+        save_draft(self.author, {"title": "Soup"})
+        save_draft(self.author, {"title": "Crêpes"}, self.recipe)
+        discard_draft(self.author)
+        self.assertEqual(load_draft(self.author), {})
+        self.assertEqual(load_draft(self.author, self.recipe), {"title": "Crêpes"})
@@ -0,0 +1,123 @@
+"""Unit tests of recipe forking."""
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from recipes.models import Ingredient, Instruction, MediaBlob, Recipe, User
+from recipes.services import fork_recipe, spaced_step
+
+
+class ForkRecipeTestCase(TestCase):
+    """Unit tests of recipe forking."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.author = User.objects.get(username="@johndoe")
+        self.forker = User.objects.create_user("@janedoe", password="Password123")
+        self.recipe = Recipe.objects.create(
+            author=self.author,
+            title="Pancakes",
+            description="Fluffy",
+            difficulty=Recipe.Difficulty.MEDIUM,
+            time=20,
+        )
+
+    def _add_children(self, recipe, count, images=("",)):
+        Ingredient.objects.bulk_create(
+            Ingredient(recipe=recipe, name=f"Ingredient {i}", quantity=i, unit="g")
+            for i in range(count)
+        )
+        Instruction.objects.bulk_create(
+            Instruction(
+                recipe=recipe,
+                step=spaced_step(i + 1),
+                description=f"Do {i}",
+                image=images[i % len(images)],
+            )
+            for i in range(count)
+        )
+
+    def _save_images(self, count):
+        return [
+            default_storage.save(f"{i}.jpg", ContentFile(f"image {i}".encode()))
+            for i in range(count)
+        ]
+
+    def _fork_queries(self, recipe):
+        with CaptureQueriesContext(connection) as queries:
+            fork_recipe(recipe, self.forker)
+        return len(queries)
+
+    def test_fork_copies_the_recipe_for_its_new_author(self):
+        fork = fork_recipe(self.recipe, self.forker)
+        fork.refresh_from_db()
+        self.assertNotEqual(fork.pk, self.recipe.pk)
+        self.assertEqual(fork.author, self.forker)
+        self.assertEqual(
+            (fork.title, fork.description, fork.difficulty, fork.time),
+            ("Pancakes", "Fluffy", Recipe.Difficulty.MEDIUM, 20),
+        )
+        self.assertGreaterEqual(fork.created_at, self.recipe.created_at)
+
+    def test_fork_copies_children_in_order(self):
+        self._add_children(self.recipe, 3)
+        fork = fork_recipe(self.recipe, self.forker)
+        self.assertEqual(
+            list(fork.ingredients.values_list("name", "quantity", "unit")),
+            list(self.recipe.ingredients.values_list("name", "quantity", "unit")),
+        )
+        self.assertEqual(
+            list(fork.instructions.order_by("step").values_list("step", "description")),
+            list(
+                self.recipe.instructions.order_by("step").values_list(
+                    "step", "description"
+                )
+            ),
+        )
+        self.assertEqual(self.recipe.ingredients.count(), 3)
+
+    def test_statements_do_not_depend_on_the_size_of_the_recipe(self):
+        cover, *images = self._save_images(21)
+        small = Recipe.objects.create(author=self.author, title="Toast", image=cover)
+        self._add_children(small, 1, images[:1])
+        self.recipe.image = cover
+        self.recipe.save()
+        self._add_children(self.recipe, 200, images)
+        self.assertEqual(self._fork_queries(self.recipe), self._fork_queries(small))
+        self.assertEqual(Ingredient.objects.count(), 2 * 201)
+        # One reference from saving, then one per use in either fork.
+        self.assertEqual(MediaBlob.objects.get(name=cover).ref_count, 3)
+        self.assertEqual(MediaBlob.objects.get(name=images[0]).ref_count, 12)
+
+    def test_children_are_not_loaded(self):
+        self._add_children(self.recipe, 3)
+        with CaptureQueriesContext(connection) as queries:
+            fork_recipe(self.recipe, self.forker)
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        for column in ['"recipes_ingredient"."name"', '"recipes_instruction"."step"']:
+            self.assertFalse([sql for sql in selects if column in sql])
+
+    def test_images_are_shared_by_reference(self):
+        self.recipe.image = default_storage.save("a.jpg", ContentFile(b"cover"))
+        self.recipe.save()
+        Instruction.objects.create(
+            recipe=self.recipe,
+            step=spaced_step(1),
+            description="Flip",
+            image=default_storage.save("b.jpg", ContentFile(b"step")),
+        )
+        fork = fork_recipe(self.recipe, self.forker)
+        self.assertEqual(fork.image.name, self.recipe.image.name)
+        self.assertEqual(
+            fork.instructions.get().image.name,
+            self.recipe.instructions.get().image.name,
+        )
+        self.assertEqual(
+            list(MediaBlob.objects.values_list("ref_count", flat=True)), [2, 2]
+        )
+
+        default_storage.delete(self.recipe.image.name)
+        self.assertTrue(default_storage.exists(fork.image.name))
@@ -0,0 +1,142 @@
+"""Tests of computing the nutrition of recipes."""
+
+from unittest import mock
+from django.test import TestCase
+from recipes.models import Ingredient, NutritionReference, Recipe, User
+from recipes.services import (
+    ChildChanges,
+    compute_nutrition,
+    get_recipe_detail,
+    load_nutrition_references,
+    reference_names,
+    refresh_stale_nutrition,
+    update_recipe,
+)
+
+
+class RecipeNutritionTestCase(TestCase):
+    """Tests of computing the nutrition of recipes."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        load_nutrition_references(
+            [
+                {
+                    "name": "Flour",
+                    "calories": "364",
+                    "protein": "10",
+                    "fat": "1",
+                    "carbohydrate": "76",
+                    "grams_per_ml": "0.5",
+                },
+                {
+                    "name": "Egg",
+                    "calories": "143",
+                    "protein": "12.6",
+                    "fat": "9.5",
+                    "carbohydrate": "0.7",
+                    "grams_per_item": "50",
+                },
+            ]
+        )
+        author = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=author, title="Pancakes", servings=2)
+        for name, quantity, unit in [
+            ("flour", 200, "g"),
+            ("Eggs", 2, ""),
+            ("Flour ", 100, "ml"),
+            ("Saffron", 1, "g"),
+        ]:
+            Ingredient.objects.create(
+                recipe=self.recipe, name=name, quantity=quantity, unit=unit
+            )
+
+    def test_references_are_loaded_by_normalised_name(self):
+        self.assertEqual(
+            list(NutritionReference.objects.values_list("normalised_name", flat=True)),
+            ["flour", "egg"],
+        )
+
+    def test_loading_updates_existing_references(self):
+        load_nutrition_references(
+            [
+                {
+                    "name": "FLOUR",
+                    "calories": "1",
+                    "protein": "0",
+                    "fat": "0",
+                    "carbohydrate": "0",
+                }
+            ]
+        )
+        flour = NutritionReference.objects.get(normalised_name="flour")
+        self.assertEqual((flour.name, flour.calories), ("FLOUR", 1))
+        self.assertEqual(NutritionReference.objects.count(), 2)
+
+    def test_loading_rejects_invalid_rows(self):
+        with self.assertRaisesMessage(ValueError, "Line 2"):
+            load_nutrition_references([{"name": "Salt", "calories": "lots"}])
+
+    def test_loading_marks_recipes_stale(self):
+        Recipe.objects.update(nutrition_stale=False)
+        load_nutrition_references([])
+        self.assertTrue(Recipe.objects.get(pk=self.recipe.pk).nutrition_stale)
+
+    def test_reference_names_include_singular_forms(self):
+        self.assertEqual(
+            reference_names(" Tomatoes"), ["tomatoes", "tomato", "tomatoe"]
+        )
+
+    def test_totals_are_computed_in_two_queries(self):
+        with self.assertNumQueries(2):
+            totals = compute_nutrition([self.recipe.pk])
+        # 250 g of flour, 50 g of it by volume, and two eggs of 50 g.
+        self.assertAlmostEqual(totals[self.recipe.pk]["calories"], 910 + 143)
+        self.assertAlmostEqual(totals[self.recipe.pk]["protein"], 25 + 12.6)
+
+    def test_stale_recipes_are_refreshed(self):
+        self.assertEqual(refresh_stale_nutrition(), 1)
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        self.assertFalse(recipe.nutrition_stale)
+        self.assertEqual(recipe.get_nutrition_per_serving()["calories"], 526)
+        self.assertEqual(refresh_stale_nutrition(), 0)
+
+    def test_refresh_drops_cached_detail(self):
+        self.assertIsNone(get_recipe_detail(self.recipe.pk).calories)
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_stale_nutrition()
+        self.assertIsNotNone(get_recipe_detail(self.recipe.pk).calories)
+
+    def test_recipe_edited_meanwhile_stays_stale(self):
+        def edit_then_compute(recipe_ids):
+            Recipe.objects.filter(pk=self.recipe.pk).update(version=2)
+            return compute_nutrition(recipe_ids)
+
+        with mock.patch(
+            "recipes.services.recipe_nutrition.compute_nutrition",
+            side_effect=edit_then_compute,
+        ):
+            self.assertEqual(refresh_stale_nutrition(), 0)
+        self.assertTrue(Recipe.objects.get(pk=self.recipe.pk).nutrition_stale)
+
+    def test_editing_ingredients_marks_recipe_stale(self):
+        refresh_stale_nutrition()
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        egg = recipe.ingredients.get(name="Eggs")
+        egg.quantity = 3
+        update_recipe(
+            recipe,
+            ChildChanges([], [(egg, ["quantity"])], []),
+            ChildChanges([], [], []),
+        )
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        self.assertTrue(recipe.nutrition_stale)
+        self.assertIsNotNone(recipe.calories)
+
+    def test_editing_only_the_recipe_keeps_nutrition(self):
+        refresh_stale_nutrition()
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        recipe.title = "Crepes"
+        update_recipe(recipe, ChildChanges([], [], []), ChildChanges([], [], []))
+        self.assertFalse(Recipe.objects.get(pk=self.recipe.pk).nutrition_stale)
@@ -0,0 +1,152 @@
+"""Unit tests of recipe revisions."""
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from recipes.models import Ingredient, Instruction, Recipe, RecipeRevision, User
+from recipes.services import (
+    ChildChanges,
+    create_recipe,
+    head_revision,
+    load_recipe_state,
+    recipe_version,
+    record_revision,
+    restore_revision,
+    spaced_step,
+    update_recipe,
+)
+
+
+@override_settings(RECIPE_REVISIONS={"SNAPSHOT_EVERY": 3})
+class RecipeRevisionsTestCase(TestCase):
+    """Unit tests of recipe revisions."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.author = User.objects.get(username="@johndoe")
+        self.recipe = create_recipe(
+            Recipe(author=self.author, title="Pancakes", time=20),
+            [Ingredient(name="Flour", quantity=200, unit="g")],
+            [Instruction(step=spaced_step(1), description="Mix")],
+        )
+
+    def _rename(self, title):
+        self.recipe.title = title
+        update_recipe(self.recipe, ChildChanges([], [], []), ChildChanges([], [], []))
+
+    def _numbers(self, **filters):
+        return list(
+            self.recipe.revisions.filter(**filters).values_list("number", flat=True)
+        )
+
+    def test_new_recipe_starts_with_a_snapshot(self):
+        self.assertEqual(self._numbers(is_snapshot=True), [1])
+        version = recipe_version(self.recipe, 1)
+        self.assertEqual(version.recipe.title, "Pancakes")
+        self.assertEqual([str(i) for i in version.ingredients], ["200 g Flour"])
+
+    def test_edits_store_deltas_with_periodic_snapshots(self):
+        for index in range(6):
+            self._rename(f"Pancakes {index}")
+        self.assertEqual(self._numbers(), [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(self._numbers(is_snapshot=True), [1, 4, 7])
+        delta = self.recipe.revisions.get(number=2)
+        snapshot = self.recipe.revisions.get(number=1)
+        self.assertLess(len(delta.data), len(snapshot.data))
+
+    def test_any_version_is_rebuilt_from_a_bounded_number_of_rows(self):
+        for index in range(8):
+            self._rename(f"Pancakes {index}")
+        for number in range(1, 10):
+            with self.assertNumQueries(1):
+                version = recipe_version(self.recipe, number)
+            expected = "Pancakes" if number == 1 else f"Pancakes {number - 2}"
+            self.assertEqual(version.recipe.title, expected)
+
+    def test_child_changes_are_versioned(self):
+        flour = self.recipe.ingredients.get()
+        flour.quantity = 250
+        update_recipe(
+            self.recipe,
+            ChildChanges(
+                created=[Ingredient(name="Milk")],
+                updated=[(flour, ["quantity"])],
+                deleted=[],
+            ),
+            ChildChanges([], [], list(self.recipe.instructions.all())),
+        )
+        version = recipe_version(self.recipe, 2)
+        self.assertEqual([str(i) for i in version.ingredients], ["250 g Flour", "Milk"])
+        self.assertEqual(version.instructions, [])
+        self.assertEqual(
+            [i.description for i in recipe_version(self.recipe, 1).instructions],
+            ["Mix"],
+        )
+
+    def test_unchanged_state_records_nothing(self):
+        head = head_revision(self.recipe.pk)
+        self.assertEqual(record_revision(self.recipe.pk, head), head)
+        self.assertEqual(self._numbers(), [1])
+
+    def test_history_starts_from_the_state_before_the_first_edit(self):
+        legacy = Recipe.objects.create(author=self.author, title="Toast")
+        self.assertIsNone(head_revision(legacy.pk))
+        legacy.title = "French toast"
+        update_recipe(legacy, ChildChanges([], [], []), ChildChanges([], [], []))
+        self.assertEqual(recipe_version(legacy, 1).recipe.title, "Toast")
+        self.assertEqual(recipe_version(legacy, 2).recipe.title, "French toast")
+
+    def test_revision_is_rolled_back_with_a_failed_edit(self):
+        self.recipe.title = "Waffles"
+        ingredient = Ingredient(name="Flour")
+        with self.assertRaises(IntegrityError):
+            update_recipe(
+                self.recipe,
+                ChildChanges([ingredient], [], []),
+                ChildChanges([], [], []),
+            )
+        self.assertEqual(self._numbers(), [1])
+
+    def test_missing_revision_is_reported(self):
+        with self.assertRaises(RecipeRevision.DoesNotExist):
+            recipe_version(self.recipe, 2)
+
+    def test_restore_rolls_back_fields_and_children(self):
+        original = load_recipe_state(self.recipe.pk)
+        flour = self.recipe.ingredients.get()
+        self.recipe.title = "Crepes"
+        update_recipe(
+            self.recipe,
+            ChildChanges([Ingredient(name="Eggs", quantity=2)], [], [flour]),
+            ChildChanges([], [], []),
+        )
+        restore_revision(self.recipe, 1)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.title, "Pancakes")
+        self.assertEqual(
+            [str(i) for i in self.recipe.ingredients.all()], ["200 g Flour"]
+        )
+        self.assertEqual(self._numbers(), [1, 2, 3])
+        restored = load_recipe_state(self.recipe.pk)
+        self.assertEqual(restored["recipe"], original["recipe"])
+
+    def test_restore_shares_images_that_still_exist(self):
+        name = default_storage.save("a.jpg", ContentFile(b"cover"))
+        self.recipe.image = name
+        update_recipe(self.recipe, ChildChanges([], [], []), ChildChanges([], [], []))
+        self.recipe.image = None
+        update_recipe(self.recipe, ChildChanges([], [], []), ChildChanges([], [], []))
+
+        restore_revision(self.recipe, 2)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.image.name, name)
+
+        self.recipe.image = None
+        update_recipe(self.recipe, ChildChanges([], [], []), ChildChanges([], [], []))
+        default_storage.delete(name)
+        default_storage.delete(name)
+        restore_revision(self.recipe, 2)
+        self.recipe.refresh_from_db()
+        self.assertFalse(self.recipe.image)
@@ -0,0 +1,117 @@
+"""Tests of scaling recipes and converting quantities."""
+
+from decimal import Decimal
+from fractions import Fraction
+from django.test import SimpleTestCase, TestCase
+from recipes.forms import IngredientForm
+from recipes.models import Ingredient, Recipe, User
+from recipes.services import (
+    CONVERSION_TABLE,
+    UNITS,
+    convert_quantities,
+    scale_ingredients,
+    scale_quantities,
+    scale_recipes,
+)
+
+
+class ScaleQuantitiesTestCase(SimpleTestCase):
+    """Tests of scaling columns of quantities."""
+
+    def scale(self, quantity, unit, factor):
+        quantities, units = scale_quantities([Decimal(quantity)], [unit], factor)
+        return quantities[0], units[0]
+
+    def test_every_form_unit_can_be_converted(self):
+        for unit, _ in IngredientForm.UNIT_CHOICES:
+            self.assertIn(unit, UNITS)
+            self.assertEqual(CONVERSION_TABLE[unit, unit], 1)
+
+    def test_units_of_different_dimensions_do_not_convert(self):
+        self.assertNotIn(("g", "cup"), CONVERSION_TABLE)
+
+    def test_scaling_up_moves_to_a_larger_unit(self):
+        self.assertEqual(self.scale(16, "tsp", 3), (Decimal("1.000"), "cup"))
+        self.assertEqual(self.scale(500, "g", 3), (Decimal("1.500"), "kg"))
+
+    def test_scaling_keeps_a_unit_it_does_not_fill(self):
+        self.assertEqual(self.scale(1, "tbsp", 2), (Decimal("2.000"), "tbsp"))
+
+    def test_half_a_unit_is_kept(self):
+        self.assertEqual(self.scale(1, "cup", Fraction(1, 2)), (Decimal("0.5"), "cup"))
+
+    def test_scaling_down_moves_to_a_smaller_unit(self):
+        self.assertEqual(
+            self.scale(1, "cup", Fraction(1, 10)), (Decimal("1.600"), "tbsp")
+        )
+        self.assertEqual(self.scale(1, "kg", Fraction(1, 8)), (Decimal("125"), "g"))
+
+    def test_plural_spelling_is_used_for_more_than_one(self):
+        self.assertEqual(self.scale(1, "cup", Fraction(5, 2)), (Decimal("2.5"), "cups"))
+        self.assertEqual(self.scale(2, "lbs", Fraction(1, 2)), (Decimal("1"), "lb"))
+        self.assertEqual(self.scale(1, "piece", 3), (Decimal("3"), "pieces"))
+
+    def test_metric_and_us_units_are_not_mixed(self):
+        self.assertEqual(self.scale(300, "ml", 4), (Decimal("1.2"), "l"))
+
+    def test_unknown_unit_is_scaled_and_kept(self):
+        self.assertEqual(self.scale(2, "handful", 2), (Decimal("4"), "handful"))
+
+    def test_quantities_are_rounded_to_stored_places(self):
+        self.assertEqual(self.scale(1, "", Fraction(1, 3)), (Decimal("0.333"), ""))
+
+    def test_huge_quantities_are_rounded_exactly(self):
+        quantity, unit = self.scale(3, "handful", 10**30)
+        self.assertEqual(quantity, Decimal(3 * 10**30))
+        self.assertEqual(unit, "handful")
+
+    def test_missing_quantities_are_left_alone(self):
+        self.assertEqual(scale_quantities([None], ["cup"], 2), ([None], ["cup"]))
+
+    def test_each_row_can_have_its_own_factor(self):
+        quantities, units = scale_quantities(
+            [Decimal(1), Decimal(1)], ["g", "g"], [Fraction(2), Fraction(3)]
+        )
+        self.assertEqual((quantities, units), ([2, 3], ["g", "g"]))
+
+
+class ConvertQuantitiesTestCase(SimpleTestCase):
+    """Tests of converting columns of quantities to one unit."""
+
+    def test_quantities_are_converted(self):
+        quantities, units = convert_quantities(
+            [Decimal(1), Decimal(2)], ["cup", "l"], "ml"
+        )
+        self.assertEqual(quantities, [Decimal("236.588"), Decimal("2000")])
+        self.assertEqual(units, ["ml", "ml"])
+
+    def test_quantities_that_cannot_be_converted_are_unchanged(self):
+        quantities, units = convert_quantities([Decimal(1), None], ["g", "ml"], "cup")
+        self.assertEqual((quantities, units), ([Decimal(1), None], ["g", "ml"]))
+
+
+class ScaleRecipesTestCase(TestCase):
+    """Tests of scaling the ingredients of recipes."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        author = User.objects.get(username="@johndoe")
+        self.soup = Recipe.objects.create(author=author, title="Soup", servings=2)
+        self.cake = Recipe.objects.create(author=author, title="Cake", servings=8)
+        Ingredient.objects.create(recipe=self.soup, name="Stock", quantity=1, unit="l")
+        Ingredient.objects.create(
+            recipe=self.cake, name="Flour", quantity=2, unit="cups"
+        )
+
+    def test_ingredients_of_one_recipe_are_scaled(self):
+        scaled = scale_ingredients(self.soup.ingredients.all(), 3, self.soup.servings)
+        self.assertEqual(str(scaled[0]), "1.5 l Stock")
+        self.assertIsNotNone(scaled[0].pk)
+        self.assertEqual(Ingredient.objects.get(name="Stock").quantity, 1)
+
+    def test_recipes_are_scaled_in_one_query(self):
+        with self.assertNumQueries(1):
+            scaled = scale_recipes([self.soup, self.cake], 4)
+        self.assertEqual(str(scaled[self.soup.pk][0]), "2 l Stock")
+        self.assertEqual(str(scaled[self.cake.pk][0]), "1 cup Flour")
@@ -0,0 +1,104 @@
+"""Tests of the summary rows lists of recipes are rendered from."""
+
+from django.core.files.storage import default_storage
+from django.test import TestCase
+from recipes.models import (
+    ImageVariant,
+    Ingredient,
+    Instruction,
+    Recipe,
+    RecipeSummary,
+    User,
+)
+from recipes.services import (
+    ChildChanges,
+    create_recipe,
+    fork_recipe,
+    generate_variants_job,
+    rebuild_recipe_summaries,
+    refresh_recipe_summaries,
+    update_recipe,
+)
+from recipes.tests.helpers import make_image_file
+
+
+class RecipeSummaryTestCase(TestCase):
+    """Tests of the summary rows lists of recipes are rendered from."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.author = User.objects.get(username="@johndoe")
+        self.recipe = create_recipe(
+            Recipe(author=self.author, title="Stew", time=90),
+            [Ingredient(name="Beef"), Ingredient(name="Leek")],
+            [Instruction(step=1, description="Simmer.")],
+        )
+
+    def test_created_recipe_is_summarised(self):
+        summary = RecipeSummary.objects.get(recipe=self.recipe)
+        self.assertEqual(summary.title, "Stew")
+        self.assertEqual(summary.author_name, "John Doe")
+        self.assertEqual((summary.ingredient_count, summary.step_count), (2, 1))
+        self.assertEqual(summary.time_display, "1.5 hrs")
+        self.assertEqual(summary.created_at, self.recipe.created_at)
+        self.assertEqual(summary.get_thumbnail_url(), "")
+
+    def test_edited_recipe_is_summarised_again(self):
+        self.recipe.title = "Ragout"
+        update_recipe(
+            self.recipe,
+            ChildChanges([Ingredient(name="Wine")], [], []),
+            ChildChanges([], [], list(self.recipe.instructions.all())),
+        )
+        summary = RecipeSummary.objects.get(recipe=self.recipe)
+        self.assertEqual(summary.title, "Ragout")
+        self.assertEqual((summary.ingredient_count, summary.step_count), (3, 0))
+
+    def test_fork_is_summarised(self):
+        fork = fork_recipe(self.recipe, self.author)
+        self.assertEqual(RecipeSummary.objects.get(recipe=fork).ingredient_count, 2)
+
+    def test_summary_is_deleted_with_recipe(self):
+        self.recipe.delete()
+        self.assertFalse(RecipeSummary.objects.exists())
+
+    def test_thumbnail_is_smallest_variant_never_the_original(self):
+        self.recipe.image = default_storage.save(
+            "recipe/images/stew.jpg", make_image_file()
+        )
+        self.recipe.image_placeholder = "data:image/jpeg;base64,AAAA"
+        self.recipe.save()
+        refresh_recipe_summaries([self.recipe.pk])
+        summary = RecipeSummary.objects.get(recipe=self.recipe)
+        self.assertEqual(summary.thumbnail, "")
+        self.assertEqual(summary.image_placeholder, "data:image/jpeg;base64,AAAA")
+        generate_variants_job(self.recipe.image.name, recipe_id=self.recipe.pk)
+        summary.refresh_from_db()
+        smallest = ImageVariant.objects.get(
+            source=self.recipe.image.name, format="jpeg", width=320
+        )
+        self.assertEqual(summary.thumbnail, smallest.file.name)
+
+    def test_renaming_author_updates_summaries(self):
+        self.author.first_name = "Jane"
+        self.author.save()
+        self.assertEqual(RecipeSummary.objects.get().author_name, "Jane Doe")
+
+    def test_login_does_not_touch_summaries(self):
+        with self.assertNumQueries(1):
+            self.author.save(update_fields=["last_login"])
+
+    def test_rebuild_summarises_every_recipe(self):
+        Recipe.objects.create(author=self.author, title="Toast")
+        RecipeSummary.objects.all().delete()
+        self.assertEqual(rebuild_recipe_summaries(batch_size=1), 2)
+        self.assertEqual(
+            list(RecipeSummary.objects.values_list("title", flat=True)),
+            ["Toast", "Stew"],
+        )
+
+    def test_list_reads_one_table(self):
+        with self.assertNumQueries(1):
+            titles = [summary.title for summary in self.author.recipe_summaries.all()]
+        self.assertEqual(titles, ["Stew"])
@@ -0,0 +1,217 @@
+"""Unit tests of recipe creation."""
+
+from unittest import mock
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from recipes.models import Ingredient, Instruction, Job, Recipe, User
+from recipes.services import (
+    ChildChanges,
+    RecipeConflict,
+    create_recipe,
+    create_recipes,
+    ensure_revision_history,
+    recipe_version,
+    update_recipe,
+)
+from recipes.tests.helpers import make_image_file
+
+
+class CreateRecipeTestCase(TestCase):
+    """Unit tests of recipe creation."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.author = User.objects.get(username="@johndoe")
+        self.recipe = Recipe(author=self.author, title="Stew")
+
+    def _children(self, count):
+        ingredients = [Ingredient(name=f"Ingredient {i}") for i in range(count)]
+        instructions = [
+            Instruction(step=i + 1, description=f"Step {i + 1}") for i in range(count)
+        ]
+        return ingredients, instructions
+
+    def test_children_are_saved_with_the_recipe(self):
+        ingredients, instructions = self._children(3)
+        recipe = create_recipe(self.recipe, ingredients, instructions)
+        self.assertIsNotNone(recipe.pk)
+        self.assertEqual(recipe.ingredients.count(), 3)
+        self.assertEqual(
+            list(recipe.instructions.order_by("step").values_list("step", flat=True)),
+            [1, 2, 3],
+        )
+
+    def test_statement_count_does_not_grow_with_rows(self):
+        ingredients, instructions = self._children(15)
+        # SAVEPOINT, three INSERTs, the revision INSERT, the summary SELECT
+        # and INSERT, and RELEASE SAVEPOINT.
+        with self.assertNumQueries(8):
+            create_recipe(self.recipe, ingredients, instructions)
+
+    def test_failed_child_insert_rolls_back_recipe(self):
+        ingredients = [Ingredient(name="Salt"), Ingredient(name="Salt")]
+        with self.assertRaises(IntegrityError):
+            create_recipe(self.recipe, ingredients, [])
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_images_are_queued_for_variants(self):
+        self.recipe.image = make_image_file("dish.jpg")
+        instruction = Instruction(
+            step=1, description="Serve", image=make_image_file("step.jpg")
+        )
+        recipe = create_recipe(self.recipe, [], [instruction])
+        self.assertEqual(
+            sorted(Job.objects.values_list("payload__source", flat=True)),
+            sorted([recipe.image.name, recipe.instructions.get().image.name]),
+        )
+
+
+class CreateRecipesTestCase(TestCase):
+    """Unit tests of bulk recipe creation."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.author = User.objects.get(username="@johndoe")
+
+    def _entries(self, count):
+        return [
+            (
+                Recipe(author=self.author, title=f"Recipe {index}"),
+                [Ingredient(name="Salt"), Ingredient(name="Pepper")],
+                [Instruction(step=1, description="Season")],
+            )
+            for index in range(count)
+        ]
+
+    def test_recipes_and_children_are_saved(self):
+        recipes = create_recipes(self._entries(3))
+        self.assertEqual(
+            [recipe.title for recipe in recipes], [f"Recipe {i}" for i in range(3)]
+        )
+        for recipe in recipes:
+            self.assertEqual(recipe.ingredients.count(), 2)
+            self.assertEqual(recipe.instructions.count(), 1)
+
+    def test_each_batch_is_one_transaction_of_four_inserts(self):
+        batches = []
+        # Per batch: SAVEPOINT, four INSERTs, the summary SELECT and INSERT,
+        # and RELEASE SAVEPOINT.
+        with self.assertNumQueries(16):
+            create_recipes(self._entries(5), batch_size=3, on_batch=batches.append)
+        self.assertEqual([len(batch) for batch in batches], [3, 2])
+
+    def test_failed_batch_keeps_earlier_batches(self):
+        entries = self._entries(4)
+        entries[3][1].append(Ingredient(name="Salt"))
+        with self.assertRaises(IntegrityError):
+            create_recipes(entries, batch_size=2)
+        self.assertEqual(Recipe.objects.count(), 2)
+
+
+class UpdateRecipeTestCase(TestCase):
+    """Unit tests of recipe updates."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        author = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=author, title="Stew")
+        self.steps = Instruction.objects.bulk_create(
+            [
+                Instruction(recipe=self.recipe, step=step, description=f"Step {step}")
+                for step in range(1, 31)
+            ]
+        )
+
+    def test_update_increments_the_version(self):
+        update_recipe(self.recipe, ChildChanges([], [], []), ChildChanges([], [], []))
+        self.assertEqual(self.recipe.version, 2)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.version, 2)
+
+    def test_transaction_starts_with_the_conditional_update(self):
+        ensure_revision_history(self.recipe.pk)
+        with CaptureQueriesContext(connection) as queries:
+            update_recipe(
+                self.recipe, ChildChanges([], [], []), ChildChanges([], [], [])
+            )
+        self.assertTrue(queries[0]["sql"].startswith("SAVEPOINT"))
+        self.assertTrue(queries[1]["sql"].startswith('UPDATE "recipes_recipe"'))
+        self.assertIn('"version" = 1', queries[1]["sql"])
+
+    def test_failed_first_edit_records_no_revision(self):
+        legacy = Recipe.objects.create(author=self.recipe.author, title="Toast")
+        legacy.title = "Bread"
+        with self.assertRaises(RecipeConflict):
+            update_recipe(
+                legacy,
+                ChildChanges([], [], []),
+                ChildChanges([], [], []),
+                expected_version=legacy.version + 1,
+            )
+        self.assertFalse(legacy.revisions.exists())
+
+    def test_first_edit_records_the_unedited_recipe(self):
+        legacy = Recipe.objects.create(author=self.recipe.author, title="Toast")
+        legacy.title = "Bread"
+        update_recipe(legacy, ChildChanges([], [], []), ChildChanges([], [], []))
+        self.assertEqual(recipe_version(legacy, 1).recipe.title, "Toast")
+        self.assertEqual(recipe_version(legacy, 2).recipe.title, "Bread")
+
+    def test_stale_version_conflicts_and_writes_nothing(self):
+        stale = Recipe.objects.get(pk=self.recipe.pk)
+        update_recipe(self.recipe, ChildChanges([], [], []), ChildChanges([], [], []))
+        revisions = self.recipe.revisions.count()
+        stale.title = "Soup"
+        with self.assertRaises(RecipeConflict):
+            update_recipe(
+                stale,
+                ChildChanges([Ingredient(name="Salt")], [], []),
+                ChildChanges([], [], self.steps),
+            )
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.title, "Stew")
+        self.assertEqual(self.recipe.instructions.count(), 30)
+        self.assertFalse(self.recipe.ingredients.exists())
+        self.assertEqual(self.recipe.revisions.count(), revisions)
+
+    def test_expected_version_overrides_the_loaded_one(self):
+        self.recipe.version = 7
+        update_recipe(
+            self.recipe,
+            ChildChanges([], [], []),
+            ChildChanges([], [], []),
+            expected_version=1,
+        )
+        self.assertEqual(self.recipe.version, 2)
+
+    def test_update_drops_the_cached_detail(self):
+        with mock.patch("recipes.signals.invalidate_recipe_detail") as invalidate:
+            update_recipe(
+                self.recipe, ChildChanges([], [], []), ChildChanges([], [], [])
+            )
+        invalidate.assert_called_with(self.recipe.pk)
+
+    def test_reversing_steps_parks_then_updates(self):
+        for instruction in self.steps:
+            instruction.step = 31 - instruction.step
+        instructions = ChildChanges(
+            created=[],
+            updated=[(instruction, ["step"]) for instruction in self.steps],
+            deleted=[],
+        )
+        ensure_revision_history(self.recipe.pk)
+        # SAVEPOINT, version UPDATE, revision SELECT, recipe UPDATE, parking
+        # UPDATE, bulk UPDATE, three SELECTs of the new state, revision
+        # INSERT, summary SELECT and INSERT, RELEASE.
+        with self.assertNumQueries(13):
+            update_recipe(self.recipe, ChildChanges([], [], []), instructions)
+        self.assertEqual(self.recipe.instructions.get(description="Step 1").step, 30)
+
+    def test_deletes_are_batched(self):
+        instructions = ChildChanges(created=[], updated=[], deleted=self.steps)
+        update_recipe(self.recipe, ChildChanges([], [], []), instructions)
+        self.assertFalse(self.recipe.instructions.exists())
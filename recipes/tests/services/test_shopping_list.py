@@ -0,0 +1,80 @@
+"""Tests of merging recipes into shopping lists."""
+
+from decimal import Decimal
+from django.test import TestCase
+from recipes.helpers import two_tier_cache
+from recipes.models import Ingredient, Recipe, User
+from recipes.services import (
+    ShoppingListItem,
+    build_shopping_list,
+    get_shopping_list,
+    normalise_ingredient_name,
+)
+
+
+class ShoppingListTestCase(TestCase):
+    """Tests of merging recipes into shopping lists."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        two_tier_cache.clear_local()
+        author = User.objects.get(username="@johndoe")
+        self.soup = Recipe.objects.create(author=author, title="Soup", servings=2)
+        self.cake = Recipe.objects.create(author=author, title="Cake", servings=4)
+        for recipe, name, quantity, unit in [
+            (self.soup, "Butter", 1, "tbsp"),
+            (self.soup, "Stock", 750, "ml"),
+            (self.soup, "Salt", None, ""),
+            (self.cake, "butter ", 2, "tsp"),
+            (self.cake, "Flour", 1, "lb"),
+            (self.soup, "flour", 1, "cup"),
+            (self.cake, "Eggs", 3, ""),
+        ]:
+            Ingredient.objects.create(
+                recipe=recipe, name=name, quantity=quantity, unit=unit
+            )
+        self.selection = [self.soup.pk, self.cake.pk]
+
+    def test_ingredients_are_read_in_one_query(self):
+        with self.assertNumQueries(1):
+            build_shopping_list(self.selection)
+
+    def test_quantities_are_summed_in_base_units(self):
+        items = build_shopping_list(self.selection)
+        self.assertIn(ShoppingListItem("Butter", Decimal("24.645"), "ml"), items)
+        self.assertIn(ShoppingListItem("Eggs", Decimal("3"), ""), items)
+
+    def test_quantities_of_different_dimensions_are_listed_apart(self):
+        items = build_shopping_list(self.selection)
+        self.assertIn(ShoppingListItem("Flour", Decimal("453.592"), "g"), items)
+        self.assertIn(ShoppingListItem("flour", Decimal("236.588"), "ml"), items)
+
+    def test_totals_are_written_in_a_sensible_unit(self):
+        self.soup.servings = 1
+        self.soup.save()
+        items = build_shopping_list(self.selection, servings=2)
+        self.assertIn(ShoppingListItem("Stock", Decimal("1.5"), "l"), items)
+
+    def test_ingredients_without_quantity_are_listed(self):
+        items = build_shopping_list(self.selection)
+        self.assertIn(ShoppingListItem("Salt", None, ""), items)
+
+    def test_recipes_can_be_scaled_to_servings(self):
+        items = build_shopping_list(self.selection, servings=8)
+        self.assertIn(ShoppingListItem("Eggs", Decimal("6"), ""), items)
+
+    def test_names_are_normalised_for_matching(self):
+        self.assertEqual(normalise_ingredient_name("  Brown   SUGAR "), "brown sugar")
+
+    def test_list_is_cached_per_selection(self):
+        get_shopping_list(self.selection)
+        with self.assertNumQueries(0):
+            items = get_shopping_list(reversed(self.selection))
+        self.assertEqual(items, build_shopping_list(self.selection))
+
+    def test_changing_an_ingredient_drops_cached_lists(self):
+        get_shopping_list(self.selection)
+        Ingredient.objects.filter(name="Eggs").get().delete()
+        items = get_shopping_list(self.selection)
+        self.assertNotIn("Eggs", [item.name for item in items])
@@ -0,0 +1,70 @@
+"""Unit tests of the responsive image template tags."""
+
+from django.core.files.storage import default_storage
+from django.template import Context, Template
+from django.test import TestCase
+from recipes.models import Recipe, User
+from recipes.services import generate_variants
+from recipes.templatetags.recipe_images import srcset
+from recipes.tests.helpers import make_image_file
+
+
+class RecipeImagesTemplateTagsTestCase(TestCase):
+    """Unit tests of the responsive image template tags."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        author = User.objects.get(username="@johndoe")
+        source = default_storage.save("recipe/images/photo.jpg", make_image_file())
+        self.recipe = Recipe.objects.create(author=author, title="Toast", image=source)
+        self.variants = generate_variants(source)
+
+    def render(self, variants, placeholder=""):
+        template = Template(
+            "{% load recipe_images %}"
+            "{% responsive_image variants alt=recipe.title placeholder=placeholder %}"
+        )
+        return template.render(
+            Context(
+                {
+                    "recipe": self.recipe,
+                    "variants": variants,
+                    "placeholder": placeholder,
+                }
+            )
+        )
+
+    def test_srcset_lists_variants_of_one_format(self):
+        value = srcset(self.variants, "webp")
+        self.assertEqual(value.count("w, "), 2)
+        self.assertIn(".webp 320w", value)
+        self.assertNotIn(".jpeg", value)
+
+    def test_srcset_of_no_variants_is_empty(self):
+        self.assertEqual(srcset(None), "")
+
+    def test_responsive_image_offers_webp_and_jpeg(self):
+        html = self.render(self.variants)
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn(".jpeg 1280w", html)
+        self.assertIn('width="1280" height="640"', html)
+        self.assertIn('alt="Toast"', html)
+
+    def test_responsive_image_without_variants_uses_placeholder(self):
+        html = self.render([])
+        self.assertNotIn("<picture>", html)
+        self.assertNotIn(self.recipe.image.url, html)
+        self.assertIn("image-placeholder.svg", html)
+
+    def test_responsive_image_lazy_loads_over_inline_placeholder(self):
+        html = self.render(self.variants, placeholder="data:image/webp;base64,AAAA")
+        self.assertIn('loading="lazy"', html)
+        self.assertIn(
+            'style="background-image: url(data:image/webp;base64,AAAA)"', html
+        )
+
+    def test_responsive_image_without_variants_shows_inline_placeholder(self):
+        html = self.render([], placeholder="data:image/webp;base64,AAAA")
+        self.assertIn('src="data:image/webp;base64,AAAA"', html)
+        self.assertNotIn("image-placeholder.svg", html)
@@ -0,0 +1,292 @@
+"""Unit tests of the two-tier cache helpers."""
+
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+from django.core.cache import caches
+from django.test import TestCase
+from recipes.helpers import LocalLRUCache, SingleFlight, TwoTierCache
+
+
+class LocalLRUCacheTestCase(TestCase):
+    """Unit tests of the in-process LRU tier."""
+
+    def test_get_returns_stored_payload(self):
+        cache = LocalLRUCache()
+        cache.set("a", b"payload", expires_at=100)
+        self.assertEqual(cache.get("a", now=50), b"payload")
+
+    def test_get_drops_expired_entries(self):
+        cache = LocalLRUCache()
+        cache.set("a", b"payload", expires_at=100)
+        self.assertIsNone(cache.get("a", now=100))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted_first(self):
+        cache = LocalLRUCache(max_entries=2)
+        cache.set("a", b"1", expires_at=100)
+        cache.set("b", b"2", expires_at=100)
+        cache.get("a", now=0)
+        cache.set("c", b"3", expires_at=100)
+        self.assertEqual(cache.get("a", now=0), b"1")
+        self.assertIsNone(cache.get("b", now=0))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_entries_are_evicted_to_stay_within_max_bytes(self):
+        cache = LocalLRUCache(max_bytes=10)
+        cache.set("a", b"x" * 6, expires_at=100)
+        cache.set("b", b"x" * 6, expires_at=100)
+        self.assertIsNone(cache.get("a", now=0))
+        self.assertEqual(cache.size, 6)
+
+    def test_oversized_payload_is_not_stored(self):
+        cache = LocalLRUCache(max_bytes=4)
+        cache.set("a", b"x" * 5, expires_at=100)
+        self.assertEqual(len(cache), 0)
+
+    def test_replacing_an_entry_updates_size(self):
+        cache = LocalLRUCache()
+        cache.set("a", b"x" * 6, expires_at=100)
+        cache.set("a", b"x" * 2, expires_at=100)
+        self.assertEqual(cache.size, 2)
+
+
+class SingleFlightTestCase(TestCase):
+    """Unit tests of single-flight leases."""
+
+    def setUp(self):
+        self.lease_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.lease_dir.cleanup)
+        self.single_flight = SingleFlight(lease_dir=self.lease_dir.name)
+
+    def test_first_caller_gets_the_lease(self):
+        self.assertIsNotNone(self.single_flight.acquire("key"))
+
+    def test_lease_is_exclusive_within_a_process(self):
+        self.single_flight.acquire("key")
+        self.assertIsNone(self.single_flight.acquire("key"))
+
+    def test_lease_is_exclusive_across_processes(self):
+        self.single_flight.acquire("key")
+        other_process = SingleFlight(lease_dir=self.lease_dir.name)
+        self.assertIsNone(other_process.acquire("key"))
+
+    def test_released_lease_can_be_taken_again(self):
+        token = self.single_flight.acquire("key")
+        self.single_flight.release("key", token)
+        other_process = SingleFlight(lease_dir=self.lease_dir.name)
+        self.assertIsNotNone(other_process.acquire("key"))
+
+    def test_leases_are_per_key(self):
+        self.single_flight.acquire("key")
+        self.assertIsNotNone(self.single_flight.acquire("other"))
+
+    def test_expired_lease_is_broken(self):
+        self.single_flight.acquire("key")
+        lease_file = os.path.join(
+            self.lease_dir.name, os.listdir(self.lease_dir.name)[0]
+        )
+        os.utime(lease_file, (time.time() - 60, time.time() - 60))
+        other_process = SingleFlight(lease_dir=self.lease_dir.name, lease_timeout=10)
+        self.assertIsNotNone(other_process.acquire("key"))
+
+    def test_release_does_not_remove_a_lease_taken_over_by_another_process(self):
+        token = self.single_flight.acquire("key")
+        lease_file = os.path.join(
+            self.lease_dir.name, os.listdir(self.lease_dir.name)[0]
+        )
+        os.utime(lease_file, (time.time() - 60, time.time() - 60))
+        other_process = SingleFlight(lease_dir=self.lease_dir.name, lease_timeout=10)
+        other_process.acquire("key")
+        self.single_flight.release("key", token)
+        self.assertTrue(os.path.exists(lease_file))
+
+    def test_lease_context_manager_releases_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.single_flight.lease("key") as leader:
+                self.assertTrue(leader)
+                raise RuntimeError
+        self.assertEqual(os.listdir(self.lease_dir.name), [])
+
+
+class TwoTierCacheTestCase(TestCase):
+    """Unit tests of the two-tier cache."""
+
+    def setUp(self):
+        caches["shared"].clear()
+        self.lease_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.lease_dir.cleanup)
+        self.cache = TwoTierCache(
+            prefix="test",
+            generation_timeout=60,
+            beta=0,
+            wait_timeout=0.2,
+            single_flight=SingleFlight(lease_dir=self.lease_dir.name),
+        )
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {"value": self.builds}
+
+    def test_get_or_set_builds_once(self):
+        self.assertEqual(self.cache.get_or_set("key", self.build), {"value": 1})
+        self.assertEqual(self.cache.get_or_set("key", self.build), {"value": 1})
+        self.assertEqual(self.builds, 1)
+
+    def test_second_read_is_a_local_hit(self):
+        self.cache.get_or_set("key", self.build)
+        self.cache.get_or_set("key", self.build)
+        metrics = self.cache.metrics()
+        self.assertEqual(metrics["misses"], 1)
+        self.assertEqual(metrics["local_hits"], 1)
+        self.assertEqual(metrics["hit_ratio"], 0.5)
+
+    def test_other_processes_read_through_the_shared_tier(self):
+        self.cache.set("key", "value")
+        other_process = TwoTierCache(prefix="test")
+        self.assertEqual(other_process.get("key"), "value")
+        self.assertEqual(other_process.metrics()["shared_hits"], 1)
+
+    def test_local_values_are_copies(self):
+        value = self.cache.get_or_set("key", lambda: ["a"])
+        value.append("b")
+        self.assertEqual(self.cache.get("key"), ["a"])
+
+    def test_get_returns_default_when_missing(self):
+        self.assertEqual(self.cache.get("missing", default="x"), "x")
+
+    def test_expired_values_are_rebuilt(self):
+        with mock.patch("recipes.helpers.time.time", return_value=1000):
+            self.cache.get_or_set("key", self.build, timeout=10)
+        with mock.patch("recipes.helpers.time.time", return_value=1011):
+            self.assertEqual(self.cache.get_or_set("key", self.build), {"value": 2})
+
+    def test_local_tier_expires_before_long_lived_values(self):
+        self.cache.local_timeout = 5
+        with mock.patch("recipes.helpers.time.time", return_value=1000):
+            self.cache.set("key", "value", timeout=60)
+        with mock.patch("recipes.helpers.time.time", return_value=1006):
+            self.assertEqual(self.cache.get("key"), "value")
+        self.assertEqual(self.cache.metrics()["shared_hits"], 1)
+
+    def test_delete_removes_both_tiers(self):
+        self.cache.set("key", "value")
+        self.cache.delete("key")
+        self.assertIsNone(self.cache.get("key"))
+        self.assertIsNone(TwoTierCache(prefix="test").get("key"))
+
+    def test_delete_reaches_the_local_tier_of_other_processes(self):
+        other_process = self._other_process()
+        self.assertEqual(other_process.get_or_set("key", lambda: "old"), "old")
+        self.cache.delete("key")
+        self.assertIsNone(other_process.get("key"))
+        self.assertEqual(other_process.get_or_set("key", lambda: "new"), "new")
+        self.assertEqual(self.cache.get("key"), "new")
+
+    def test_bump_namespace_invalidates_its_keys(self):
+        self.cache.set("key", "recipe", namespace="recipes")
+        self.cache.set("key", "user", namespace="users")
+        self.cache.bump_namespace("recipes")
+        self.assertIsNone(self.cache.get("key", namespace="recipes"))
+        self.assertEqual(self.cache.get("key", namespace="users"), "user")
+
+    def test_bump_namespace_reaches_other_processes(self):
+        other_process = TwoTierCache(prefix="test", generation_timeout=0)
+        other_process.set("key", "value")
+        self.cache.bump_namespace("default")
+        self.assertIsNone(other_process.get("key"))
+
+    @mock.patch("recipes.helpers.random.random", return_value=0.5)
+    def test_values_close_to_expiry_are_refreshed_early(self, _):
+        self.cache.beta = 1.0
+        with mock.patch("recipes.helpers.time.time", return_value=1000):
+            self.cache.set("key", "old", timeout=10, build_time=100)
+        with mock.patch("recipes.helpers.time.time", return_value=1005):
+            value = self.cache.get_or_set("key", lambda: "new")
+        self.assertEqual(value, "new")
+        self.assertEqual(self.cache.metrics()["early_refreshes"], 1)
+
+    @mock.patch("recipes.helpers.random.random", return_value=0.5)
+    def test_fresh_cheap_values_are_not_refreshed_early(self, _):
+        self.cache.beta = 1.0
+        with mock.patch("recipes.helpers.time.time", return_value=1000):
+            self.cache.set("key", "old", timeout=300, build_time=0.001)
+            self.assertEqual(self.cache.get_or_set("key", lambda: "new"), "old")
+
+    def test_metrics_report_local_tier_usage(self):
+        self.cache.set("key", "value")
+        metrics = self.cache.metrics()
+        self.assertEqual(metrics["sets"], 1)
+        self.assertEqual(metrics["local_entries"], 1)
+        self.assertGreater(metrics["local_bytes"], 0)
+
+    def test_reset_metrics(self):
+        self.cache.get_or_set("key", self.build)
+        self.cache.reset_metrics()
+        self.assertEqual(self.cache.metrics()["misses"], 0)
+
+    def test_stale_value_is_served_while_another_worker_rebuilds(self):
+        with mock.patch("recipes.helpers.time.time", return_value=1000):
+            self.cache.set("key", "stale", timeout=10)
+        with mock.patch("recipes.helpers.time.time", return_value=1015):
+            self._hold_lease_elsewhere("key")
+            self.assertEqual(self.cache.get_or_set("key", self.build), "stale")
+        self.assertEqual(self.builds, 0)
+        self.assertEqual(self.cache.metrics()["stale_hits"], 1)
+
+    def test_stale_value_is_not_returned_by_get(self):
+        with mock.patch("recipes.helpers.time.time", return_value=1000):
+            self.cache.set("key", "stale", timeout=10)
+        with mock.patch("recipes.helpers.time.time", return_value=1015):
+            self.assertIsNone(self.cache.get("key"))
+
+    def test_miss_waits_for_the_leader(self):
+        self._hold_lease_elsewhere("key")
+        publisher = threading.Timer(0.05, lambda: self._other_process().set("key", 1))
+        publisher.start()
+        self.addCleanup(publisher.cancel)
+        self.cache.wait_timeout = 2
+        self.assertEqual(self.cache.get_or_set("key", self.build), 1)
+        self.assertEqual(self.builds, 0)
+        self.assertEqual(self.cache.metrics()["coalesced_waits"], 1)
+
+    def test_miss_builds_itself_when_the_leader_is_too_slow(self):
+        self._hold_lease_elsewhere("key")
+        self.assertEqual(self.cache.get_or_set("key", self.build), {"value": 1})
+
+    def test_concurrent_misses_build_once(self):
+        self.cache.wait_timeout = 5
+        barrier = threading.Barrier(8)
+        results = []
+
+        def slow_build():
+            time.sleep(0.2)
+            return self.build()
+
+        def read():
+            barrier.wait()
+            results.append(self.cache.get_or_set("key", slow_build))
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(results, [{"value": 1}] * 8)
+
+    def test_lease_is_released_after_rebuild(self):
+        self.cache.get_or_set("key", self.build)
+        self.assertEqual(os.listdir(self.lease_dir.name), [])
+
+    def _other_process(self):
+        return TwoTierCache(
+            prefix="test", single_flight=SingleFlight(lease_dir=self.lease_dir.name)
+        )
+
+    def _hold_lease_elsewhere(self, key):
+        other_process = SingleFlight(lease_dir=self.lease_dir.name)
+        self.assertIsNotNone(other_process.acquire(self.cache.make_key(key)))
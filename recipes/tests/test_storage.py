@@ -0,0 +1,97 @@
+"""Tests of the content-addressed media storage."""
+
+import hashlib
+import os
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from recipes.models import MediaBlob
+from recipes.storage import ContentAddressedStorage
+
+
+class ContentAddressedStorageTestCase(TestCase):
+    """Tests of the content-addressed media storage."""
+
+    def setUp(self):
+        self.storage = ContentAddressedStorage()
+        self.content = b"same bytes"
+        self.digest = hashlib.sha256(self.content).hexdigest()
+
+    def test_name_is_derived_from_content(self):
+        name = self.storage.save("recipe/photo.JPG", ContentFile(self.content))
+        self.assertEqual(
+            name, f"blobs/{self.digest[:2]}/{self.digest[2:4]}/{self.digest}.jpg"
+        )
+        with self.storage.open(name) as stored:
+            self.assertEqual(stored.read(), self.content)
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.storage.save("recipe/a.jpg", ContentFile(self.content))
+        second = self.storage.save("recipe/b.jpg", ContentFile(self.content))
+        self.assertEqual(first, second)
+        blob = MediaBlob.objects.get(name=first)
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.digest, self.digest)
+        self.assertEqual(blob.size, len(self.content))
+
+    def test_different_content_is_stored_separately(self):
+        first = self.storage.save("recipe/a.jpg", ContentFile(b"one"))
+        second = self.storage.save("recipe/a.jpg", ContentFile(b"two"))
+        self.assertNotEqual(first, second)
+        self.assertEqual(MediaBlob.objects.count(), 2)
+
+    def test_same_content_with_another_extension_gets_its_own_blob(self):
+        first = self.storage.save("recipe/a.jpg", ContentFile(self.content))
+        second = self.storage.save("recipe/a.png", ContentFile(self.content))
+        self.assertNotEqual(first, second)
+        self.assertEqual(MediaBlob.objects.filter(digest=self.digest).count(), 2)
+
+    def test_no_temporary_files_are_left_behind(self):
+        self.storage.save("recipe/a.jpg", ContentFile(self.content))
+        self.storage.save("recipe/b.jpg", ContentFile(self.content))
+        self.assertEqual(os.listdir(self.storage.path("blobs/tmp")), [])
+
+    def test_delete_keeps_file_until_last_reference(self):
+        name = self.storage.save("recipe/a.jpg", ContentFile(self.content))
+        self.storage.save("recipe/b.jpg", ContentFile(self.content))
+        self.storage.delete(name)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 1)
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+
+    def test_add_reference(self):
+        name = self.storage.save("recipe/a.jpg", ContentFile(self.content))
+        self.storage.add_reference(name)
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 2)
+
+    def test_add_reference_to_unrecorded_blob(self):
+        name = self.storage.save("recipe/a.jpg", ContentFile(self.content))
+        MediaBlob.objects.all().delete()
+        self.storage.add_reference(name)
+        blob = MediaBlob.objects.get(name=name)
+        self.assertEqual(blob.ref_count, 1)
+        self.assertEqual(blob.digest, self.digest)
+        self.assertEqual(blob.size, len(self.content))
+
+    def test_add_references_counts_each_occurrence(self):
+        first = self.storage.save("recipe/a.jpg", ContentFile(self.content))
+        second = self.storage.save("recipe/b.jpg", ContentFile(b"other"))
+        with self.assertNumQueries(1):
+            self.storage.add_references([first, second, first, "legacy/c.jpg"])
+        self.assertEqual(MediaBlob.objects.get(name=first).ref_count, 3)
+        self.assertEqual(MediaBlob.objects.get(name=second).ref_count, 2)
+
+    def test_add_references_to_unrecorded_blob(self):
+        name = self.storage.save("recipe/a.jpg", ContentFile(self.content))
+        MediaBlob.objects.all().delete()
+        self.storage.add_references([name, name])
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 2)
+
+    def test_files_outside_blob_directory_are_deleted_directly(self):
+        name = "legacy/photo.jpg"
+        os.makedirs(self.storage.path("legacy"), exist_ok=True)
+        with open(self.storage.path(name), "wb") as legacy:
+            legacy.write(self.content)
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
@@ -0,0 +1,95 @@
+"""Tests of the streaming image upload handler."""
+
+import io
+from django.core.exceptions import RequestDataTooBig
+from django.test import TestCase, override_settings
+from PIL import Image
+from recipes.tests.helpers import make_image_file
+from recipes.uploads import StreamingImageUploadHandler
+
+LIMITS = {
+    "MAX_FILE_BYTES": 64 * 1024,
+    "MAX_REQUEST_BYTES": 128 * 1024,
+    "MAX_PIXELS": 4_000_000,
+    "MAX_EDGE": 1024,
+}
+
+
+@override_settings(IMAGE_UPLOADS=LIMITS)
+class StreamingImageUploadHandlerTestCase(TestCase):
+    """Tests of the streaming image upload handler."""
+
+    def setUp(self):
+        self.handler = StreamingImageUploadHandler()
+
+    def _upload(self, content, chunk_size=8 * 1024, name="photo.jpg"):
+        self.handler.new_file("image", name, "image/jpeg", len(content))
+        for start in range(0, len(content), chunk_size):
+            self.handler.receive_data_chunk(content[start : start + chunk_size], start)
+        return self.handler.file_complete(len(content))
+
+    def _image_bytes(self, size, image_format="JPEG"):
+        return make_image_file(size=size, image_format=image_format).read()
+
+    def test_small_image_is_kept_as_is(self):
+        content = self._image_bytes((800, 600))
+        uploaded = self._upload(content)
+        self.assertFalse(hasattr(uploaded, "upload_error"))
+        self.assertEqual(uploaded.read(), content)
+        self.assertTrue(uploaded.temporary_file_path())
+
+    def test_large_image_is_downscaled(self):
+        uploaded = self._upload(self._image_bytes((2000, 1000)))
+        self.assertFalse(hasattr(uploaded, "upload_error"))
+        self.assertEqual(uploaded.size, len(uploaded.read()))
+        uploaded.seek(0)
+        with Image.open(uploaded) as image:
+            self.assertEqual(image.size, (1024, 512))
+            self.assertEqual(image.format, "JPEG")
+
+    def test_png_is_downscaled_as_png(self):
+        uploaded = self._upload(
+            self._image_bytes((1000, 2000), "PNG"), name="photo.png"
+        )
+        with Image.open(uploaded) as image:
+            self.assertEqual(image.size, (512, 1024))
+            self.assertEqual(image.format, "PNG")
+
+    def test_downscaling_applies_exif_orientation(self):
+        content = make_image_file(size=(2000, 1000), orientation=6).read()
+        with Image.open(self._upload(content)) as image:
+            self.assertEqual(image.size, (512, 1024))
+
+    def test_image_with_too_many_pixels_is_rejected(self):
+        image = Image.new("1", (4000, 4000))
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG")
+        uploaded = self._upload(buffer.getvalue(), name="bomb.png")
+        self.assertIn("4000x4000", uploaded.upload_error)
+
+    def test_file_over_cap_is_not_written(self):
+        uploaded = self._upload(b"x" * (LIMITS["MAX_FILE_BYTES"] + 1))
+        self.assertIn("too large", uploaded.upload_error)
+        self.assertEqual(uploaded.size, 0)
+        self.assertEqual(uploaded.read(), b"")
+
+    def test_next_file_is_accepted_after_rejected_one(self):
+        self._upload(b"x" * (LIMITS["MAX_FILE_BYTES"] + 1))
+        uploaded = self._upload(self._image_bytes((100, 100)))
+        self.assertFalse(hasattr(uploaded, "upload_error"))
+
+    def test_request_over_cap_is_refused(self):
+        with self.assertRaises(RequestDataTooBig):
+            for _ in range(3):
+                self._upload(b"x" * LIMITS["MAX_FILE_BYTES"])
+
+    def test_declared_request_length_over_cap_is_refused(self):
+        with self.assertRaises(RequestDataTooBig):
+            self.handler.handle_raw_input(
+                None, {}, LIMITS["MAX_REQUEST_BYTES"] + 1, b"boundary"
+            )
+
+    def test_non_images_are_left_for_form_validation(self):
+        uploaded = self._upload(b"not an image")
+        self.assertFalse(hasattr(uploaded, "upload_error"))
+        self.assertEqual(uploaded.read(), b"not an image")
@@ -0,0 +1,51 @@
+"""Tests of the dashboard view."""
+
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import Ingredient, Recipe, User
+from recipes.services import create_recipe
+from recipes.tests.helpers import reverse_with_next
+
+
+class DashboardViewTestCase(TestCase):
+    """Tests of the dashboard view."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        self.url = reverse("dashboard")
+
+    def test_dashboard_url(self):
+        self.assertEqual(self.url, "/dashboard/")
+
+    def test_get_dashboard_redirects_when_not_logged_in(self):
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse_with_next("log_in", self.url))
+
+    def test_dashboard_lists_recipe_summaries(self):
+        create_recipe(
+            Recipe(author=self.user, title="Soup"), [Ingredient(name="Leek")], []
+        )
+        self.client.login(username="@johndoe", password="Password123")
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, "dashboard.html")
+        self.assertContains(response, "Soup")
+        self.assertContains(response, "1 ingredient\n")
+        self.assertContains(response, "0 steps")
+
+    def test_dashboard_shows_placeholder_until_thumbnail_exists(self):
+        create_recipe(
+            Recipe(
+                author=self.user,
+                title="Soup",
+                image="recipe/images/soup.jpg",
+                image_placeholder="data:image/jpeg;base64,AAAA",
+            ),
+            [],
+            [],
+        )
+        self.client.login(username="@johndoe", password="Password123")
+        response = self.client.get(self.url)
+        self.assertContains(response, 'src="data:image/jpeg;base64,AAAA"')
+        self.assertNotContains(response, "soup.jpg")
@@ -0,0 +1,127 @@
+"""Tests of the instruction move view."""
+
+import json
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import Instruction, Recipe, User
+from recipes.services import recipe_version, spaced_step
+
+
+class InstructionMoveViewTestCase(TestCase):
+    """Tests of the instruction move view."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=self.user, title="Pancakes")
+        self.mix, self.rest, self.fry = [
+            Instruction.objects.create(
+                recipe=self.recipe, step=spaced_step(rank), description=description
+            )
+            for rank, description in enumerate(("Mix", "Rest", "Fry"), start=1)
+        ]
+        self.url = self._url(self.fry)
+
+    def _url(self, instruction):
+        return reverse(
+            "instruction_move",
+            kwargs={"pk": self.recipe.pk, "instruction_pk": instruction.pk},
+        )
+
+    def _post(self, payload, url=None):
+        self.client.login(username=self.user.username, password="Password123")
+        return self.client.post(
+            url or self.url, json.dumps(payload), content_type="application/json"
+        )
+
+    def _order(self):
+        return list(
+            self.recipe.instructions.order_by("step").values_list(
+                "description", flat=True
+            )
+        )
+
+    def test_instruction_move_url(self):
+        self.assertEqual(
+            self.url,
+            f"/recipes/{self.recipe.pk}/instructions/{self.fry.pk}/move/",
+        )
+
+    def test_move_after_an_instruction(self):
+        response = self._post({"after": self.mix.pk})
+        self.assertEqual(response.status_code, 200)
+        self.fry.refresh_from_db()
+        self.assertEqual(
+            response.json(),
+            {"id": self.fry.pk, "step": 2, "sort_key": self.fry.step},
+        )
+        self.assertEqual(self._order(), ["Mix", "Fry", "Rest"])
+
+    def test_move_increments_the_recipe_version(self):
+        self._post({"after": None})
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.version, 2)
+
+    def test_move_is_recorded_as_a_revision(self):
+        self._post({"after": None})
+        self.assertEqual(
+            [i.description for i in recipe_version(self.recipe, 1).instructions],
+            ["Mix", "Rest", "Fry"],
+        )
+        self.assertEqual(
+            [i.description for i in recipe_version(self.recipe, 2).instructions],
+            ["Fry", "Mix", "Rest"],
+        )
+
+    def test_move_to_the_start(self):
+        response = self._post({"after": None})
+        self.assertEqual(response.json()["step"], 1)
+        self.assertEqual(self._order(), ["Fry", "Mix", "Rest"])
+
+    def test_move_redirects_when_not_logged_in(self):
+        response = self.client.post(
+            self.url, json.dumps({"after": None}), content_type="application/json"
+        )
+        self.assertRedirects(response, reverse("log_in") + "?next=" + self.url)
+
+    def test_get_is_not_allowed(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_other_users_cannot_move_instructions(self):
+        other = User.objects.create_user(
+            username="@janedoe", email="jane@example.org", password="Password123"
+        )
+        self.recipe.author = other
+        self.recipe.save()
+        response = self._post({"after": None})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self._order(), ["Mix", "Rest", "Fry"])
+
+    def test_cannot_move_after_an_instruction_of_another_recipe(self):
+        other = Recipe.objects.create(author=self.user, title="Stew")
+        chop = Instruction.objects.create(recipe=other, step=1, description="Chop")
+        response = self._post({"after": chop.pk})
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_payloads_are_rejected(self):
+        for payload in ({}, [], {"after": "first"}, {"after": self.fry.pk}):
+            with self.subTest(payload=payload):
+                response = self._post(payload)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._order(), ["Mix", "Rest", "Fry"])
+
+    def test_booleans_are_not_instruction_ids(self):
+        for after in (True, False):
+            with self.subTest(after=after):
+                response = self._post({"after": after})
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._order(), ["Mix", "Rest", "Fry"])
+
+    def test_malformed_json_is_rejected(self):
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.post(
+            self.url, "not json", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,161 @@
+"""Tests of the recipe bulk create view."""
+
+import json
+from unittest import mock
+from django.test import Client, TestCase
+from django.urls import reverse
+from recipes.models import Ingredient, Instruction, Recipe, User
+from recipes.services import issue_api_token, spaced_step
+
+
+class RecipeBulkCreateViewTestCase(TestCase):
+    """Tests of the recipe bulk create view."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        self.url = reverse("recipe_bulk_create")
+
+    def _recipe(self, title, rows=2):
+        return {
+            "title": title,
+            "description": "Imported",
+            "difficulty": 1,
+            "time": 15,
+            "ingredients": [
+                {"name": f"Ingredient {index}", "quantity": index + 1, "unit": "g"}
+                for index in range(rows)
+            ],
+            "instructions": [
+                {"step": index + 1, "description": f"Step {index + 1}"}
+                for index in range(rows)
+            ],
+        }
+
+    def _post(self, payload):
+        self.client.login(username=self.user.username, password="Password123")
+        return self.client.post(
+            self.url, json.dumps(payload), content_type="application/json"
+        )
+
+    def test_recipe_bulk_create_url(self):
+        self.assertEqual(self.url, "/api/recipes/bulk/")
+
+    def test_recipes_are_created_for_the_current_user(self):
+        response = self._post([self._recipe("Soup"), self._recipe("Stew", rows=3)])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["created"], body["invalid"]), (2, 0))
+        soup, stew = [Recipe.objects.get(pk=r["id"]) for r in body["results"]]
+        self.assertEqual((soup.title, soup.author), ("Soup", self.user))
+        self.assertEqual(stew.ingredients.count(), 3)
+        self.assertEqual(
+            list(stew.instructions.order_by("step").values_list("step", flat=True)),
+            [spaced_step(1), spaced_step(2), spaced_step(3)],
+        )
+
+    def test_instructions_are_ordered_by_step(self):
+        recipe = self._recipe("Soup")
+        recipe["instructions"].reverse()
+        body = self._post([recipe]).json()
+        created = Recipe.objects.get(pk=body["results"][0]["id"])
+        self.assertEqual(
+            list(
+                created.instructions.order_by("step").values_list(
+                    "description", flat=True
+                )
+            ),
+            ["Step 1", "Step 2"],
+        )
+
+    def test_invalid_recipes_do_not_block_the_others(self):
+        invalid = self._recipe("")
+        invalid["ingredients"].append({"name": "Ingredient 0"})
+        response = self._post([self._recipe("Soup"), invalid, "not a recipe"])
+        body = response.json()
+        self.assertEqual((body["created"], body["invalid"]), (1, 2))
+        created, rejected, malformed = body["results"]
+        self.assertEqual(created["status"], "created")
+        self.assertEqual(rejected["status"], "invalid")
+        self.assertEqual(set(rejected["errors"]), {"title", "ingredients"})
+        self.assertNotIn("id", rejected)
+        self.assertEqual(malformed["status"], "invalid")
+        self.assertEqual(Recipe.objects.count(), 1)
+        self.assertEqual(Ingredient.objects.count(), 2)
+
+    def test_statement_count_does_not_grow_with_recipes(self):
+        self.client.login(username=self.user.username, password="Password123")
+        payload = json.dumps([self._recipe(f"Recipe {i}", rows=3) for i in range(20)])
+        # Session and user lookups, then SAVEPOINT, four INSERTs, the summary
+        # SELECT and INSERT, and RELEASE.
+        with self.assertNumQueries(10):
+            self.client.post(self.url, payload, content_type="application/json")
+        self.assertEqual(Instruction.objects.count(), 60)
+
+    def test_get_is_not_allowed(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_body_must_be_a_json_array(self):
+        self.assertEqual(self._post({"title": "Soup"}).status_code, 400)
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.post(self.url, "[", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    @mock.patch("recipes.views.recipe_bulk_create_view.BULK_CREATE_MAX_ITEMS", 2)
+    def test_number_of_recipes_is_capped(self):
+        response = self._post([self._recipe(f"Recipe {i}") for i in range(3)])
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_unauthenticated_request_gets_json_401(self):
+        response = self.client.post(
+            self.url, json.dumps([]), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Bearer")
+        self.assertIn("error", response.json())
+
+    def test_invalid_token_gets_json_401(self):
+        response = self.client.post(
+            self.url,
+            json.dumps([]),
+            content_type="application/json",
+            headers={"Authorization": "Bearer wrong"},
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"error": "Invalid API token."})
+
+    def test_token_authenticates_without_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+        key = issue_api_token(self.user, name="Partner")
+        response = client.post(
+            self.url,
+            json.dumps([self._recipe("Soup")]),
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {key}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Recipe.objects.get().author, self.user)
+
+    def test_token_of_inactive_user_is_rejected(self):
+        key = issue_api_token(self.user)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(
+            self.url,
+            json.dumps([]),
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {key}"},
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_session_without_csrf_token_gets_json_403(self):
+        client = Client(enforce_csrf_checks=True)
+        client.login(username=self.user.username, password="Password123")
+        response = client.post(
+            self.url, json.dumps([]), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {"error": "CSRF check failed."})
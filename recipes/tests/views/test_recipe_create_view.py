@@ -1,11 +1,25 @@
 """Tests of the recipe create view."""
 
+from unittest import mock
+from django.conf import settings
 from django.contrib import messages
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from recipes.forms import RecipeForm
-from recipes.models import Recipe, Ingredient, Instruction, User
-from recipes.tests.helpers import LogInTester
+from recipes.models import (
+    IdempotencyKey,
+    ImageVariant,
+    Ingredient,
+    Instruction,
+    Job,
+    Recipe,
+    User,
+)
+from recipes.services import load_draft, save_draft, spaced_step
+from recipes.tests.helpers import LogInTester, make_image_file
+from recipes.views.recipe_create_view import RecipeCreateView
 
 
 class RecipeCreateViewTestCase(TestCase, LogInTester):
@@ -98,7 +112,7 @@ class RecipeCreateViewTestCase(TestCase, LogInTester):
         self.assertEqual(ingredient.unit, "cup")
 
         instruction = recipe.instructions.first()
-        self.assertEqual(instruction.step, 1)
+        self.assertEqual(instruction.step, spaced_step(1))
         self.assertEqual(instruction.description, "First, prepare the ingredients.")
 
         messages_list = list(response.context["messages"])
@@ -133,6 +147,33 @@ class RecipeCreateViewTestCase(TestCase, LogInTester):
         ingredient_formset = response.context["ingredient_formset"]
         self.assertFalse(ingredient_formset.is_valid())
 
+    def test_invalid_formset_writes_nothing(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["instructions-0-description"] = ""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, self.form_input)
+        writes = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "DELETE"))
+            and "django_session" not in query["sql"]
+        ]
+        self.assertEqual(writes, [])
+
+    def test_invalid_post_validates_each_image_once(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["instructions-TOTAL_FORMS"] = "2"
+        self.form_input["instructions-0-image"] = make_image_file("step.jpg")
+        self.form_input["instructions-1-step"] = "2"
+        self.form_input["instructions-1-description"] = ""
+        with mock.patch(
+            "recipes.forms.image_placeholder_mixin.make_placeholder",
+            return_value="data:,",
+        ) as make_placeholder:
+            response = self.client.post(self.url, self.form_input)
+        self.assertEqual(make_placeholder.call_count, 1)
+        self.assertFalse(response.context["instruction_formset"].is_valid())
+
     def test_unsuccessful_recipe_create_with_invalid_instruction_formset(self):
         self.client.login(username=self.user.username, password="Password123")
         self.form_input["instructions-0-description"] = (
@@ -182,8 +223,8 @@ class RecipeCreateViewTestCase(TestCase, LogInTester):
         recipe = Recipe.objects.get(title="Test Recipe")
         instructions = recipe.instructions.all().order_by("step")
         self.assertEqual(instructions.count(), 2)
-        self.assertEqual(instructions[0].step, 1)
-        self.assertEqual(instructions[1].step, 2)
+        self.assertEqual(instructions[0].step, spaced_step(1))
+        self.assertEqual(instructions[1].step, spaced_step(2))
 
     def test_recipe_create_minimum_one_ingredient_required(self):
         self.client.login(username=self.user.username, password="Password123")
@@ -213,3 +254,136 @@ class RecipeCreateViewTestCase(TestCase, LogInTester):
         self.assertEqual(after_count, before_count)
         instruction_formset = response.context["instruction_formset"]
         self.assertFalse(instruction_formset.is_valid())
+
+    def test_recipe_create_with_images_queues_variant_jobs(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["image"] = make_image_file("dish.jpg")
+        self.form_input["instructions-0-image"] = make_image_file("step.jpg")
+        self.client.post(self.url, self.form_input)
+        recipe = Recipe.objects.get(title="Test Recipe")
+        self.assertEqual(ImageVariant.objects.count(), 0)
+        self.assertEqual(
+            sorted(Job.objects.values_list("payload__source", flat=True)),
+            sorted([recipe.image.name, recipe.instructions.first().image.name]),
+        )
+
+    def test_recipe_create_stores_image_placeholders(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["image"] = make_image_file("dish.jpg")
+        self.form_input["instructions-0-image"] = make_image_file("step.jpg")
+        self.client.post(self.url, self.form_input)
+        recipe = Recipe.objects.get(title="Test Recipe")
+        self.assertTrue(recipe.image_placeholder.startswith("data:image/webp"))
+        self.assertTrue(
+            recipe.instructions.get().image_placeholder.startswith("data:image/webp")
+        )
+
+    def test_recipe_create_without_images_queues_no_jobs(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.client.post(self.url, self.form_input)
+        self.assertEqual(Job.objects.count(), 0)
+
+    @override_settings(IMAGE_UPLOADS={"MAX_FILE_BYTES": 1024})
+    def test_recipe_create_with_oversized_image_shows_error(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["image"] = make_image_file()
+        response = self.client.post(self.url, self.form_input)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("too large", str(response.context["form"].errors["image"]))
+        self.assertFalse(Recipe.objects.exists())
+
+    @override_settings(IMAGE_UPLOADS={"MAX_REQUEST_BYTES": 1024})
+    def test_recipe_create_over_request_cap_is_refused(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["image"] = make_image_file()
+        response = self.client.post(self.url, self.form_input)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_form_is_filled_in_from_draft(self):
+        save_draft(
+            self.user,
+            {
+                "title": "Risotto",
+                "ingredients-TOTAL_FORMS": "3",
+                "ingredients-2-name": "Parmesan",
+                "instructions-0-description": "Toast the rice.",
+            },
+        )
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["form"]["title"].value(), "Risotto")
+        ingredient_forms = response.context["ingredient_formset"].forms
+        self.assertEqual(len(ingredient_forms), 3)
+        self.assertEqual(ingredient_forms[2]["name"].value(), "Parmesan")
+        self.assertEqual(
+            response.context["instruction_formset"].forms[0]["description"].value(),
+            "Toast the rice.",
+        )
+        self.assertContains(response, 'data-draft-url="/recipe/create/draft/"')
+
+    def test_draft_does_not_affect_submissions(self):
+        save_draft(self.user, {"title": "Risotto"})
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["title"] = ""
+        response = self.client.post(self.url, self.form_input)
+        self.assertEqual(response.context["form"]["title"].value(), "")
+
+    def test_successful_create_discards_draft(self):
+        save_draft(self.user, {"title": "Risotto"})
+        self.client.login(username=self.user.username, password="Password123")
+        self.client.post(self.url, self.form_input)
+        self.assertEqual(load_draft(self.user), {})
+
+    def test_form_is_rendered_with_a_fresh_idempotency_key(self):
+        self.client.login(username=self.user.username, password="Password123")
+        first = self.client.get(self.url).context["idempotency_key"]
+        response = self.client.get(self.url)
+        key = response.context["idempotency_key"]
+        self.assertNotEqual(first, key)
+        self.assertContains(
+            response, f'<input type="hidden" name="idempotency_key" value="{key}">'
+        )
+
+    def test_invalid_submission_keeps_its_idempotency_key(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["idempotency_key"] = "retry-key"
+        self.form_input["title"] = ""
+        response = self.client.post(self.url, self.form_input)
+        self.assertEqual(response.context["idempotency_key"], "retry-key")
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_replayed_submission_gets_the_original_redirect(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["idempotency_key"] = "double-click"
+        first = self.client.post(self.url, self.form_input)
+        self.form_input["title"] = "Changed in the retry"
+        with mock.patch.object(RecipeCreateView, "form_valid") as form_valid:
+            with self.assertNumQueries(3):
+                second = self.client.post(self.url, self.form_input)
+        form_valid.assert_not_called()
+        self.assertRedirects(second, first["Location"], fetch_redirect_response=False)
+        self.assertEqual(Recipe.objects.count(), 1)
+        self.assertEqual(Ingredient.objects.count(), 1)
+
+    def test_concurrent_duplicate_is_not_saved_twice(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.form_input["idempotency_key"] = "double-click"
+        # The duplicate was validated before the first submission committed.
+        with mock.patch(
+            "recipes.views.idempotent_form_mixin.replayed_location",
+            return_value=None,
+        ):
+            self.client.post(self.url, self.form_input)
+            response = self.client.post(self.url, self.form_input, follow=True)
+        self.assertRedirects(response, reverse(settings.REDIRECT_URL_WHEN_LOGGED_IN))
+        self.assertEqual(Recipe.objects.count(), 1)
+        self.assertEqual(Instruction.objects.count(), 1)
+        self.assertEqual(len(list(response.context["messages"])), 1)
+
+    def test_different_keys_create_separate_recipes(self):
+        self.client.login(username=self.user.username, password="Password123")
+        for key in ("first", "second"):
+            self.form_input["idempotency_key"] = key
+            self.client.post(self.url, self.form_input)
+        self.assertEqual(Recipe.objects.count(), 2)
@@ -0,0 +1,96 @@
+"""Tests of the recipe detail view."""
+
+from django.core.files.storage import default_storage
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import Ingredient, Instruction, Recipe, User
+from recipes.helpers import two_tier_cache
+from recipes.services import generate_variants, invalidate_recipe_detail
+from recipes.tests.helpers import make_image_file
+
+
+class RecipeDetailViewTestCase(TestCase):
+    """Tests of the recipe detail view."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        two_tier_cache.clear_local()
+        self.user = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=self.user, title="Pancakes")
+        Ingredient.objects.create(
+            recipe=self.recipe, name="Flour", quantity=200, unit="g"
+        )
+        Instruction.objects.create(recipe=self.recipe, step=2, description="Fry.")
+        Instruction.objects.create(recipe=self.recipe, step=1, description="Mix.")
+        self.url = reverse("recipe_detail", kwargs={"pk": self.recipe.pk})
+
+    def test_recipe_detail_url(self):
+        self.assertEqual(self.url, f"/recipes/{self.recipe.pk}/")
+
+    def test_get_recipe_detail(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "recipe_detail.html")
+        self.assertContains(response, "Pancakes")
+        self.assertContains(response, "Flour")
+        content = response.content.decode()
+        self.assertLess(content.index("Mix."), content.index("Fry."))
+
+    def test_ingredients_are_scaled_to_requested_servings(self):
+        response = self.client.get(self.url, {"servings": 20})
+        self.assertEqual(response.context["servings"], 20)
+        self.assertEqual(str(response.context["ingredients"][0]), "1 kg Flour")
+        self.assertEqual(Ingredient.objects.get(name="Flour").quantity, 200)
+
+    def test_invalid_servings_shows_recipe_as_saved(self):
+        response = self.client.get(self.url, {"servings": "0"})
+        self.assertEqual(response.context["servings"], 4)
+        self.assertEqual(str(response.context["ingredients"][0]), "200 g Flour")
+
+    def test_nutrition_is_shown_per_serving_once_computed(self):
+        response = self.client.get(self.url)
+        self.assertNotContains(response, 'id="recipe-nutrition"')
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            calories=800, protein=20, fat=8, carbohydrate=150, nutrition_stale=False
+        )
+        two_tier_cache.clear_local()
+        invalidate_recipe_detail(self.recipe.pk)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'id="recipe-nutrition"')
+        self.assertContains(response, "<strong>200</strong>")
+
+    def test_get_missing_recipe_returns_404(self):
+        url = reverse("recipe_detail", kwargs={"pk": self.recipe.pk + 1})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_repeated_views_are_served_from_cache(self):
+        self.client.get(self.url)
+        # Only the author is loaded; the recipe and its children come from cache.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Flour")
+
+    def test_editing_a_recipe_invalidates_the_cache(self):
+        self.client.get(self.url)
+        self.recipe.title = "Waffles"
+        self.recipe.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, "Waffles")
+
+    def test_adding_an_ingredient_invalidates_the_cache(self):
+        self.client.get(self.url)
+        Ingredient.objects.create(recipe=self.recipe, name="Milk")
+        response = self.client.get(self.url)
+        self.assertContains(response, "Milk")
+
+    def test_recipe_image_is_rendered_with_srcset(self):
+        self.recipe.image = default_storage.save(
+            "recipe/images/photo.jpg", make_image_file()
+        )
+        self.recipe.save()
+        generate_variants(self.recipe.image.name)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'type="image/webp"')
+        self.assertContains(response, "640w")
@@ -0,0 +1,96 @@
+"""Tests of the recipe draft view."""
+
+import json
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import Recipe, User
+from recipes.services import load_draft
+
+
+class RecipeDraftViewTestCase(TestCase):
+    """Tests of the recipe draft view."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=self.user, title="Pancakes")
+        self.url = reverse("recipe_draft")
+        self.update_url = reverse("recipe_update_draft", kwargs={"pk": self.recipe.pk})
+
+    def _post(self, payload, url=None):
+        self.client.login(username=self.user.username, password="Password123")
+        return self.client.post(
+            url or self.url, json.dumps(payload), content_type="application/json"
+        )
+
+    def test_recipe_draft_urls(self):
+        self.assertEqual(self.url, "/recipe/create/draft/")
+        self.assertEqual(self.update_url, f"/recipes/{self.recipe.pk}/edit/draft/")
+
+    def test_patch_is_saved(self):
+        response = self._post(
+            {
+                "title": "Soup",
+                "ingredients-TOTAL_FORMS": "2",
+                "ingredients-1-name": "Leek",
+                "instructions-0-DELETE": None,
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("expires_at", response.json())
+        self.assertEqual(
+            load_draft(self.user),
+            {
+                "title": "Soup",
+                "ingredients-TOTAL_FORMS": "2",
+                "ingredients-1-name": "Leek",
+            },
+        )
+
+    def test_patch_of_an_edited_recipe_is_saved_with_it(self):
+        self._post({"title": "Crêpes"}, self.update_url)
+        self.assertEqual(load_draft(self.user, self.recipe), {"title": "Crêpes"})
+        self.assertEqual(load_draft(self.user), {})
+
+    def test_draft_redirects_when_not_logged_in(self):
+        response = self.client.post(
+            self.url, json.dumps({"title": "Soup"}), content_type="application/json"
+        )
+        self.assertRedirects(response, reverse("log_in") + "?next=" + self.url)
+
+    def test_get_is_not_allowed(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_cannot_draft_other_users_recipes(self):
+        other = User.objects.create_user(
+            username="@janedoe", email="jane@example.org", password="Password123"
+        )
+        self.recipe.author = other
+        self.recipe.save()
+        response = self._post({"title": "Mine now"}, self.update_url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_or_file_fields_are_rejected(self):
+        for payload in (
+            ["title"],
+            {"author": 2},
+            {"image": "x.jpg"},
+            {"instructions-0-image": "x.jpg"},
+            {"steps-0-name": "x"},
+            {"title": {"nested": True}},
+        ):
+            with self.subTest(payload=payload):
+                self.assertEqual(self._post(payload).status_code, 400)
+        self.assertEqual(load_draft(self.user), {})
+
+    def test_malformed_json_is_rejected(self):
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.post(self.url, "{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_oversized_draft_is_rejected(self):
+        with self.settings(RECIPE_DRAFTS={"MAX_BYTES": 100}):
+            response = self._post({"description": "".join(map(str, range(500)))})
+        self.assertEqual(response.status_code, 413)
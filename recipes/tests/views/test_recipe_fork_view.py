@@ -0,0 +1,53 @@
+"""Tests of the recipe fork view."""
+
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import Ingredient, Recipe, User
+
+
+class RecipeForkViewTestCase(TestCase):
+    """Tests of the recipe fork view."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        owner = User.objects.create_user("@janedoe", password="Password123")
+        self.recipe = Recipe.objects.create(author=owner, title="Pancakes")
+        Ingredient.objects.create(recipe=self.recipe, name="Flour")
+        self.url = reverse("recipe_fork", kwargs={"pk": self.recipe.pk})
+
+    def test_recipe_fork_url(self):
+        self.assertEqual(self.url, f"/recipes/{self.recipe.pk}/fork/")
+
+    def test_fork_redirects_to_the_edit_form_of_the_copy(self):
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.post(self.url, follow=True)
+        fork = Recipe.objects.get(author=self.user)
+        self.assertRedirects(response, reverse("recipe_update", kwargs={"pk": fork.pk}))
+        self.assertEqual(fork.title, "Pancakes")
+        self.assertEqual(fork.ingredients.get().name, "Flour")
+        self.assertEqual(
+            [str(message) for message in response.context["messages"]],
+            ["Recipe forked!"],
+        )
+
+    def test_fork_redirects_when_not_logged_in(self):
+        response = self.client.post(self.url)
+        self.assertRedirects(response, reverse("log_in") + "?next=" + self.url)
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    def test_get_is_not_allowed(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_fork_of_missing_recipe_is_not_found(self):
+        self.client.login(username=self.user.username, password="Password123")
+        url = reverse("recipe_fork", kwargs={"pk": self.recipe.pk + 1})
+        self.assertEqual(self.client.post(url).status_code, 404)
+
+    def test_detail_page_offers_fork_to_logged_in_users(self):
+        detail_url = reverse("recipe_detail", kwargs={"pk": self.recipe.pk})
+        self.assertNotContains(self.client.get(detail_url), self.url)
+        self.client.login(username=self.user.username, password="Password123")
+        self.assertContains(self.client.get(detail_url), self.url)
@@ -0,0 +1,120 @@
+"""Tests of the recipe history and restore views."""
+
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import Ingredient, Recipe, User
+from recipes.services import ChildChanges, create_recipe, update_recipe
+
+
+class RecipeHistoryViewTestCase(TestCase):
+    """Tests of the recipe history and restore views."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        self.recipe = create_recipe(
+            Recipe(author=self.user, title="Pancakes"),
+            [Ingredient(name="Flour")],
+            [],
+        )
+        self.recipe.title = "Crepes"
+        update_recipe(self.recipe, ChildChanges([], [], []), ChildChanges([], [], []))
+        self.url = reverse("recipe_history", kwargs={"pk": self.recipe.pk})
+        self.restore_url = reverse(
+            "recipe_restore", kwargs={"pk": self.recipe.pk, "number": 1}
+        )
+
+    def _log_in(self, username="@johndoe"):
+        self.client.login(username=username, password="Password123")
+
+    def test_recipe_history_urls(self):
+        self.assertEqual(self.url, f"/recipes/{self.recipe.pk}/history/")
+        self.assertEqual(
+            self.restore_url, f"/recipes/{self.recipe.pk}/history/1/restore/"
+        )
+
+    def test_history_shows_the_latest_version(self):
+        self._log_in()
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, "recipe_history.html")
+        self.assertEqual(response.context["version"].number, 2)
+        self.assertEqual(
+            [revision["number"] for revision in response.context["page_obj"]], [2, 1]
+        )
+        self.assertNotContains(response, self.restore_url)
+
+    def test_history_shows_an_older_version_with_restore(self):
+        self._log_in()
+        response = self.client.get(self.url, {"revision": 1})
+        self.assertEqual(response.context["version"].recipe.title, "Pancakes")
+        self.assertContains(response, self.restore_url)
+
+    def test_unknown_revision_is_not_found(self):
+        self._log_in()
+        self.assertEqual(self.client.get(self.url, {"revision": 9}).status_code, 404)
+        self.assertEqual(self.client.get(self.url, {"revision": "x"}).status_code, 404)
+
+    def test_recipe_without_history_shows_message(self):
+        legacy = Recipe.objects.create(author=self.user, title="Toast")
+        self._log_in()
+        response = self.client.get(reverse("recipe_history", kwargs={"pk": legacy.pk}))
+        self.assertContains(response, "This recipe has no saved history yet.")
+
+    def test_history_of_other_users_recipes_is_not_found(self):
+        User.objects.create_user("@janedoe", password="Password123")
+        self._log_in("@janedoe")
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.post(self.restore_url).status_code, 404)
+
+    def test_history_redirects_when_not_logged_in(self):
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse("log_in") + "?next=" + self.url)
+
+    def test_restore_rolls_back_and_redirects(self):
+        self._log_in()
+        response = self.client.post(self.restore_url, follow=True)
+        self.assertRedirects(
+            response, reverse("recipe_detail", kwargs={"pk": self.recipe.pk})
+        )
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.title, "Pancakes")
+        self.assertEqual(self.recipe.revisions.count(), 3)
+        self.assertEqual(
+            [str(message) for message in response.context["messages"]],
+            ["Recipe restored to revision 1."],
+        )
+
+    def test_restore_of_unknown_revision_is_not_found(self):
+        self._log_in()
+        url = reverse("recipe_restore", kwargs={"pk": self.recipe.pk, "number": 9})
+        self.assertEqual(self.client.post(url).status_code, 404)
+
+    def test_restore_requires_post(self):
+        self._log_in()
+        self.assertEqual(self.client.get(self.restore_url).status_code, 405)
+
+    def test_restore_of_stale_version_redirects_to_history(self):
+        self._log_in()
+        stale_version = self.recipe.version
+        self.recipe.title = "Galettes"
+        update_recipe(self.recipe, ChildChanges([], [], []), ChildChanges([], [], []))
+        response = self.client.post(
+            self.restore_url, {"version": stale_version}, follow=True
+        )
+        self.assertRedirects(response, self.url)
+        self.assertEqual(
+            [str(message) for message in response.context["messages"]],
+            [
+                "This recipe was changed since you opened its history. "
+                "Review the latest version, then restore again."
+            ],
+        )
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.title, "Galettes")
+        self.assertEqual(self.recipe.revisions.count(), 3)
+
+    def test_history_posts_the_current_version(self):
+        self._log_in()
+        response = self.client.get(self.url, {"revision": 1})
+        self.assertContains(response, f'name="version" value="{self.recipe.version}"')
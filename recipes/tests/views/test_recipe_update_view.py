@@ -0,0 +1,297 @@
+"""Tests of the recipe update view."""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from recipes.models import Ingredient, Instruction, Job, Recipe, User
+from recipes.services import load_draft, save_draft, spaced_step
+from recipes.tests.helpers import make_image_file
+
+
+class RecipeUpdateViewTestCase(TestCase):
+    """Tests of the recipe update view."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=self.user, title="Pancakes")
+        self.ingredients = [
+            Ingredient.objects.create(recipe=self.recipe, name=name, quantity=1)
+            for name in ("Flour", "Milk", "Eggs")
+        ]
+        self.instructions = [
+            Instruction.objects.create(
+                recipe=self.recipe, step=spaced_step(rank), description=description
+            )
+            for rank, description in enumerate(("Mix", "Rest", "Fry"), start=1)
+        ]
+        self.url = reverse("recipe_update", kwargs={"pk": self.recipe.pk})
+
+    def _form_input(self):
+        data = {
+            "title": "Pancakes",
+            "description": "",
+            "difficulty": Recipe.Difficulty.EASY,
+            "time": "30",
+            "servings": "4",
+            "ingredients-TOTAL_FORMS": str(len(self.ingredients)),
+            "ingredients-INITIAL_FORMS": str(len(self.ingredients)),
+            "instructions-TOTAL_FORMS": str(len(self.instructions)),
+            "instructions-INITIAL_FORMS": str(len(self.instructions)),
+        }
+        for index, ingredient in enumerate(self.ingredients):
+            data[f"ingredients-{index}-id"] = str(ingredient.pk)
+            data[f"ingredients-{index}-name"] = ingredient.name
+            data[f"ingredients-{index}-quantity"] = str(ingredient.quantity)
+            data[f"ingredients-{index}-unit"] = ingredient.unit
+        for index, instruction in enumerate(self.instructions):
+            data[f"instructions-{index}-id"] = str(instruction.pk)
+            data[f"instructions-{index}-step"] = str(index + 1)
+            data[f"instructions-{index}-description"] = instruction.description
+        return data
+
+    def _post(self, data):
+        self.client.login(username=self.user.username, password="Password123")
+        return self.client.post(self.url, data)
+
+    def test_recipe_update_url(self):
+        self.assertEqual(self.url, f"/recipes/{self.recipe.pk}/edit/")
+
+    def test_get_recipe_update_shows_existing_rows(self):
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "recipe_update.html")
+        self.assertContains(response, "Save Changes")
+        self.assertEqual(
+            response.context["instruction_formset"].initial_form_count(), 3
+        )
+
+    def test_get_recipe_update_redirects_when_not_logged_in(self):
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse("log_in") + "?next=" + self.url)
+
+    def test_other_users_cannot_edit(self):
+        other = User.objects.create_user(
+            username="@janedoe", email="jane@example.org", password="Password123"
+        )
+        self.recipe.author = other
+        self.recipe.save()
+        response = self._post(self._form_input())
+        self.assertEqual(response.status_code, 404)
+
+    def test_successful_update_redirects_to_recipe(self):
+        data = self._form_input()
+        data["title"] = "Fluffy pancakes"
+        response = self._post(data)
+        self.assertRedirects(
+            response, reverse("recipe_detail", kwargs={"pk": self.recipe.pk})
+        )
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.title, "Fluffy pancakes")
+
+    def test_unchanged_children_are_not_written(self):
+        data = self._form_input()
+        data["ingredients-1-quantity"] = "2"
+        self.client.login(username=self.user.username, password="Password123")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, data)
+        writes = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+            and "django_session" not in query["sql"]
+            and "recipes_recipedraft" not in query["sql"]
+            and "recipes_reciperevision" not in query["sql"]
+            and "recipes_recipesummary" not in query["sql"]
+        ]
+        self.assertEqual(len(writes), 3)
+        self.assertTrue(writes[0].startswith('UPDATE "recipes_recipe"'))
+        self.assertTrue(writes[1].startswith('UPDATE "recipes_recipe"'))
+        self.assertTrue(writes[2].startswith('UPDATE "recipes_ingredient"'))
+        self.assertEqual(Ingredient.objects.get(name="Milk").quantity, 2)
+
+    def test_rows_keep_their_ids(self):
+        ids = set(Ingredient.objects.values_list("pk", flat=True))
+        data = self._form_input()
+        data["ingredients-0-name"] = "Spelt flour"
+        self._post(data)
+        self.assertEqual(set(Ingredient.objects.values_list("pk", flat=True)), ids)
+
+    def test_steps_can_be_swapped(self):
+        data = self._form_input()
+        data["instructions-0-step"] = "3"
+        data["instructions-2-step"] = "1"
+        self._post(data)
+        self.assertEqual(
+            list(
+                self.recipe.instructions.order_by("step").values_list(
+                    "description", flat=True
+                )
+            ),
+            ["Fry", "Rest", "Mix"],
+        )
+
+    def test_ingredient_names_can_be_swapped(self):
+        data = self._form_input()
+        data["ingredients-0-name"] = "Milk"
+        data["ingredients-1-name"] = "Flour"
+        self._post(data)
+        self.assertEqual(Ingredient.objects.get(pk=self.ingredients[0].pk).name, "Milk")
+
+    def test_rows_can_be_added_and_removed(self):
+        data = self._form_input()
+        data["instructions-1-DELETE"] = "on"
+        data["instructions-2-step"] = "2"
+        data["instructions-TOTAL_FORMS"] = "4"
+        data["instructions-3-step"] = "3"
+        data["instructions-3-description"] = "Serve"
+        self._post(data)
+        self.assertEqual(
+            list(
+                self.recipe.instructions.order_by("step").values_list(
+                    "description", flat=True
+                )
+            ),
+            ["Mix", "Fry", "Serve"],
+        )
+        self.assertFalse(Instruction.objects.filter(description="Rest").exists())
+
+    def test_duplicate_steps_are_rejected(self):
+        data = self._form_input()
+        data["instructions-2-step"] = "1"
+        response = self._post(data)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context["instruction_formset"].is_valid())
+        self.assertEqual(
+            Instruction.objects.get(pk=self.instructions[2].pk).step, spaced_step(3)
+        )
+
+    def test_new_instruction_image_is_stored_and_queued(self):
+        data = self._form_input()
+        data["instructions-0-image"] = make_image_file("step.jpg")
+        self._post(data)
+        instruction = Instruction.objects.get(pk=self.instructions[0].pk)
+        self.assertTrue(instruction.image.storage.exists(instruction.image.name))
+        self.assertTrue(instruction.image_placeholder.startswith("data:image/"))
+        self.assertEqual(
+            list(Job.objects.values_list("payload__source", flat=True)),
+            [instruction.image.name],
+        )
+
+    def test_forms_show_step_numbers_rather_than_sort_keys(self):
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.url)
+        formset = response.context["instruction_formset"]
+        self.assertEqual(
+            [form.initial["step"] for form in formset.initial_forms], [1, 2, 3]
+        )
+
+    def test_moved_instruction_keeps_its_sort_key_when_order_is_unchanged(self):
+        Instruction.objects.filter(pk=self.instructions[2].pk).update(step=1536)
+        self.instructions[1], self.instructions[2] = (
+            self.instructions[2],
+            self.instructions[1],
+        )
+        data = self._form_input()
+        data["ingredients-1-quantity"] = "2"
+        self.client.login(username=self.user.username, password="Password123")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, data)
+        self.assertFalse(
+            any(
+                '"recipes_instruction"' in query["sql"]
+                and query["sql"].startswith("UPDATE")
+                for query in queries.captured_queries
+            )
+        )
+        self.assertEqual(Instruction.objects.get(pk=self.instructions[1].pk).step, 1536)
+
+    def test_moved_instructions_take_keys_between_unmoved_ones(self):
+        data = self._form_input()
+        data["instructions-0-step"] = "2"
+        data["instructions-1-step"] = "1"
+        self._post(data)
+        self.assertEqual(
+            list(
+                self.recipe.instructions.order_by("step").values_list(
+                    "description", "step"
+                )
+            ),
+            [("Rest", 1024), ("Mix", 2048), ("Fry", spaced_step(3))],
+        )
+
+    def test_form_is_filled_in_from_draft(self):
+        save_draft(
+            self.user,
+            {
+                "title": "Fluffy pancakes",
+                "instructions-1-id": str(self.instructions[1].pk),
+                "instructions-1-description": "Rest for an hour",
+                "instructions-2-id": "999999",
+                "instructions-2-description": "Not this row",
+            },
+            self.recipe,
+        )
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["form"]["title"].value(), "Fluffy pancakes")
+        forms = response.context["instruction_formset"].forms
+        self.assertEqual(forms[1]["description"].value(), "Rest for an hour")
+        self.assertEqual(forms[2]["description"].value(), "Fry")
+
+    def test_successful_update_discards_draft(self):
+        save_draft(self.user, {"title": "Fluffy pancakes"}, self.recipe)
+        self._post(self._form_input())
+        self.assertEqual(load_draft(self.user, self.recipe), {})
+
+    def test_form_carries_the_version_it_was_opened_at(self):
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.url)
+        self.assertContains(response, '<input type="hidden" name="version" value="1">')
+
+    def test_successful_update_increments_the_version(self):
+        data = self._form_input()
+        data["version"] = "1"
+        self._post(data)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.version, 2)
+
+    def test_concurrent_edit_shows_conflict_without_saving(self):
+        Recipe.objects.filter(pk=self.recipe.pk).update(title="Crepes", version=2)
+        data = self._form_input()
+        data["version"] = "1"
+        data["title"] = "Waffles"
+        data["ingredients-1-quantity"] = "3"
+        response = self._post(data)
+        self.assertEqual(response.status_code, 409)
+        self.assertTemplateUsed(response, "recipe_update.html")
+        self.assertEqual(response.context["conflict"].title, "Crepes")
+        self.assertEqual(response.context["conflict_fields"], [("Title", "Crepes")])
+        self.assertContains(
+            response, '<input type="hidden" name="version" value="2">', status_code=409
+        )
+        self.assertEqual(response.context["form"]["title"].value(), "Waffles")
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.title, "Crepes")
+        self.assertEqual(Ingredient.objects.get(name="Milk").quantity, 1)
+
+    def test_saving_after_a_conflict_keeps_the_users_changes(self):
+        Recipe.objects.filter(pk=self.recipe.pk).update(title="Crepes", version=2)
+        data = self._form_input()
+        data["version"] = "2"
+        data["title"] = "Waffles"
+        response = self._post(data)
+        self.assertEqual(response.status_code, 302)
+        self.recipe.refresh_from_db()
+        self.assertEqual((self.recipe.title, self.recipe.version), ("Waffles", 3))
+
+    def test_invalid_submission_keeps_the_posted_version(self):
+        Recipe.objects.filter(pk=self.recipe.pk).update(version=2)
+        data = self._form_input()
+        data["version"] = "1"
+        data["title"] = ""
+        response = self._post(data)
+        self.assertEqual(response.context["expected_version"], 1)
@@ -0,0 +1,51 @@
+"""Tests of the shopping list view."""
+
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import Ingredient, Recipe, User
+from recipes.tests.helpers import reverse_with_next
+
+
+class ShoppingListViewTestCase(TestCase):
+    """Tests of the shopping list view."""
+
+    fixtures = ["recipes/tests/fixtures/default_user.json"]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+        self.recipe = Recipe.objects.create(author=self.user, title="Soup")
+        Ingredient.objects.create(recipe=self.recipe, name="Leek", quantity=2)
+        self.url = reverse("shopping_list")
+
+    def test_shopping_list_url(self):
+        self.assertEqual(self.url, "/shopping-list/")
+
+    def test_get_shopping_list_redirects_when_not_logged_in(self):
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse_with_next("log_in", self.url))
+
+    def test_get_shopping_list_lists_own_recipes(self):
+        self.client.login(username="@johndoe", password="Password123")
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, "shopping_list.html")
+        self.assertContains(response, "Soup")
+        self.assertEqual(response.context["items"], [])
+
+    def test_get_shopping_list_of_selected_recipes(self):
+        self.client.login(username="@johndoe", password="Password123")
+        response = self.client.get(
+            self.url, {"recipe": [self.recipe.pk, "x"], "servings": 8}
+        )
+        self.assertEqual(response.context["selected"], [self.recipe.pk])
+        self.assertEqual(str(response.context["items"][0].quantity), "4.000")
+        self.assertContains(response, "Leek")
+
+    def test_out_of_range_servings_are_ignored(self):
+        self.client.login(username="@johndoe", password="Password123")
+        for servings in (0, 1001, 10**30):
+            response = self.client.get(
+                self.url, {"recipe": self.recipe.pk, "servings": servings}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(response.context["servings"])
+            self.assertEqual(str(response.context["items"][0].quantity), "2.000")
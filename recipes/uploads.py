@@ -0,0 +1,146 @@
+"""
+Upload handlers for the ``recipes`` app.
+
+`StreamingImageUploadHandler` is installed through
+``settings.FILE_UPLOAD_HANDLERS`` and receives every uploaded file, so
+recipe and instruction images never reach Pillow, or worker memory, before
+their size has been checked.
+"""
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+IMAGE_UPLOAD_DEFAULTS = {
+    "MAX_FILE_BYTES": 10 * 1024 * 1024,
+    "MAX_REQUEST_BYTES": 25 * 1024 * 1024,
+    "MAX_PIXELS": 24_000_000,
+    "MAX_EDGE": 4096,
+}
+
+DOWNSCALE_FORMATS = {"JPEG": {"quality": 90}, "PNG": {}, "WEBP": {"quality": 90}}
+
+
+class StreamingImageUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream uploads to temporary files within per-file and per-request caps.
+
+    Requests larger than ``IMAGE_UPLOADS["MAX_REQUEST_BYTES"]`` are refused
+    with a 400 response as soon as the limit is crossed. A file larger than
+    ``IMAGE_UPLOADS["MAX_FILE_BYTES"]`` stops being written to disk, and is
+    handed to the form with an ``upload_error`` that `UploadedImageField`
+    reports as a validation error.
+
+    Once a file is complete its pixel dimensions are read from the image
+    header. Images with more than ``IMAGE_UPLOADS["MAX_PIXELS"]`` pixels are
+    rejected without being decoded, and images with a side longer than
+    ``IMAGE_UPLOADS["MAX_EDGE"]`` are downscaled before anything else sees
+    them. JPEG images are decoded at a reduced scale while doing so, which
+    keeps the memory used per upload bounded.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.request_bytes = 0
+        self.upload_error = None
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        """Refuse requests whose declared length is over the request cap."""
+        if content_length > _config("MAX_REQUEST_BYTES"):
+            raise RequestDataTooBig(_request_too_big_message())
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.upload_error = None
+
+    def receive_data_chunk(self, raw_data, start):
+        self.request_bytes += len(raw_data)
+        if self.request_bytes > _config("MAX_REQUEST_BYTES"):
+            raise RequestDataTooBig(_request_too_big_message())
+        if self.upload_error:
+            return None
+        max_file_bytes = _config("MAX_FILE_BYTES")
+        if start + len(raw_data) > max_file_bytes:
+            self.upload_error = (
+                f"This file is too large. Images can be at most "
+                f"{filesizeformat(max_file_bytes)}."
+            )
+            self.file.truncate(0)
+            return None
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.upload_error:
+            self.file.seek(0)
+            self.file.size = 0
+            self.file.upload_error = self.upload_error
+            return self.file
+        return prepare_uploaded_image(super().file_complete(file_size))
+
+
+def prepare_uploaded_image(uploaded_file):
+    """
+    Check an uploaded image's dimensions and downscale it if needed.
+
+    Only the image header is read to find the dimensions. Files that are not
+    images are returned unchanged, for form validation to reject.
+
+    Args:
+        uploaded_file (TemporaryUploadedFile): The complete upload.
+
+    Returns:
+        TemporaryUploadedFile: ``uploaded_file``, or a downscaled copy of it.
+        Rejected images get an ``upload_error`` attribute.
+    """
+    max_edge = _config("MAX_EDGE")
+    try:
+        with Image.open(uploaded_file) as image:
+            width, height = image.size
+            if width * height > _config("MAX_PIXELS"):
+                uploaded_file.upload_error = (
+                    f"This image is too large ({width}x{height} pixels)."
+                )
+            elif max(width, height) > max_edge and image.format in DOWNSCALE_FORMATS:
+                return _downscale(uploaded_file, image, max_edge)
+    except Image.DecompressionBombError:
+        uploaded_file.upload_error = "This image is too large."
+    except (UnidentifiedImageError, OSError):
+        pass
+    uploaded_file.seek(0)
+    return uploaded_file
+
+
+def _downscale(uploaded_file, image, max_edge):
+    """Return a copy of ``uploaded_file`` no larger than ``max_edge``."""
+    image_format = image.format
+    image.draft(image.mode, (max_edge, max_edge))
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    downscaled = TemporaryUploadedFile(
+        uploaded_file.name,
+        uploaded_file.content_type,
+        0,
+        uploaded_file.charset,
+        uploaded_file.content_type_extra,
+    )
+    image.save(downscaled.file, image_format, **DOWNSCALE_FORMATS[image_format])
+    downscaled.size = downscaled.tell()
+    downscaled.seek(0)
+    uploaded_file.close()
+    return downscaled
+
+
+def _request_too_big_message():
+    return (
+        f"Uploads are limited to "
+        f"{filesizeformat(_config('MAX_REQUEST_BYTES'))} per request."
+    )
+
+
+def _config(name):
+    return getattr(settings, "IMAGE_UPLOADS", {}).get(name, IMAGE_UPLOAD_DEFAULTS[name])
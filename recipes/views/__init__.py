@@ -1,10 +1,18 @@
 from .dashboard_view import *
 from .home_view import *
+from .instruction_move_view import *
 from .log_in_view import *
 from .log_out_view import *
 from .password_view import *
 from .profile_view import *
+from .recipe_bulk_create_view import *
 from .recipe_create_view import *
+from .recipe_draft_view import *
+from .recipe_fork_view import *
+from .recipe_history_view import *
+from .recipe_restore_view import *
+from .recipe_update_view import *
 from .sign_up_view import *
 from .user_list_view import *
 from .recipe_detail_view import *
+from .shopping_list_view import *
@@ -10,8 +10,9 @@ def dashboard(request):
     This view renders the dashboard page for the authenticated user.
     It ensures that only logged-in users can access the page. If a user
     is not authenticated, they are automatically redirected to the login
-    page.
+    page. The user's newest recipes are listed from their summaries.
     """
 
     current_user = request.user
-    return render(request, "dashboard.html", {"user": current_user})
+    recipes = current_user.recipe_summaries.order_by("-created_at")[:10]
+    return render(request, "dashboard.html", {"user": current_user, "recipes": recipes})
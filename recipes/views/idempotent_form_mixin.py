@@ -0,0 +1,59 @@
+from django.http import HttpResponseRedirect
+from recipes.services import (
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    issue_idempotency_key,
+    replayed_location,
+    run_once,
+)
+
+
+class IdempotentFormMixin:
+    """
+    View mixin making a form's submission safe to replay.
+
+    Each rendered form carries a fresh key in a hidden
+    ``idempotency_key`` field. A POST whose key has already been used is
+    answered with the redirect of the first submission, before any of the
+    form is validated, and the writes of ``form_valid`` are carried out
+    through `run_once`, so that concurrent duplicates cannot both succeed.
+    Posts without a key are handled as usual.
+    """
+
+    idempotency_key_field = "idempotency_key"
+
+    def get_idempotency_key(self):
+        """Return the key posted with the form, or ``None``."""
+        key = self.request.POST.get(self.idempotency_key_field, "")
+        if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return None
+        return key
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == "POST" and request.user.is_authenticated:
+            key = self.get_idempotency_key()
+            if key is not None:
+                location = replayed_location(request.user, key)
+                if location is not None:
+                    return HttpResponseRedirect(location)
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        """Add the key to render the form with, reusing a posted one."""
+        kwargs.setdefault(
+            "idempotency_key", self.get_idempotency_key() or issue_idempotency_key()
+        )
+        return super().get_context_data(**kwargs)
+
+    def run_once(self, action):
+        """
+        Carry out ``action`` unless this submission already has been.
+
+        Args:
+            action (callable): Saves the submission and returns the location
+                to redirect to.
+
+        Returns:
+            tuple[str, bool]: The location to redirect to, and whether the
+            submission is a replay, so ``action`` was not run.
+        """
+        return run_once(self.request.user, self.get_idempotency_key(), action)
@@ -0,0 +1,61 @@
+import json
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.db.models import F
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_POST
+from recipes.models import Instruction, Recipe
+from recipes.services import (
+    ensure_revision_history,
+    invalidate_recipe_detail,
+    move_instruction,
+    record_revision,
+)
+
+
+@login_required
+@require_POST
+def instruction_move(request, pk, instruction_pk):
+    """
+    Move an instruction of the current user's recipe, for drag and drop.
+
+    The request body is a JSON object whose ``after`` member is the id of
+    the instruction the moved one should follow, or ``null`` to make it the
+    first step. Only the moved instruction's row is written. The response
+    holds the instruction's id, its new step number and its sort key. The
+    move is recorded as a new revision of the recipe and increments its
+    version, so an edit form opened before the move reports a conflict
+    rather than undoing it. Instructions of other users' recipes are not
+    found.
+    """
+    instructions = Instruction.objects.filter(recipe_id=pk, recipe__author=request.user)
+    instruction = get_object_or_404(instructions, pk=instruction_pk)
+    try:
+        after_pk = json.loads(request.body)["after"]
+    except (ValueError, TypeError, KeyError):
+        return JsonResponse(
+            {"error": "Expected a JSON object with 'after'."}, status=400
+        )
+    after = None
+    if after_pk is not None:
+        if (
+            isinstance(after_pk, bool)
+            or not isinstance(after_pk, int)
+            or after_pk == instruction.pk
+        ):
+            return JsonResponse({"error": "Invalid 'after' instruction."}, status=400)
+        after = get_object_or_404(instructions, pk=after_pk)
+
+    with transaction.atomic():
+        # Locks the recipe first, so that a missing history is started from
+        # the recipe before the move; the version is not part of a revision.
+        Recipe.objects.filter(pk=pk).update(version=F("version") + 1)
+        previous = ensure_revision_history(pk)
+        move_instruction(instruction, after)
+        record_revision(pk, previous)
+        transaction.on_commit(lambda: invalidate_recipe_detail(pk))
+    rank = instructions.filter(step__lt=instruction.step).count() + 1
+    return JsonResponse(
+        {"id": instruction.pk, "step": rank, "sort_key": instruction.step}
+    )
@@ -0,0 +1,74 @@
+import json
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+from recipes.forms import BulkRecipeValidator, RecipeForm
+from recipes.services import create_recipes, spaced_step
+from recipes.views.decorators import api_login_required
+from recipes.views.recipe_formsets_mixin import IngredientFormSet, InstructionFormSet
+
+BULK_CREATE_MAX_ITEMS = 1000
+
+
+@api_login_required
+@require_POST
+def recipe_bulk_create(request):
+    """
+    Create many recipes for the current user from one JSON request.
+
+    The request body is a JSON array of recipes. Each one is an object with
+    the fields of `RecipeForm`, except the image, and ``ingredients`` and
+    ``instructions`` arrays of objects with the fields of `IngredientForm`
+    and `InstructionForm`. Recipes are validated with the rules of the
+    create view's forms and formsets, and the valid ones are inserted in
+    batches.
+
+    The response holds one result per recipe, in request order: its ``id``
+    if it was created, or its ``errors`` otherwise. Invalid recipes do not
+    prevent the others from being created.
+
+    Partner integrations authenticate with an API token, issued by
+    ``manage.py create_api_token``, in an ``Authorization: Bearer`` header.
+    Browser sessions work too, with their CSRF token. Requests without
+    valid credentials are answered with a JSON 401 error.
+    """
+    try:
+        items = json.loads(request.body)
+    except ValueError:
+        items = None
+    if not isinstance(items, list):
+        return JsonResponse({"error": "Expected a JSON array of recipes."}, status=400)
+    if len(items) > BULK_CREATE_MAX_ITEMS:
+        return JsonResponse(
+            {"error": f"At most {BULK_CREATE_MAX_ITEMS} recipes can be sent at once."},
+            status=413,
+        )
+
+    validator = BulkRecipeValidator(
+        RecipeForm,
+        {"ingredients": IngredientFormSet, "instructions": InstructionFormSet},
+    )
+    results, entries = [], []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append(
+                {"status": "invalid", "errors": {"__all__": ["Expected an object."]}}
+            )
+            continue
+        (recipe, children), errors = validator.validate(item, author=request.user)
+        if errors:
+            results.append({"status": "invalid", "errors": errors})
+            continue
+        instructions = sorted(children["instructions"], key=lambda row: row.step)
+        for rank, instruction in enumerate(instructions, start=1):
+            instruction.step = spaced_step(rank)
+        results.append({"status": "created"})
+        entries.append((recipe, children["ingredients"], instructions))
+
+    recipes = iter(create_recipes(entries))
+    for result in results:
+        if result["status"] == "created":
+            result["id"] = next(recipes).pk
+    created = len(entries)
+    return JsonResponse(
+        {"created": created, "invalid": len(items) - created, "results": results}
+    )
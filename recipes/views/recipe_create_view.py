@@ -1,117 +1,61 @@
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.forms import inlineformset_factory
+from django.http import HttpResponseRedirect
 from django.views.generic.edit import FormView
 from django.urls import reverse
-from recipes.forms import RecipeForm, IngredientForm, InstructionForm
-from recipes.models import Recipe, Ingredient, Instruction
-
-
-IngredientFormSet = inlineformset_factory(
-    Recipe,
-    Ingredient,
-    form=IngredientForm,
-    extra=1,
-    can_delete=True,
-    min_num=1,
-    validate_min=True,
-)
-
-InstructionFormSet = inlineformset_factory(
-    Recipe,
-    Instruction,
-    form=InstructionForm,
-    extra=1,
-    can_delete=True,
-    min_num=1,
-    validate_min=True,
-)
-
-
-class RecipeCreateView(LoginRequiredMixin, FormView):
+from recipes.forms import RecipeForm
+from recipes.services import create_recipe
+from recipes.views.idempotent_form_mixin import IdempotentFormMixin
+from recipes.views.recipe_draft_mixin import RecipeDraftMixin
+from recipes.views.recipe_formsets_mixin import RecipeFormsetsMixin
+
+
+class RecipeCreateView(
+    LoginRequiredMixin,
+    RecipeDraftMixin,
+    RecipeFormsetsMixin,
+    IdempotentFormMixin,
+    FormView,
+):
     """
     Allow authenticated users to create a new recipe.
 
     Access is restricted to logged-in users
-    via `LoginRequiredMixin`.
+    via `LoginRequiredMixin`. The form is filled in from the user's
+    autosaved draft, if there is one. A form submitted twice, by a double
+    click or a retried request, creates the recipe once, and the repeated
+    submission is redirected where the first one was.
     """
 
     form_class = RecipeForm
     template_name = "recipe_create.html"
 
-    def get_form_kwargs(self):
-        """Return the keyword arguments for instantiating the form."""
-        kwargs = super().get_form_kwargs()
-        if self.request.method == "POST":
-            kwargs["files"] = self.request.FILES
-        return kwargs
+    def get_formset_instance(self, form):
+        """Bind the formsets to the form's unsaved recipe, by the current user."""
+        form.instance.author = self.request.user
+        return form.instance
 
-    def get_context_data(self, **kwargs):
-        """Add ingredient and instruction formsets to context."""
-        context = super().get_context_data(**kwargs)
-        if self.request.method == "POST":
-            context["ingredient_formset"] = IngredientFormSet(
-                self.request.POST, self.request.FILES, instance=None
-            )
-            context["instruction_formset"] = InstructionFormSet(
-                self.request.POST, self.request.FILES, instance=None
-            )
-        else:
-            context["ingredient_formset"] = IngredientFormSet(instance=None)
-            context["instruction_formset"] = InstructionFormSet(instance=None)
-        return context
-
-    def form_valid(self, form):
+    def form_valid(self, form, ingredient_formset, instruction_formset):
         """
-        Handle valid recipe form submissions.
+        Save the validated recipe and its children in a single transaction.
 
         If successful, the method continues to the success URL defined by `get_success_url()`.
         """
-        recipe = form.save(commit=False)
-        recipe.author = self.request.user
-        recipe.save()
 
-        ingredient_formset = IngredientFormSet(
-            self.request.POST, self.request.FILES, instance=recipe
-        )
-        instruction_formset = InstructionFormSet(
-            self.request.POST, self.request.FILES, instance=recipe
-        )
+        def save():
+            create_recipe(
+                form.save(commit=False),
+                ingredient_formset.save(commit=False),
+                instruction_formset.save(commit=False),
+            )
+            self.discard_draft()
+            return self.get_success_url()
 
-        if ingredient_formset.is_valid() and instruction_formset.is_valid():
-            ingredient_formset.save()
-            instruction_formset.save()
+        location, replayed = self.run_once(save)
+        if not replayed:
             messages.add_message(self.request, messages.SUCCESS, "Recipe created!")
-            return super().form_valid(form)
-        else:
-            # If formset is invalid, delete the recipe and re-render the form with errors
-            recipe.delete()
-            return self.form_invalid(form)
-
-    def form_invalid(self, form):
-        """Handle invalid form submissions."""
-        context = self.get_context_data(form=form)
-        if self.request.method == "POST":
-            # Create unsaved recipe instance for formset validation
-            # This allows formsets to validate even if recipe form has errors
-            try:
-                recipe = form.save(commit=False)
-                recipe.author = self.request.user
-            except (ValueError, AttributeError):
-                # If form is too invalid to create instance, create a minimal one
-                recipe = Recipe(author=self.request.user)
-
-            # Don't save yet, just use for formset validation
-            ingredient_formset = IngredientFormSet(
-                self.request.POST, self.request.FILES, instance=recipe
-            )
-            instruction_formset = InstructionFormSet(
-                self.request.POST, self.request.FILES, instance=recipe
-            )
-            context["ingredient_formset"] = ingredient_formset
-            context["instruction_formset"] = instruction_formset
-        return self.render_to_response(context)
+        return HttpResponseRedirect(location)
 
     def get_success_url(self):
         """
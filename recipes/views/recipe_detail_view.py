@@ -1,9 +1,35 @@
 # recipes/views/recipe_detail_view.py
 
-from django.shortcuts import render, get_object_or_404
-from recipes.models import Recipe
+from django.shortcuts import render
+from recipes.services import get_recipe_detail, scale_ingredients
+
+# The largest number of servings a recipe can be scaled to on its page.
+MAX_SERVINGS = 1000
 
 
 def recipe_detail(request, pk):
-    recipe = get_object_or_404(Recipe, pk=pk)
-    return render(request, "recipe_detail.html", {"recipe": recipe})
+    """
+    Display a recipe, with its ingredients scaled to a number of servings.
+
+    The number of servings is taken from the ``servings`` query parameter,
+    and defaults to the number the recipe makes. The recipe itself is served
+    from the cache and only its ingredients are scaled.
+    """
+    recipe = get_recipe_detail(pk)
+    servings = _requested_servings(request, recipe)
+    ingredients = recipe.ingredients.all()
+    if servings != recipe.servings:
+        ingredients = scale_ingredients(ingredients, servings, recipe.servings)
+    return render(
+        request,
+        "recipe_detail.html",
+        {"recipe": recipe, "ingredients": ingredients, "servings": servings},
+    )
+
+
+def _requested_servings(request, recipe):
+    try:
+        servings = int(request.GET.get("servings", recipe.servings))
+    except ValueError:
+        return recipe.servings
+    return servings if 1 <= servings <= MAX_SERVINGS else recipe.servings
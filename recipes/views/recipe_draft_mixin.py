@@ -0,0 +1,71 @@
+from functools import cached_property
+from recipes.services import discard_draft, load_draft
+
+
+class RecipeDraftMixin:
+    """
+    View mixin filling the recipe form and its formsets from a saved draft.
+
+    When the form is opened, values autosaved through the ``recipe_draft``
+    view are used as the initial values of the recipe form and of the
+    ingredient and instruction rows, so a user picks up where they left
+    off. Drafted rows of an edited recipe are only applied to the row they
+    were typed into. Submitted forms are never affected by the draft, which
+    is discarded once the recipe is saved.
+    """
+
+    def get_draft_recipe(self):
+        """Return the recipe whose draft is used, or ``None`` for a new one."""
+        return None
+
+    @cached_property
+    def draft(self):
+        """Return the current user's drafted form values."""
+        if self.request.method != "GET":
+            return {}
+        return load_draft(self.request.user, self.get_draft_recipe())
+
+    def get_initial(self):
+        initial = super().get_initial()
+        initial.update(
+            {
+                name: value
+                for name, value in self.draft.items()
+                if name in self.get_form_class().base_fields
+            }
+        )
+        return initial
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.draft:
+            for name in ("ingredient_formset", "instruction_formset"):
+                _apply_draft(context[name], self.draft)
+        return context
+
+    def discard_draft(self):
+        """Delete the draft of the recipe that has just been saved."""
+        discard_draft(self.request.user, self.get_draft_recipe())
+
+
+def _apply_draft(formset, draft):
+    prefix = formset.prefix
+    try:
+        total = int(draft[f"{prefix}-TOTAL_FORMS"])
+    except (KeyError, TypeError, ValueError):
+        total = 0
+    total = min(total, formset.max_num)
+    formset.extra = max(
+        total - max(formset.initial_form_count(), formset.min_num), formset.extra
+    )
+    for index, form in enumerate(formset.forms):
+        drafted_id = draft.get(f"{prefix}-{index}-id")
+        if drafted_id is not None and str(drafted_id) != str(form.instance.pk):
+            continue
+        form.initial.update(
+            {
+                name: draft[key]
+                for name in form.fields
+                if name != "id" and (key := f"{prefix}-{index}-{name}") in draft
+            }
+        )
@@ -0,0 +1,54 @@
+import json
+import re
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_POST
+from recipes.forms import RecipeForm
+from recipes.models import Recipe
+from recipes.services import save_draft
+
+# Files cannot be drafted, so image fields are never accepted.
+DRAFT_ROW_FIELD = re.compile(
+    r"(ingredients|instructions)-(TOTAL_FORMS|\d{1,4}-(?!image$)[A-Za-z_]+)"
+)
+
+
+@login_required
+@require_POST
+def recipe_draft(request, pk=None):
+    """
+    Autosave changes to the recipe create or edit form of the current user.
+
+    The request body is a JSON object of the form fields that changed since
+    the last autosave, keyed by their input names. A ``null`` value removes
+    a field from the draft. The draft is loaded back into the form the next
+    time the user opens it, until it expires or the form is submitted.
+    Recipes of other users are not found.
+    """
+    recipe = None
+    if pk is not None:
+        recipe = get_object_or_404(Recipe, pk=pk, author=request.user)
+    try:
+        patch = json.loads(request.body)
+    except ValueError:
+        patch = None
+    if not isinstance(patch, dict) or not all(
+        _is_draft_field(name, value) for name, value in patch.items()
+    ):
+        return JsonResponse(
+            {"error": "Expected a JSON object of form fields."}, status=400
+        )
+    try:
+        draft = save_draft(request.user, patch, recipe)
+    except ValueError as error:
+        return JsonResponse({"error": str(error)}, status=413)
+    return JsonResponse({"expires_at": draft.expires_at.isoformat()})
+
+
+def _is_draft_field(name, value):
+    if value is not None and not isinstance(value, (str, int, float, bool)):
+        return False
+    if name in RecipeForm.base_fields:
+        return name != "image"
+    return DRAFT_ROW_FIELD.fullmatch(name) is not None
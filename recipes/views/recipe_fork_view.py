@@ -0,0 +1,21 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import get_object_or_404, redirect
+from django.views.decorators.http import require_POST
+from recipes.models import Recipe
+from recipes.services import fork_recipe
+
+
+@login_required
+@require_POST
+def recipe_fork(request, pk):
+    """
+    Copy a recipe into a new recipe of the current user, to tweak it.
+
+    Any recipe can be forked, including the user's own. The user is taken
+    to the edit form of the fork.
+    """
+    recipe = get_object_or_404(Recipe, pk=pk)
+    fork = fork_recipe(recipe, request.user)
+    messages.add_message(request, messages.SUCCESS, "Recipe forked!")
+    return redirect("recipe_update", pk=fork.pk)
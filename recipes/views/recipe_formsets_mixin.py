@@ -0,0 +1,79 @@
+from django.forms import inlineformset_factory
+from recipes.forms import BaseInstructionFormSet, IngredientForm, InstructionForm
+from recipes.models import Ingredient, Instruction, Recipe
+
+IngredientFormSet = inlineformset_factory(
+    Recipe,
+    Ingredient,
+    form=IngredientForm,
+    extra=1,
+    can_delete=True,
+    min_num=1,
+    validate_min=True,
+)
+
+InstructionFormSet = inlineformset_factory(
+    Recipe,
+    Instruction,
+    form=InstructionForm,
+    formset=BaseInstructionFormSet,
+    extra=1,
+    can_delete=True,
+    min_num=1,
+    validate_min=True,
+)
+
+
+class RecipeFormsetsMixin:
+    """
+    View mixin editing a recipe together with its ingredients and instructions.
+
+    The recipe form and both formsets are bound and validated once per
+    request, and the same bound forms are used to save the recipe or to
+    re-render the page with errors, so POST data is parsed and images are
+    decoded once. Views implement ``form_valid(form, ingredient_formset,
+    instruction_formset)`` to save them.
+    """
+
+    def get_formset_instance(self, form):
+        """Return the recipe the submitted formsets are bound to."""
+        return form.instance
+
+    def get_context_data(self, **kwargs):
+        """Add ingredient and instruction formsets to context."""
+        instance = getattr(self, "object", None)
+        if "ingredient_formset" not in kwargs:
+            kwargs["ingredient_formset"] = IngredientFormSet(instance=instance)
+        if "instruction_formset" not in kwargs:
+            kwargs["instruction_formset"] = InstructionFormSet(instance=instance)
+        return super().get_context_data(**kwargs)
+
+    def post(self, request, *args, **kwargs):
+        """Bind and validate the recipe form and both formsets, once each."""
+        form = self.get_form()
+        recipe = self.get_formset_instance(form)
+        ingredient_formset = IngredientFormSet(
+            request.POST, request.FILES, instance=recipe
+        )
+        instruction_formset = InstructionFormSet(
+            request.POST, request.FILES, instance=recipe
+        )
+        # Validate everything, so every error is shown in one round trip.
+        valid = [
+            form.is_valid(),
+            ingredient_formset.is_valid(),
+            instruction_formset.is_valid(),
+        ]
+        if all(valid):
+            return self.form_valid(form, ingredient_formset, instruction_formset)
+        return self.form_invalid(form, ingredient_formset, instruction_formset)
+
+    def form_invalid(self, form, ingredient_formset, instruction_formset):
+        """Re-render the page with the bound forms and their errors."""
+        return self.render_to_response(
+            self.get_context_data(
+                form=form,
+                ingredient_formset=ingredient_formset,
+                instruction_formset=instruction_formset,
+            )
+        )
@@ -0,0 +1,44 @@
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.http import Http404
+from django.shortcuts import get_object_or_404, render
+from recipes.models import Recipe, RecipeRevision
+from recipes.services import recipe_version
+
+
+@login_required
+def recipe_history(request, pk):
+    """
+    Display the revisions of the current user's recipe, and one version of it.
+
+    Revisions are listed newest first, ten per page. The version chosen with
+    the ``revision`` query parameter, or the latest one, is rebuilt from its
+    revisions and shown with a button to restore it. Recipes of other users
+    are not found.
+    """
+    recipe = get_object_or_404(Recipe, pk=pk, author=request.user)
+    revisions = recipe.revisions.order_by("-number").values(
+        "number", "is_snapshot", "created_at"
+    )
+    paginator = Paginator(revisions, 10)
+    page_obj = paginator.get_page(request.GET.get("page", 1))
+
+    latest = revisions.first()
+    version = None
+    if latest is not None:
+        try:
+            number = int(request.GET.get("revision", latest["number"]))
+            version = recipe_version(recipe, number)
+        except (ValueError, RecipeRevision.DoesNotExist):
+            raise Http404("No such revision.")
+
+    return render(
+        request,
+        "recipe_history.html",
+        {
+            "recipe": recipe,
+            "page_obj": page_obj,
+            "latest": latest,
+            "version": version,
+        },
+    )
@@ -0,0 +1,44 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect
+from django.views.decorators.http import require_POST
+from recipes.models import Recipe, RecipeRevision
+from recipes.services import RecipeConflict, restore_revision
+
+
+@login_required
+@require_POST
+def recipe_restore(request, pk, number):
+    """
+    Roll the current user's recipe back to one of its revisions.
+
+    The restored version becomes the recipe's latest revision, so the
+    rollback can itself be undone from the history. Recipes of other users
+    are not found.
+
+    The form carries the version of the recipe the history was opened at.
+    If the recipe has been changed since, nothing is restored and the user
+    is sent back to the history to review the latest version.
+    """
+    recipe = get_object_or_404(Recipe, pk=pk, author=request.user)
+    try:
+        expected_version = int(request.POST["version"])
+    except (KeyError, ValueError):
+        expected_version = recipe.version
+    try:
+        restore_revision(recipe, number, expected_version=expected_version)
+    except RecipeRevision.DoesNotExist:
+        raise Http404("No such revision.")
+    except RecipeConflict:
+        messages.add_message(
+            request,
+            messages.ERROR,
+            "This recipe was changed since you opened its history. "
+            "Review the latest version, then restore again.",
+        )
+        return redirect("recipe_history", pk=recipe.pk)
+    messages.add_message(
+        request, messages.SUCCESS, f"Recipe restored to revision {number}."
+    )
+    return redirect("recipe_detail", pk=recipe.pk)
@@ -0,0 +1,123 @@
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Prefetch
+from django.http import HttpResponseRedirect
+from django.views.generic.edit import UpdateView
+from django.urls import reverse
+from recipes.forms import RecipeForm
+from recipes.models import Instruction, Recipe
+from recipes.services import ChildChanges, RecipeConflict, update_recipe
+from recipes.views.recipe_draft_mixin import RecipeDraftMixin
+from recipes.views.recipe_formsets_mixin import RecipeFormsetsMixin
+
+
+class RecipeUpdateView(
+    LoginRequiredMixin, RecipeDraftMixin, RecipeFormsetsMixin, UpdateView
+):
+    """
+    Allow the author of a recipe to edit it.
+
+    The recipe form and both formsets are bound and validated once per
+    request. Only the ingredients and instructions that were added, changed
+    or removed are written, in a single transaction. The form is filled in
+    from the user's autosaved draft of the recipe, if there is one. Recipes
+    by other users are not found.
+
+    The form carries the version of the recipe it was opened at. If the
+    recipe has been changed since, nothing is saved and the form is shown
+    again with the user's changes, next to the recipe as it now is. Saving
+    that form again keeps the user's changes.
+    """
+
+    conflict_message = (
+        "This recipe was changed elsewhere while you were editing it. "
+        "Compare your changes with the saved recipe below, then save again "
+        "to keep yours."
+    )
+
+    model = Recipe
+    form_class = RecipeForm
+    template_name = "recipe_update.html"
+
+    def get_queryset(self):
+        """Restrict editing to the current user's recipes."""
+        return Recipe.objects.filter(author=self.request.user)
+
+    def get_draft_recipe(self):
+        """Use the draft of the recipe being edited."""
+        return self.object
+
+    def get_context_data(self, **kwargs):
+        """Add the version the form was opened at to context."""
+        kwargs.setdefault("expected_version", self.get_expected_version())
+        return super().get_context_data(**kwargs)
+
+    def post(self, request, *args, **kwargs):
+        """Bind the form and formsets to the recipe being edited."""
+        self.object = self.get_object()
+        return super().post(request, *args, **kwargs)
+
+    def get_expected_version(self):
+        """Return the version the form was opened at, as posted with it."""
+        if self.request.method != "POST":
+            return self.object.version
+        try:
+            return int(self.request.POST["version"])
+        except (KeyError, ValueError):
+            return self.object.version
+
+    def form_valid(self, form, ingredient_formset, instruction_formset):
+        """Save the recipe and the changes to its children in one transaction."""
+        expected_version = self.get_expected_version()
+        try:
+            self.object = update_recipe(
+                form.save(commit=False),
+                ChildChanges.from_formset(ingredient_formset),
+                ChildChanges.from_formset(instruction_formset),
+                image_changed="image" in form.changed_data,
+                expected_version=expected_version,
+            )
+        except RecipeConflict:
+            return self.form_conflict(form, ingredient_formset, instruction_formset)
+        self.discard_draft()
+        messages.add_message(self.request, messages.SUCCESS, "Recipe updated!")
+        return HttpResponseRedirect(self.get_success_url())
+
+    def form_conflict(self, form, ingredient_formset, instruction_formset):
+        """
+        Re-render the page after a concurrent edit, to merge the changes.
+
+        The bound forms keep the user's changes, and the recipe as it is now
+        saved is shown next to them. The form is given the current version,
+        so that saving it again overwrites the other edit deliberately.
+        """
+        saved = Recipe.objects.prefetch_related(
+            "ingredients",
+            Prefetch("instructions", queryset=Instruction.objects.order_by("step")),
+        ).get(pk=self.object.pk)
+        form.add_error(None, self.conflict_message)
+        response = self.render_to_response(
+            self.get_context_data(
+                form=form,
+                ingredient_formset=ingredient_formset,
+                instruction_formset=instruction_formset,
+                expected_version=saved.version,
+                conflict=saved,
+                conflict_fields=[
+                    (form[name].label, _display_value(saved, name))
+                    for name in form.changed_data
+                    if name != "image"
+                ],
+            )
+        )
+        response.status_code = 409
+        return response
+
+    def get_success_url(self):
+        """Redirect to the updated recipe."""
+        return reverse("recipe_detail", kwargs={"pk": self.object.pk})
+
+
+def _display_value(recipe, name):
+    display = getattr(recipe, f"get_{name}_display", None)
+    return display() if display else getattr(recipe, name)
@@ -0,0 +1,42 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+from recipes.services import get_shopping_list
+from recipes.views.recipe_detail_view import MAX_SERVINGS
+
+# The largest number of recipes one shopping list can be made for.
+MAX_SHOPPING_LIST_RECIPES = 100
+
+
+@login_required
+def shopping_list(request):
+    """
+    Display one shopping list merged from the recipes the user picked.
+
+    The recipes are chosen with repeated ``recipe`` query parameters, from
+    the current user's recipes listed on the page or any other recipe, and
+    the optional ``servings`` parameter scales every recipe to that many
+    servings, up to `MAX_SERVINGS`. Invalid values are ignored.
+    """
+    selected = []
+    for value in request.GET.getlist("recipe")[:MAX_SHOPPING_LIST_RECIPES]:
+        try:
+            selected.append(int(value))
+        except ValueError:
+            continue
+    try:
+        servings = int(request.GET["servings"])
+    except (KeyError, ValueError):
+        servings = None
+    if servings is not None and not 1 <= servings <= MAX_SERVINGS:
+        servings = None
+
+    return render(
+        request,
+        "shopping_list.html",
+        {
+            "recipes": request.user.recipes.order_by("title").values("pk", "title"),
+            "selected": selected,
+            "servings": servings,
+            "items": get_shopping_list(selected, servings) if selected else [],
+        },
+    )
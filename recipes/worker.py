@@ -0,0 +1,21 @@
+"""
+Entry points for the processes spawned by `manage.py run_workers`.
+
+This module must stay importable before Django is set up, because spawned
+processes unpickle references to these functions before running the
+initializer. Django and the app are therefore only imported lazily.
+"""
+
+
+def initialize():
+    """Set up Django in a freshly spawned worker process."""
+    import django
+
+    django.setup()
+
+
+def run(job_id):
+    """Run the claimed job ``job_id`` and return its resulting status."""
+    from recipes.services import run_job
+
+    return run_job(job_id)
@@ -83,6 +83,88 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# "shared" is reachable by every worker process and sits behind the in-process
+# tier of `recipes.helpers.TwoTierCache`. Bump its VERSION to invalidate every
+# cached value on deploy.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache",
+        "TIMEOUT": 300,
+        "VERSION": 1,
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+        },
+    },
+}
+
+TWO_TIER_CACHE = {
+    "SHARED_ALIAS": "shared",
+    "DEFAULT_TIMEOUT": 300,
+    "LOCAL_TIMEOUT": 30,
+    "LOCAL_MAX_ENTRIES": 1024,
+    "LOCAL_MAX_BYTES": 16 * 1024 * 1024,
+    "GENERATION_TIMEOUT": 1,
+    "EARLY_REFRESH_BETA": 1.0,
+    "STALE_TIMEOUT": 60,
+    "WAIT_TIMEOUT": 2,
+    "POLL_INTERVAL": 0.05,
+}
+
+SINGLE_FLIGHT = {
+    "LEASE_DIR": BASE_DIR / "cache" / "leases",
+    "LEASE_TIMEOUT": 10,
+}
+
+# Background jobs, processed by `manage.py run_workers`
+
+JOB_QUEUE = {
+    "LEASE_TIMEOUT": 300,
+    "MAX_ATTEMPTS": 5,
+    "POLL_INTERVAL": 1.0,
+}
+
+# Uploads are streamed to temporary files and checked by
+# `recipes.uploads.StreamingImageUploadHandler` before any image is decoded
+
+FILE_UPLOAD_HANDLERS = ["recipes.uploads.StreamingImageUploadHandler"]
+
+IMAGE_UPLOADS = {
+    "MAX_FILE_BYTES": 10 * 1024 * 1024,
+    "MAX_REQUEST_BYTES": 25 * 1024 * 1024,
+    "MAX_PIXELS": 24_000_000,
+    "MAX_EDGE": 4096,
+}
+
+# Unsaved recipe forms, autosaved by the browser while the user types
+
+RECIPE_DRAFTS = {
+    "TTL": 7 * 24 * 60 * 60,
+    "MAX_BYTES": 64 * 1024,
+}
+
+# Recipe history. Revisions store deltas, with a full snapshot of the recipe
+# every SNAPSHOT_EVERY revisions, which bounds the rows read to rebuild one
+
+RECIPE_REVISIONS = {
+    "SNAPSHOT_EVERY": 10,
+}
+
+# Submitted forms, remembered for TTL seconds so that replays are not carried
+# out again
+
+IDEMPOTENCY_KEYS = {
+    "TTL": 24 * 60 * 60,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -126,6 +208,16 @@ STATICFILES_DIRS = [
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads are stored once per distinct content, see `recipes.storage`
+STORAGES = {
+    "default": {
+        "BACKEND": "recipes.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -144,3 +236,6 @@ REDIRECT_URL_WHEN_LOGGED_IN = "dashboard"
 MESSAGE_TAGS = {
     messages.ERROR: "danger",
 }
+
+# Isolate the test suite from on-disk caches and media
+TEST_RUNNER = "recipes.tests.runner.RecipesTestRunner"
@@ -31,8 +31,33 @@ urlpatterns = [
     path("profile/", views.ProfileUpdateView.as_view(), name="profile"),
     path("sign_up/", views.SignUpView.as_view(), name="sign_up"),
     path("users/", views.user_list, name="user_list"),
+    path("shopping-list/", views.shopping_list, name="shopping_list"),
     path("recipe/create/", views.RecipeCreateView.as_view(), name="recipe_create"),
+    path("recipe/create/draft/", views.recipe_draft, name="recipe_draft"),
     path("recipes/<int:pk>/", views.recipe_detail, name="recipe_detail"),
+    path("api/recipes/bulk/", views.recipe_bulk_create, name="recipe_bulk_create"),
+    path(
+        "recipes/<int:pk>/edit/",
+        views.RecipeUpdateView.as_view(),
+        name="recipe_update",
+    ),
+    path(
+        "recipes/<int:pk>/edit/draft/",
+        views.recipe_draft,
+        name="recipe_update_draft",
+    ),
+    path("recipes/<int:pk>/fork/", views.recipe_fork, name="recipe_fork"),
+    path("recipes/<int:pk>/history/", views.recipe_history, name="recipe_history"),
+    path(
+        "recipes/<int:pk>/history/<int:number>/restore/",
+        views.recipe_restore,
+        name="recipe_restore",
+    ),
+    path(
+        "recipes/<int:pk>/instructions/<int:instruction_pk>/move/",
+        views.instruction_move,
+        name="instruction_move",
+    ),
 ]
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)